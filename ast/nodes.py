@@ -1,62 +1,180 @@
 # Simple AST node classes
+#
+# Nodes use __slots__ (no per-instance __dict__); `_fields` lists the
+# constructor fields in order and is what serializers/dumpers walk. Extra
+# slots beyond `_fields` are annotations filled in by later passes (e.g.
+# `slot`, the storage index assigned by sem/resolver.py).
 class Node:
-    pass
+    __slots__ = ()
+    _fields = ()
 
 class Program(Node):
+    _fields = ('statements',)
+    __slots__ = _fields
     def __init__(self, statements):
         self.statements = statements
 
 class VarDecl(Node):
+    _fields = ('name', 'typ', 'init', 'shared')
+    __slots__ = _fields + ('slot',)
     def __init__(self, name, typ, init=None, shared=False):
         self.name = name
         self.typ = typ
         self.init = init
         self.shared = shared  # mark shared/global vars
+        self.slot = None
 
 class ChannelDecl(Node):
-    def __init__(self, name, typ):
+    _fields = ('name', 'typ', 'capacity')
+    __slots__ = _fields + ('slot',)
+    def __init__(self, name, typ, capacity=None):
         self.name = name
         self.typ = typ
+        self.capacity = capacity  # None: unbounded
+        self.slot = None
 
 class ParallelBlock(Node):
-    def __init__(self, statements):
+    _fields = ('statements', 'reductions')
+    __slots__ = _fields + ('cost', 'privates')
+    def __init__(self, statements, reductions=None):
+        self.statements = statements
+        self.reductions = reductions or []  # list of Reduction
+        self.cost = None  # set by sem/sequentialize.py when independent
+        # branch statement -> ((slot, local), ...) for the variables
+        # private to that branch (sem/escape.py), set by sem/resolver.py
+        self.privates = {}
+
+class Reduction(Node):
+    # `reduce(op: var)`: each worker of the enclosing parallel construct
+    # updates a private partial of `var`; partials are combined at the join
+    _fields = ('op', 'var')
+    __slots__ = _fields + ('slot', 'local')
+    def __init__(self, op, var):
+        self.op = op    # '+', '*', 'min' or 'max'
+        self.var = var  # Identifier
+        self.slot = None   # variable slot the partials are combined into
+        self.local = None  # frame index of a worker's private partial
+
+class ParallelFor(Node):
+    # `parallel for var in start..stop schedule(kind, chunk) { statements }`;
+    # iterates over the half-open range [start, stop)
+    _fields = ('var', 'start', 'stop', 'statements', 'schedule', 'chunk', 'reductions')
+    __slots__ = _fields
+    def __init__(self, var, start, stop, statements, schedule='static', chunk=None, reductions=None):
+        self.var = var
+        self.start = start
+        self.stop = stop
         self.statements = statements
+        self.schedule = schedule  # 'static', 'dynamic' or 'guided'
+        self.chunk = chunk        # chunk size expression; None: policy default
+        self.reductions = reductions or []  # list of Reduction
 
 class Spawn(Node):
+    _fields = ('expr',)
+    __slots__ = _fields
     def __init__(self, expr):  # spawn(expression or function)
         self.expr = expr
 
 class Lock(Node):
+    _fields = ('var',)
+    __slots__ = _fields + ('slot',)
     def __init__(self, var):
         self.var = var
+        self.slot = None  # index into the lock table
 
 class Unlock(Node):
+    _fields = ('var',)
+    __slots__ = _fields + ('slot',)
     def __init__(self, var):
         self.var = var
+        self.slot = None  # index into the lock table
 
 class Atomic(Node):
+    _fields = ('statements',)
+    __slots__ = _fields + ('footprint',)
     def __init__(self, statements):
         self.statements = statements
+        self.footprint = None  # sorted variable slots the block touches
 
 class Send(Node):
+    _fields = ('chan', 'value')
+    __slots__ = _fields
     def __init__(self, chan, value):
         self.chan = chan
         self.value = value
 
 class Recv(Node):
+    _fields = ('target', 'chan')
+    __slots__ = _fields
     def __init__(self, target, chan):
         self.target = target
         self.chan = chan
 
+class Select(Node):
+    _fields = ('cases',)
+    __slots__ = _fields
+    def __init__(self, cases):
+        self.cases = cases  # list of SelectCase
+
+class SelectCase(Node):
+    # `case target = recv(chan): statements`
+    _fields = ('target', 'chan', 'statements')
+    __slots__ = _fields
+    def __init__(self, target, chan, statements):
+        self.target = target
+        self.chan = chan
+        self.statements = statements
+
 class Assign(Node):
+    _fields = ('target', 'expr')
+    __slots__ = _fields
     def __init__(self, target, expr):
         self.target = target
         self.expr = expr
 
 class Identifier(Node):
+    _fields = ('name',)
+    __slots__ = _fields + ('slot',)
     def __init__(self, name):
         self.name = name
+        self.slot = None
+
+class BinaryOp(Node):
+    _fields = ('op', 'left', 'right')
+    __slots__ = _fields
+    def __init__(self, op, left, right):
+        self.op = op  # '+', '-', '*', '/', '%', 'min' or 'max'
+        self.left = left
+        self.right = right
 
 class Literal(Node):
+    _fields = ('value',)
+    __slots__ = _fields
     def __init__(self, value):
-        self.value = value
\ No newline at end of file
+        self.value = value
+
+class HashConser:
+    """Hands out shared instances of identical leaf nodes.
+
+    Identifier and Literal nodes are immutable in practice, so every use of a
+    name (or of a constant) can point at one instance instead of a fresh
+    allocation. Callers must not change the fields of leaves obtained here;
+    passes that need per-use annotations replace the leaf instead.
+    """
+    __slots__ = ('table',)
+
+    def __init__(self):
+        self.table = {}
+
+    def identifier(self, name):
+        node = self.table.get(name)
+        if node is None:
+            node = self.table[name] = Identifier(name)
+        return node
+
+    def literal(self, value):
+        key = (type(value), value)
+        node = self.table.get(key)
+        if node is None:
+            node = self.table[key] = Literal(value)
+        return node
@@ -0,0 +1,14 @@
+# Operator semantics shared by the runtimes and the optimizer
+#
+# Integer arithmetic for BinaryOp; '/' and '%' floor like Python's // and %
+import operator
+
+BINARY_OPS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.floordiv,
+    '%': operator.mod,
+    'min': min,
+    'max': max,
+}
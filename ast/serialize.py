@@ -0,0 +1,125 @@
+"""Compact binary serialization for the AST classes in ``ast/nodes.py``.
+
+A node is encoded as a tuple ``(tag, field, field, ...)`` where ``tag`` indexes
+:data:`NODE_TYPES` and fields follow the class's ``_fields`` order; lists
+stay lists and leaf values (str/int/bool/None) are stored as-is. The nested
+tuples are written with :mod:`marshal`, which loads at C speed.
+"""
+import gc
+import hashlib
+import marshal
+from operator import attrgetter
+
+from concurrentlang.ast import nodes
+
+MAGIC = b'CLAST'
+FORMAT_VERSION = 1
+
+def _node_types():
+    types = [obj for obj in vars(nodes).values()
+             if isinstance(obj, type) and issubclass(obj, nodes.Node) and obj is not nodes.Node]
+    return tuple(types)
+
+NODE_TYPES = _node_types()
+FIELDS = tuple(cls._fields for cls in NODE_TYPES)
+_TAGS = {cls: tag for tag, cls in enumerate(NODE_TYPES)}
+
+def schema_hash():
+    """Digest of the node classes and their fields; part of every cache key."""
+    desc = repr([(cls.__name__, fields) for cls, fields in zip(NODE_TYPES, FIELDS)])
+    return hashlib.sha256(f'{FORMAT_VERSION}:{marshal.version}:{desc}'.encode()).hexdigest()[:16]
+
+def _encode(obj):
+    tag = _TAGS.get(type(obj))
+    if tag is not None:
+        return (tag,) + tuple(_encode(getattr(obj, f)) for f in FIELDS[tag])
+    if type(obj) is list:
+        return [_encode(x) for x in obj]
+    if obj is None or type(obj) in (str, int, bool):
+        return obj
+    raise TypeError(f"Cannot serialize AST value of type {type(obj).__name__}")
+
+# Content hashes only need an encoding that tells different subtrees apart,
+# not one that can be decoded: identifiers hash as their bare names and
+# literals as their values (the field they sit in fixes the node type), and
+# each class's fields are fetched in one attrgetter call.
+_GETTERS = tuple(attrgetter(*fields) if len(fields) > 1
+                 else (lambda f: lambda obj: (getattr(obj, f),))(fields[0])
+                 for fields in FIELDS)
+
+def _key(obj):
+    cls = type(obj)
+    if cls is nodes.Identifier:
+        return obj.name
+    if cls is nodes.Literal:
+        return obj.value
+    tag = _TAGS[cls]
+    out = [tag]
+    for v in _GETTERS[tag](obj):
+        tv = type(v)
+        if tv is list:
+            out.append([_key(x) for x in v])
+        elif v is None or tv is str or tv is int or tv is bool:
+            out.append(v)
+        else:
+            out.append(_key(v))
+    return tuple(out)
+
+def content_hash(node):
+    """Digest of the subtree rooted at ``node`` (a statement, a block or a
+    whole Program): equal for structurally equal trees, whichever parse
+    built them, and stable across runs for a given node schema."""
+    return hashlib.blake2b(marshal.dumps(_key(node)), digest_size=16).digest()
+
+def _decode(t):
+    cls = NODE_TYPES[t[0]]
+    args = []
+    for v in t[1:]:
+        tv = type(v)
+        if tv is tuple:
+            v = _decode(v)
+        elif tv is list:
+            v = [_decode(x) if type(x) is tuple else x for x in v]
+        args.append(v)
+    return cls(*args)
+
+def dumps(node):
+    """Serialize an AST (usually a nodes.Program) to bytes."""
+    return MAGIC + marshal.dumps((schema_hash(), _encode(node)))
+
+def loads(data):
+    """Inverse of dumps(); raises ValueError for foreign or outdated data."""
+    if not data.startswith(MAGIC):
+        raise ValueError("Not a serialized ConcurrentLang AST")
+    try:
+        schema, tree = marshal.loads(data[len(MAGIC):])
+    except (EOFError, ValueError, TypeError) as e:
+        raise ValueError(f"Corrupt serialized AST: {e}")
+    if schema != schema_hash():
+        raise ValueError("Serialized AST was written for a different node schema")
+    # Building a large tree triggers repeated full collections that find
+    # nothing (no cycles are created); pause the collector meanwhile.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _decode(tree)
+    finally:
+        if enabled:
+            gc.enable()
+
+def to_simple(obj):
+    """``obj`` (a node, usually a Program) as JSON-ready data: a node is a
+    dict of its fields plus ``_type``, its class name; lists stay lists,
+    str/int/float/bool/None leaves are kept and anything else is its repr.
+    This is the form `run_example.py --dump-ast` and the compile server's
+    "ast" replies use."""
+    if hasattr(obj, '_fields'):
+        d = {'_type': type(obj).__name__}
+        for k in obj._fields:
+            d[k] = to_simple(getattr(obj, k))
+        return d
+    if isinstance(obj, (list, tuple)):
+        return [to_simple(x) for x in obj]
+    if isinstance(obj, (str, int, float, bool)) or obj is None:
+        return obj
+    return repr(obj)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+bench_analysis.py
+
+Usage:
+  python benchmarks/bench_analysis.py [--statements 10000,100000] [--repeat 3]
+
+Static checks on a synthetic program of declarations, assignments,
+parallel blocks with atomic and lock-protected branches, and parallel
+for loops. Times, best of --repeat:
+  walk      one bare traversal of every statement and expression
+  separate  semantic.analyze, collect_shared_vars, find_unprotected_writes
+            and build_lock_graph called one after another
+  unified   checks.check(), every analysis in a single traversal
+and reports each as a multiple of the bare walk (garbage collection off,
+as in timeit).
+"""
+import argparse
+import gc
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.sem import analysis, checks, deadlock_detector, race_detector, semantic
+
+def parse(src):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(src, lexer=lexer)
+
+def source(n):
+    # groups of about ten statements
+    lines = []
+    for k in range(n // 10):
+        v = f"v{k % 100}"
+        lines.append(f"int d{k} = {k};")
+        lines.append(f"{v} = d{k} + {v} * 2;")
+        lines.append("parallel {")
+        lines.append(f"atomic {{ {v} = {v} + 1; w{k % 7} = {v}; }}")
+        lines.append(f"atomic {{ lock(m{k % 5}); lock(m{(k + 1) % 5}); s{k % 3} = 1; unlock(m{(k + 1) % 5}); unlock(m{k % 5}); }}")
+        lines.append("}")
+        lines.append(f"parallel for i in 0..4 {{ t{k % 11} = i + {v}; }}")
+    return "\n".join(lines)
+
+class Reads(analysis.Analysis):
+    # makes the bare walk descend into expressions too
+    def visit_Identifier(self, e, ctx):
+        pass
+
+def walk(program):
+    analysis.run(program, [Reads()])
+
+def separate(program):
+    semantic.analyze(program)
+    race_detector.collect_shared_vars(program)
+    race_detector.find_unprotected_writes(program)
+    deadlock_detector.build_lock_graph(program)
+
+def unified(program):
+    checks.check(program)
+
+def best(fn, program, repeat):
+    # like timeit, keep the collector out of the timings
+    times = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn(program)
+            times.append(time.perf_counter() - t0)
+    finally:
+        gc.enable()
+    return min(times)
+
+def main():
+    ap = argparse.ArgumentParser(description="Separate checker walks vs one unified traversal")
+    ap.add_argument("--statements", default="10000,100000")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    for n in (int(s) for s in args.statements.split(",")):
+        program = parse(source(n))
+        base = best(walk, program, args.repeat)
+        line = f"{n:7d} statements  walk {base * 1000:8.1f} ms"
+        for label, fn in (("separate", separate), ("unified", unified)):
+            t = best(fn, program, args.repeat)
+            line += f"   {label} {t * 1000:8.1f} ms (x{t / base:.2f})"
+        print(line)
+
+if __name__ == "__main__":
+    main()
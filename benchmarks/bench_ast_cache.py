@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+bench_ast_cache.py
+
+Usage:
+  python benchmarks/bench_ast_cache.py [--sizes 100,1000,10000,100000] [--programs 200]
+
+Compares re-parsing a program against loading its AST from the on-disk cache:
+ - per-size: parse time, cache-load time, serialized size
+ - batch:    wall time for --programs small unchanged programs, cold vs cached
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.grammar import astcache
+from concurrentlang.ast import serialize
+from programs import generate_program
+
+def main():
+    ap = argparse.ArgumentParser(description="Parse vs AST cache load")
+    ap.add_argument("--sizes", type=str, default="100,1000,10000,100000")
+    ap.add_argument("--programs", type=int, default=200)
+    args = ap.parse_args()
+    parser_mod.build_parser()
+
+    with tempfile.TemporaryDirectory() as root:
+        cache = astcache.ASTCache(root)
+        for n in (int(x) for x in args.sizes.split(",")):
+            src = generate_program(n)
+            t0 = time.perf_counter()
+            tree = astcache.parse_cached(src)
+            t_parse = time.perf_counter() - t0
+            cache.put(src, tree)
+            t0 = time.perf_counter()
+            assert cache.get(src) is not None
+            t_load = time.perf_counter() - t0
+            size = len(serialize.dumps(tree))
+            print(f"n={n:<8d} parse {t_parse * 1e3:9.2f} ms  cache load {t_load * 1e3:8.2f} ms"
+                  f"  x{t_parse / t_load:5.1f}  {size / n:5.1f} bytes/stmt")
+
+        srcs = [generate_program(50 + i % 50) + f"int p{i} = {i};\n" for i in range(args.programs)]
+        for label in ("cold", "cached"):
+            t0 = time.perf_counter()
+            for src in srcs:
+                astcache.parse_cached(src, cache)
+            print(f"{args.programs} programs {label:6s} {time.perf_counter() - t0:8.3f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+bench_ast_memory.py
+
+Usage:
+  python benchmarks/bench_ast_memory.py [--sizes 10000,100000]
+
+Reports retained AST memory (tracemalloc) in bytes per statement for:
+ - dict nodes:   the previous representation (per-instance __dict__, a fresh
+                 Identifier and name string for every use), rebuilt here from
+                 the parsed tree with equivalent non-slotted classes
+ - slotted:      the current __slots__ nodes with interned names
+ - hash-consed:  slotted nodes parsed with build_parser(hashcons=True)
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.ast import nodes as ast
+from programs import generate_program
+
+_dict_classes = {}
+
+def _dict_class(cls):
+    # Same name and fields as `cls`, but a plain class with an instance __dict__.
+    if cls not in _dict_classes:
+        def __init__(self, *args):
+            for k, v in zip(cls._fields, args):
+                setattr(self, k, v)
+        _dict_classes[cls] = type(cls.__name__, (object,), {"__init__": __init__})
+    return _dict_classes[cls]
+
+def to_dict_nodes(obj):
+    if isinstance(obj, ast.Node):
+        return _dict_class(type(obj))(*(to_dict_nodes(getattr(obj, f)) for f in obj._fields))
+    if isinstance(obj, list):
+        return [to_dict_nodes(x) for x in obj]
+    if isinstance(obj, str):
+        return (obj + " ")[:-1]  # an un-interned copy, as the old lexer produced
+    return obj
+
+def retained(build):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, after - before
+
+def parse(src, hashcons=False):
+    parser_obj, lexer = parser_mod.build_parser(hashcons=hashcons)
+    return parser_obj.parse(src, lexer=lexer)
+
+def main():
+    ap = argparse.ArgumentParser(description="AST memory per statement")
+    ap.add_argument("--sizes", type=str, default="10000,100000")
+    args = ap.parse_args()
+    parser_mod.build_parser()
+
+    for n in (int(x) for x in args.sizes.split(",")):
+        src = generate_program(n)
+        slotted, b_slotted = retained(lambda: parse(src))
+        _, b_dict = retained(lambda: to_dict_nodes(slotted))
+        del slotted
+        _, b_hc = retained(lambda: parse(src, hashcons=True))
+        print(f"n={n:<8d} dict nodes {b_dict / n:7.1f} B/stmt   slotted {b_slotted / n:7.1f} B/stmt"
+              f"   hash-consed {b_hc / n:7.1f} B/stmt   (x{b_dict / b_hc:.1f} smaller)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+bench_async.py
+
+Usage:
+  python benchmarks/bench_async.py [--max-tasks 100000] [--thread-limit 10000]
+
+Scales a `parallel { }` block of N/2 receivers followed by N/2 senders on one
+channel from 10^3 branches up to --max-tasks, running every size on the
+asyncio backend (one task per branch) and, up to --thread-limit, on the
+threaded interpreter (one OS thread per branch). Reports wall time and
+branches per second.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime.interpreter import Interpreter
+from concurrentlang.runtime.async_interpreter import AsyncInterpreter
+
+def parse(src):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(src, lexer=lexer)
+
+def blocking_program(n):
+    return parse("chan<int> c;\nparallel {\n"
+                 + "\n".join("x = recv(c);" for _ in range(n // 2)) + "\n"
+                 + "\n".join(f"send(c, {i});" for i in range(n // 2)) + "\n}")
+
+def run(engine, program):
+    interp = engine()
+    t0 = time.perf_counter()
+    interp.exec_program(program)
+    return time.perf_counter() - t0
+
+def main():
+    ap = argparse.ArgumentParser(description="asyncio tasks vs OS threads for parallel branches")
+    ap.add_argument("--max-tasks", type=int, default=100000)
+    ap.add_argument("--thread-limit", type=int, default=10000,
+                    help="largest size also run with one thread per branch")
+    args = ap.parse_args()
+
+    n = 1000
+    while n <= args.max_tasks:
+        program = blocking_program(n)
+        t_async = run(AsyncInterpreter, program)
+        line = f"{n:8d} branches   async {t_async:7.3f} s ({n / t_async:9.0f}/s)"
+        if n <= args.thread_limit:
+            t_thread = run(Interpreter, program)
+            line += f"   threads {t_thread:7.3f} s ({n / t_thread:9.0f}/s)   x{t_thread / t_async:.1f}"
+        print(line)
+        n *= 10
+
+if __name__ == "__main__":
+    main()
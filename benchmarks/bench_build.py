@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+bench_build.py
+
+Usage:
+  python benchmarks/bench_build.py [--files 100] [--statements 200] [--jobs N]
+
+Compiles --files generated programs to LLVM IR and reports wall time for:
+ - per-process  one `concurrentlang build FILE --no-cache` process per file,
+                as a CI loop over run_example.py-style invocations pays
+                Python startup, package import and parser tables each time
+ - build -j1    one `concurrentlang build` of all files, cold cache
+ - build -jN    the same with N worker processes (--jobs, default: CPU count)
+ - warm         again with every input unchanged (artifact cache hits)
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from concurrentlang import build
+from programs import generate_program
+
+def main():
+    ap = argparse.ArgumentParser(description="Per-file processes vs the batch build driver")
+    ap.add_argument("--files", type=int, default=100)
+    ap.add_argument("--statements", type=int, default=200)
+    ap.add_argument("--jobs", type=int, default=os.cpu_count())
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        src = Path(root, "src")
+        src.mkdir()
+        for i in range(args.files):
+            (src / f"p{i}.cl").write_text(generate_program(args.statements) + f"int p{i} = {i};\n")
+        files = sorted(str(p) for p in src.glob("*.cl"))
+        out = os.path.join(root, "out")
+        env = dict(os.environ, PYTHONPATH=str(ROOT))
+
+        t0 = time.perf_counter()
+        for f in files:
+            subprocess.run([sys.executable, "-m", "concurrentlang", "build", f, "--no-cache",
+                            "-o", out, "-j", "1"], env=env, check=False, stdout=subprocess.DEVNULL)
+        per_process = time.perf_counter() - t0
+        print(f"{args.files} files x {args.statements} statements")
+        print(f"  per-process {per_process:8.2f} s")
+
+        runs = (("build -j1", 1, "cold"), (f"build -j{args.jobs}", args.jobs, "cold2"),
+                ("warm", args.jobs, "cold2"))
+        for label, jobs, cache in runs:
+            t0 = time.perf_counter()
+            report = build.build([str(src)], out, jobs=jobs, cache_root=os.path.join(root, cache))
+            t = time.perf_counter() - t0
+            print(f"  {label:11s} {t:8.2f} s  (x{per_process / t:.1f}; "
+                  f"{report['ok']} built, {report['cached']} cached)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+bench_build_parser.py
+
+Usage:
+  python benchmarks/bench_build_parser.py [--runs 5] [--calls 1000]
+
+Measures build_parser() latency in three situations:
+ - cold:      fresh process, empty table cache (LALR tables + lextab generated)
+ - warm disk: fresh process, tables loaded from the on-disk cache
+ - warm:      repeated calls inside one process (shared in-process tables)
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+CHILD = """
+import time
+from concurrentlang.grammar import parser as parser_mod
+t0 = time.perf_counter()
+parser_mod.build_parser()
+print(time.perf_counter() - t0)
+"""
+
+def time_child(cache_dir):
+    env = dict(os.environ, CONCURRENTLANG_CACHE_DIR=cache_dir, PYTHONPATH=str(ROOT))
+    out = subprocess.run([sys.executable, "-c", CHILD], env=env, cwd=str(ROOT),
+                         capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+def fmt(samples):
+    return f"median {statistics.median(samples) * 1e3:8.3f} ms  (min {min(samples) * 1e3:.3f} ms, n={len(samples)})"
+
+def main():
+    ap = argparse.ArgumentParser(description="Cold vs warm build_parser() latency")
+    ap.add_argument("--runs", type=int, default=5, help="fresh processes per scenario")
+    ap.add_argument("--calls", type=int, default=1000, help="in-process warm calls")
+    args = ap.parse_args()
+
+    cold, warm_disk = [], []
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold.append(time_child(cache_dir))
+            warm_disk.append(time_child(cache_dir))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["CONCURRENTLANG_CACHE_DIR"] = cache_dir
+        from concurrentlang.grammar import parser as parser_mod
+        parser_mod.build_parser()
+        warm = []
+        for _ in range(args.calls):
+            t0 = time.perf_counter()
+            parser_mod.build_parser()
+            warm.append(time.perf_counter() - t0)
+
+    print(f"cold       {fmt(cold)}")
+    print(f"warm disk  {fmt(warm_disk)}")
+    print(f"warm       {fmt(warm)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+bench_channels.py
+
+Usage:
+  python benchmarks/bench_channels.py [--messages 10000000] [--capacity 1024] [--batch 1024]
+                                      [--program-messages 10000]
+
+Producer/consumer throughput in messages per second:
+ - one producer thread and one consumer thread moving --messages ints
+   through queue.Queue (the old Channel), Channel unbounded and bounded with
+   per-message send/recv, and Channel bounded with send_many/recv_many
+ - examples/producer_consumer.cl scaled to --program-messages sends and
+   receives (in one parallel block), run on the interpreter and the VM with
+   `chan<int>` and `chan<int, capacity>`
+"""
+import argparse
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime.interpreter import Interpreter, Channel
+from concurrentlang.runtime.vm import VM
+
+def parse(src):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(src, lexer=lexer)
+
+def pump(produce, consume):
+    t0 = time.perf_counter()
+    producer = threading.Thread(target=produce)
+    producer.start()
+    consume()
+    producer.join()
+    return time.perf_counter() - t0
+
+def bench_queue(n, capacity, batch):
+    q = queue.Queue()
+    def produce():
+        put = q.put
+        for i in range(n):
+            put(i)
+    def consume():
+        get = q.get
+        for _ in range(n):
+            get()
+    return pump(produce, consume)
+
+def bench_single(n, capacity, batch):
+    ch = Channel(capacity)
+    def produce():
+        send = ch.send
+        for i in range(n):
+            send(i)
+    def consume():
+        recv = ch.recv
+        for _ in range(n):
+            recv()
+    return pump(produce, consume)
+
+def bench_batched(n, capacity, batch):
+    ch = Channel(capacity)
+    def produce():
+        for start in range(0, n, batch):
+            ch.send_many(range(start, min(n, start + batch)))
+    def consume():
+        got = 0
+        while got < n:
+            got += len(ch.recv_many(batch))
+    return pump(produce, consume)
+
+def program(n, capacity):
+    decl = f"chan<int, {capacity}> buffer;" if capacity else "chan<int> buffer;"
+    sends = "\n".join(f"send(buffer, {i});" for i in range(n))
+    recvs = "\n".join("value = recv(buffer);" for _ in range(n))
+    # one block: with a bounded channel the producers need the consumers
+    # running alongside them, or the first block never finishes
+    return parse(f"{decl}\nint value = 0;\nparallel {{\n{sends}\n{recvs}\n}}")
+
+def main():
+    ap = argparse.ArgumentParser(description="Channel messages per second")
+    ap.add_argument("--messages", type=int, default=10000000)
+    ap.add_argument("--capacity", type=int, default=1024)
+    ap.add_argument("--batch", type=int, default=1024)
+    ap.add_argument("--program-messages", type=int, default=10000)
+    args = ap.parse_args()
+    n = args.messages
+
+    cases = [
+        ("queue.Queue", bench_queue, 0),
+        ("Channel unbounded", bench_single, 0),
+        (f"Channel cap={args.capacity}", bench_single, args.capacity),
+        (f"Channel cap={args.capacity} batch={args.batch}", bench_batched, args.capacity),
+    ]
+    print(f"runtime, {n} messages")
+    for label, fn, capacity in cases:
+        elapsed = fn(n, capacity, args.batch)
+        print(f"  {label:32s} {elapsed:8.3f} s   {n / elapsed:12.0f} msg/s")
+
+    m = args.program_messages
+    print(f"producer_consumer.cl, {m} messages")
+    for capacity in (0, args.capacity):
+        prog = program(m, capacity)
+        for engine in (Interpreter, VM):
+            interp = engine()
+            t0 = time.perf_counter()
+            interp.exec_program(prog)
+            elapsed = time.perf_counter() - t0
+            label = f"{engine.__name__} " + (f"cap={capacity}" if capacity else "unbounded")
+            print(f"  {label:32s} {elapsed:8.3f} s   {m / elapsed:12.0f} msg/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+bench_deadlock.py
+
+Usage:
+  python benchmarks/bench_deadlock.py [--locks 1000,10000,100000] [--legacy-max 10000]
+
+Deadlock detection on synthetic programs with --locks distinct locks:
+  chain   lock(l_i); lock(l_i+1) sections closing one cycle through every lock
+  pairs   lock(a); lock(b) and lock(b); lock(a) sections: one two-lock cycle
+          per pair
+  nested  every lock nested inside the previous one in one statement list
+Reports the time build_lock_graph() plus find_cycles() take and the cycles
+found, next to the previous implementation (a rescan for each lock's
+unlock, recursive scanning and DFS) for sizes up to --legacy-max; that one
+fails with RecursionError once chains or nesting pass the recursion limit.
+"""
+import argparse
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from concurrentlang.ast import nodes
+from concurrentlang.sem import deadlock_detector
+
+def locks(names):
+    return ([nodes.Lock(nodes.Identifier(n)) for n in names] +
+            [nodes.Unlock(nodes.Identifier(n)) for n in reversed(names)])
+
+def chain(n):
+    stmts = []
+    for i in range(n):
+        stmts += locks([f"l{i}", f"l{(i + 1) % n}"])
+    return nodes.Program(stmts)
+
+def pairs(n):
+    stmts = []
+    for i in range(0, n, 2):
+        stmts += locks([f"l{i}", f"l{i + 1}"]) + locks([f"l{i + 1}", f"l{i}"])
+    return nodes.Program(stmts)
+
+def nested(n):
+    return nodes.Program(locks([f"l{i}" for i in range(n)]))
+
+SHAPES = {"chain": chain, "pairs": pairs, "nested": nested}
+
+# The implementation before the single-pass analysis, for comparison.
+def legacy_build_lock_graph(program):
+    edges = defaultdict(set)
+
+    def scan_block(stmts, held=None):
+        if held is None: held = []
+        i = 0
+        while i < len(stmts):
+            s = stmts[i]
+            if s.__class__.__name__ == 'Lock':
+                held2 = held + [s.var.name]
+                for h in held:
+                    edges[h].add(s.var.name)
+                j = i+1
+                inner = []
+                while j < len(stmts):
+                    if stmts[j].__class__.__name__ == 'Unlock' and getattr(stmts[j].var,'name','')==s.var.name:
+                        break
+                    inner.append(stmts[j])
+                    j += 1
+                scan_block(inner, held2)
+                i = j+1
+                continue
+            elif hasattr(s, 'statements'):
+                scan_block(s.statements, held)
+            i += 1
+
+    scan_block(program.statements)
+    return edges
+
+def legacy_has_cycle(edges):
+    visited = {}
+    def dfs(n):
+        if n in visited:
+            return visited[n] == 1
+        visited[n] = 1
+        for m in edges.get(n, []):
+            if dfs(m):
+                return True
+        visited[n] = 2
+        return False
+
+    for node in list(edges):
+        if node not in visited:
+            if dfs(node):
+                return True
+    return False
+
+def main():
+    ap = argparse.ArgumentParser(description="Deadlock detection scaling")
+    ap.add_argument("--locks", default="1000,10000,100000")
+    ap.add_argument("--legacy-max", type=int, default=10000)
+    args = ap.parse_args()
+
+    for n in (int(k) for k in args.locks.split(",")):
+        for shape, make in SHAPES.items():
+            program = make(n)
+            t0 = time.perf_counter()
+            cycles = deadlock_detector.find_cycles(deadlock_detector.build_lock_graph(program))
+            t = time.perf_counter() - t0
+            line = f"{n:7d} locks {shape:6s} {t * 1000:9.1f} ms  {len(cycles):6d} cycle(s)"
+            if n <= args.legacy_max:
+                t0 = time.perf_counter()
+                try:
+                    legacy_has_cycle(legacy_build_lock_graph(program))
+                    line += f"   previous {(time.perf_counter() - t0) * 1000:9.1f} ms"
+                except RecursionError:
+                    line += "   previous RecursionError"
+            print(line)
+
+if __name__ == "__main__":
+    main()
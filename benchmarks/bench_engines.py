@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+bench_engines.py
+
+Usage:
+  python benchmarks/bench_engines.py [--statements 200000] [--repeat 3]
+
+Statements per second of the tree-walking Interpreter vs the bytecode VM on
+straight-line generated programs:
+ - assign: only `x = <literal>;` / `x = y;` statements
+ - mixed:  assignments, sends/recvs and lock/unlock (benchmarks/programs.py)
+Only execution is timed; the VM's one-off compile time is reported separately.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime.interpreter import Interpreter
+from concurrentlang.runtime import vm
+from programs import generate_program
+
+def best_of(repeat, fn):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main():
+    ap = argparse.ArgumentParser(description="Interpreter vs bytecode VM throughput")
+    ap.add_argument("--statements", type=int, default=200000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    half = args.statements // 2
+    workloads = {
+        "assign": "int a = 0;\nint b = 0;\n" + "\n".join(f"a = {i};\nb = a;" for i in range(half)),
+        "mixed": generate_program(args.statements),
+    }
+    for label, src in workloads.items():
+        parser_obj, lexer = parser_mod.build_parser()
+        program = parser_obj.parse(src, lexer=lexer)
+        n = len(program.statements)
+
+        t0 = time.perf_counter()
+        code = vm.compile_program(program)
+        t_compile = time.perf_counter() - t0
+
+        t_tree = best_of(args.repeat, lambda: Interpreter().exec_program(program))
+        t_vm = best_of(args.repeat, lambda: vm.VM().exec_program(code))
+        print(f"{label:6s} ({n} statements)")
+        print(f"  tree-walker: {n / t_tree:12,.0f} stmts/s")
+        print(f"  bytecode VM: {n / t_vm:12,.0f} stmts/s   (x{t_tree / t_vm:.2f}; compile {t_compile * 1e3:.1f} ms once)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+bench_escape.py
+
+Usage:
+  python benchmarks/bench_escape.py [--branches 4] [--updates 2000] [--engines tree,vm,process]
+
+Each of --branches parallel branches runs one atomic block of --updates
+increments of its own variable. In the "private" case nothing else
+touches the variables, so escape analysis (sem/escape.py) keeps each one
+in its branch's frame; in the "escaping" case an extra branch reads them
+all, so they stay shared. Reports updates/s per engine and how many race
+warnings the race detector gives for each case's branches with the atomic
+blocks left out.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime.interpreter import Interpreter
+from concurrentlang.runtime.process_interpreter import ProcessInterpreter
+from concurrentlang.runtime.vm import VM
+from concurrentlang.sem import race_detector
+
+def parse(src):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(src, lexer=lexer)
+
+def source(branches, updates, escaping, protect=True):
+    lines = ["parallel {"]
+    for b in range(branches):
+        if protect:
+            lines.append("atomic {")
+            lines.extend(f"t{b} = t{b} + 1;" for _ in range(updates))
+            lines.append("}")
+        else:
+            lines.append(f"t{b} = t{b} + 1;")
+    if escaping:
+        lines.append("probe = " + " + ".join(f"t{b}" for b in range(branches)) + ";")
+    lines.append("}")
+    return "\n".join(lines)
+
+ENGINES = {
+    "tree": Interpreter,
+    "vm": VM,
+    "process": ProcessInterpreter,
+}
+
+def run(engine, src, branches):
+    # keep every branch on its own task
+    interp = ENGINES[engine](workers=branches + 1, sequentialize=False)
+    program = parse(src)
+    t0 = time.perf_counter()
+    interp.exec_program(program)
+    return time.perf_counter() - t0
+
+def main():
+    ap = argparse.ArgumentParser(description="Branch-private vs escaping variables")
+    ap.add_argument("--branches", type=int, default=4)
+    ap.add_argument("--updates", type=int, default=2000)
+    ap.add_argument("--engines", default="tree,vm,process")
+    args = ap.parse_args()
+    n = args.branches * args.updates
+
+    for label, escaping in (("private", False), ("escaping", True)):
+        src = source(args.branches, args.updates, escaping)
+        # the same branches without atomic blocks: every write outside one
+        # to a shared variable is a warning
+        bare = source(args.branches, 1, escaping, protect=False)
+        warnings = len(race_detector.find_unprotected_writes(parse(bare)))
+        print(f"{label}: {warnings} race warning(s)")
+        for engine in args.engines.split(","):
+            t = run(engine, src, args.branches)
+            print(f"  {engine:8s} {n / t:12,.0f} updates/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+bench_import.py
+
+Usage:
+  python benchmarks/bench_import.py [--repeat 7]
+
+Import cost of the concurrentlang package shim, measured in fresh
+interpreters with `python -X importtime`, median of --repeat runs:
+  import     microseconds spent importing (the cumulative time of every
+             top-level import a bare `python -c pass` does not make)
+  process    wall time of the process minus that of `python -c pass`
+for importing the package alone, one AST module, the compile server
+client, the parser, and every module MAPPINGS lists -- the last is what
+each import of the package cost when the shim loaded them all eagerly.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CASES = (
+    ("package", "import concurrentlang"),
+    ("ast.nodes", "from concurrentlang.ast import nodes"),
+    ("client", "from concurrentlang import client"),
+    ("parser", "from concurrentlang.grammar import parser"),
+    ("everything", "import concurrentlang, importlib\n"
+                   "for pkg, subs in concurrentlang.MAPPINGS.items():\n"
+                   "    for sub in subs:\n"
+                   "        importlib.import_module(f'concurrentlang.{pkg}.{sub}')"),
+)
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+def top_level(stderr):
+    # top-level imports of a run: name -> cumulative microseconds
+    out = {}
+    for m in LINE.finditer(stderr):
+        if not m.group(3):
+            out[m.group(4)] = int(m.group(2))
+    return out
+
+def run(code):
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=str(ROOT),
+                          capture_output=True, text=True, check=True,
+                          env=dict(os.environ, PYTHONPATH=str(ROOT)))
+    return time.perf_counter() - t0, top_level(proc.stderr)
+
+def main():
+    ap = argparse.ArgumentParser(description="Import time of the concurrentlang package shim")
+    ap.add_argument("--repeat", type=int, default=7)
+    args = ap.parse_args()
+
+    runs = [run("pass") for _ in range(args.repeat)]
+    startup = set().union(*(imports for _, imports in runs))
+    base = statistics.median(t for t, _ in runs)
+    print(f"python -c pass: {base * 1000:.1f} ms")
+    for label, code in CASES:
+        walls, imports = [], []
+        for _ in range(args.repeat):
+            t, top = run(code)
+            walls.append(t - base)
+            imports.append(sum(us for name, us in top.items() if name not in startup))
+        print(f"  {label:11s} import {statistics.median(imports) / 1000:8.1f} ms"
+              f"   process +{statistics.median(walls) * 1000:7.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+bench_incremental.py
+
+Usage:
+  python benchmarks/bench_incremental.py [--statements 100000] [--edits 5]
+
+Edit-to-diagnostics latency on a large program: the synthetic program of
+bench_analysis.py is checked once, then one parallel block in the middle
+is edited --edits times (a constant in it changes each time) and the
+warnings are recomputed. Times, best over the edits:
+  full         checks.check() of the whole edited program
+  incremental  IncrementalChecker.check() when the editor re-parses only
+               the edited block and splices it into the previous tree
+               (the block's parse is included)
+  reparsed     IncrementalChecker.check() of a fresh parse of the whole
+               edited file: every statement is hashed, unchanged ones
+               are not walked again (the parse itself is not included)
+Garbage collection is off while timing, as in timeit.
+"""
+import argparse
+import gc
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from concurrentlang.ast import nodes
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.sem import checks, incremental
+
+from bench_analysis import source
+
+def parse(src):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(src, lexer=lexer)
+
+def timed(fn, *args):
+    gc.disable()
+    try:
+        t0 = time.perf_counter()
+        result = fn(*args)
+        return result, time.perf_counter() - t0
+    finally:
+        gc.enable()
+
+def main():
+    ap = argparse.ArgumentParser(description="Full vs incremental re-check after an edit")
+    ap.add_argument("--statements", type=int, default=100000)
+    ap.add_argument("--edits", type=int, default=5)
+    args = ap.parse_args()
+
+    src = source(args.statements)
+    program = parse(src)
+    where = len(program.statements) // 2
+    while not isinstance(program.statements[where], nodes.ParallelBlock):
+        where += 1
+    lines = src.split("\n")
+    # the statements before `where` span this many source lines
+    line = sum(1 + (isinstance(s, nodes.ParallelBlock) and 3) for s in program.statements[:where])
+    assert lines[line] == "parallel {" and lines[line + 3] == "}"
+    original = "\n".join(lines[line:line + 4])
+
+    checker = incremental.IncrementalChecker()
+    _, first = timed(checker.check, program)
+    print(f"{args.statements} statements, {len(program.statements)} top-level; "
+          f"first check {first * 1000:.1f} ms")
+
+    best = {}
+    for edit in range(args.edits):
+        text = original.replace(" + 1;", f" + {1000 + edit};", 1)
+
+        def splice():
+            stmts = list(program.statements)
+            stmts[where] = parse(text).statements[0]
+            return checker.check(nodes.Program(stmts))
+
+        edited = "\n".join(lines[:line] + [text] + lines[line + 4:])
+        fresh = parse(edited)
+        rechecker = incremental.IncrementalChecker()
+        rechecker.check(program)
+
+        want, t_full = timed(checks.check, fresh)
+        got, t_inc = timed(splice)
+        walked = checker.analyzed
+        again, t_re = timed(rechecker.check, fresh)
+        assert got.warnings == again.warnings == want.warnings
+        for label, t in (("full", t_full), ("incremental", t_inc), ("reparsed", t_re)):
+            best[label] = min(best.get(label, t), t)
+    print(f"  full        {best['full'] * 1000:8.1f} ms")
+    print(f"  incremental {best['incremental'] * 1000:8.1f} ms  ({walked} statement walked, "
+          f"x{best['full'] / best['incremental']:.1f} faster)")
+    print(f"  reparsed    {best['reparsed'] * 1000:8.1f} ms  "
+          f"(x{best['full'] / best['reparsed']:.1f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+bench_opt.py
+
+Usage:
+  python benchmarks/bench_opt.py [--statements 20000] [--engines tree,vm]
+
+Runs a straight-line program of repeated literal stores, constant
+arithmetic and empty lock/unlock sections with and without the AST
+optimization pipeline (opt/pipeline.py). Reports each pass's statistics
+and time, statements/s with and without the pipeline (the optimized
+figure includes the time the passes take), and checks both end in the
+same state.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.opt import pipeline
+from concurrentlang.runtime.interpreter import Interpreter
+from concurrentlang.runtime.vm import VM
+
+def parse(src):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(src, lexer=lexer)
+
+def source(n):
+    # groups of four statements: two stores to the same name (the first is
+    # dead), a use of a known value and an empty critical section
+    lines = ["int base = 7;"]
+    for k in range(n // 4):
+        v = f"v{k % 50}"
+        lines.append(f"{v} = {k};")
+        lines.append(f"{v} = base * {k % 9} + 1;")
+        lines.append(f"w{k % 50} = {v} - base;")
+        lines.append(f"lock(m{k % 5}); unlock(m{k % 5});")
+    return "\n".join(lines)
+
+ENGINES = {
+    "tree": Interpreter,
+    "vm": VM,
+}
+
+def run(engine, program):
+    interp = ENGINES[engine]()
+    t0 = time.perf_counter()
+    interp.exec_program(program)
+    return time.perf_counter() - t0, interp.globals
+
+def main():
+    ap = argparse.ArgumentParser(description="AST optimization pipeline on vs off")
+    ap.add_argument("--statements", type=int, default=20000)
+    ap.add_argument("--engines", default="tree,vm")
+    args = ap.parse_args()
+    src = source(args.statements)
+    n = len(parse(src).statements)
+
+    optimized = parse(src)
+    stats = pipeline.optimize(optimized)
+    for s in stats:
+        print(s)
+    passes = sum(s.elapsed for s in stats)
+    print(f"{n} statements before, {len(optimized.statements)} after")
+    for engine in args.engines.split(","):
+        base, expected = run(engine, parse(src))
+        t, state = run(engine, optimized)
+        t += passes
+        assert state == expected, engine
+        print(f"{engine:6s} plain {n / base:12,.0f} stmt/s   optimized {n / t:12,.0f} stmt/s   x{base / t:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+bench_parallel_for.py
+
+Usage:
+  python benchmarks/bench_parallel_for.py [--iterations 20000] [--work 4] [--workers N]
+                                          [--engines tree,vm,process]
+
+Iterations/s of `parallel for i in 0..N { ... }` under each chunking
+policy against the equivalent unrolled `parallel { }` block, whose N
+branches compute the same --work assignments with the index substituted
+as a constant. The unrolled block starts a task per branch; the loop
+runs --workers tasks that claim chunks of the range.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime.interpreter import Interpreter
+from concurrentlang.runtime.process_interpreter import ProcessInterpreter
+from concurrentlang.runtime.vm import VM
+
+def parse(src):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(src, lexer=lexer)
+
+def body(index, work):
+    return " ".join(f"a{k} = {index} * {k + 1} + {k};" for k in range(work))
+
+def loop_program(n, work, schedule):
+    return parse(f"parallel for i in 0..{n} schedule({schedule}) {{ {body('i', work)} }}")
+
+def unrolled_program(n, work):
+    # one branch per iteration; an atomic groups each iteration's work
+    branches = "\n".join(f"atomic {{ {body(i, work)} }}" for i in range(n))
+    return parse("parallel {\n" + branches + "\n}")
+
+ENGINES = {
+    "tree": lambda workers: Interpreter(workers=workers),
+    "vm": lambda workers: VM(workers=workers),
+    "process": lambda workers: ProcessInterpreter(workers=workers),
+}
+
+def run(make, program):
+    interp = make()
+    t0 = time.perf_counter()
+    interp.exec_program(program)
+    return time.perf_counter() - t0
+
+def main():
+    ap = argparse.ArgumentParser(description="parallel for vs unrolled parallel block")
+    ap.add_argument("--iterations", type=int, default=20000)
+    ap.add_argument("--work", type=int, default=4, help="assignments per iteration")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    ap.add_argument("--engines", default="tree,vm,process")
+    args = ap.parse_args()
+    n = args.iterations
+
+    unrolled = unrolled_program(n, args.work)
+    loops = {kind: loop_program(n, args.work, kind) for kind in ("static", "dynamic", "guided")}
+    print(f"{n} iterations x {args.work} assignments, {args.workers} workers")
+    for name in args.engines.split(","):
+        make = lambda: ENGINES[name](args.workers)
+        base = run(make, unrolled)
+        print(f"{name:8s} unrolled {n / base:12,.0f} it/s")
+        for kind, program in loops.items():
+            t = run(make, program)
+            print(f"{name:8s} {kind:8s} {n / t:12,.0f} it/s   x{base / t:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+bench_parse_scaling.py
+
+Usage:
+  python benchmarks/bench_parse_scaling.py [--min-exp 3] [--max-exp 6] [--max-ratio 2.5]
+
+Parses generated programs of 10^min-exp .. 10^max-exp statements (top level,
+inside one `parallel { }` block and inside one `atomic { }` block) and checks
+that parse time grows near-linearly: the per-statement cost at the largest size
+may not exceed --max-ratio times the cost at the smallest size.
+"""
+import argparse
+import gc
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from concurrentlang.grammar import parser as parser_mod
+from programs import generate_program
+
+def time_parse(src):
+    parser_obj, lexer = parser_mod.build_parser()
+    gc.collect()
+    t0 = time.perf_counter()
+    result = parser_obj.parse(src, lexer=lexer)
+    elapsed = time.perf_counter() - t0
+    if result is None:
+        raise RuntimeError("parse failed")
+    return elapsed
+
+def main():
+    ap = argparse.ArgumentParser(description="Parser scaling on generated programs")
+    ap.add_argument("--min-exp", type=int, default=3)
+    ap.add_argument("--max-exp", type=int, default=6)
+    ap.add_argument("--max-ratio", type=float, default=2.5,
+                    help="allowed growth of per-statement parse time")
+    args = ap.parse_args()
+
+    failed = False
+    for shape in ("top", "parallel", "atomic"):
+        per_stmt = []
+        for exp in range(args.min_exp, args.max_exp + 1):
+            n = 10 ** exp
+            elapsed = time_parse(generate_program(n, shape))
+            per_stmt.append(elapsed / n)
+            print(f"{shape:9s} n=10^{exp:<2d} {elapsed:9.3f} s  {elapsed / n * 1e6:7.2f} us/stmt")
+        ratio = per_stmt[-1] / per_stmt[0]
+        ok = ratio <= args.max_ratio
+        failed |= not ok
+        print(f"{shape:9s} per-statement growth x{ratio:.2f} -> {'near-linear' if ok else 'SUPERLINEAR'}")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
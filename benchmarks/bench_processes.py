@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+bench_processes.py
+
+Usage:
+  python benchmarks/bench_processes.py [--statements 100000] [--cores 1,2,4,8]
+
+CPU-bound `parallel { }` block of N independent assignments, run on the
+threaded interpreter (work-stealing pool of W threads, all sharing the GIL)
+and on the process backend (W worker processes writing shared-memory
+globals), for each core count W. Core counts above os.cpu_count() are
+skipped. Reports wall time and the process backend's speedup.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime.interpreter import Interpreter
+from concurrentlang.runtime.process_interpreter import ProcessInterpreter
+
+def parse(src):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(src, lexer=lexer)
+
+def run(interp, program):
+    t0 = time.perf_counter()
+    interp.exec_program(program)
+    return time.perf_counter() - t0
+
+def main():
+    ap = argparse.ArgumentParser(description="Threaded vs multi-process parallel branches")
+    ap.add_argument("--statements", type=int, default=100000)
+    ap.add_argument("--cores", type=str, default="1,2,4,8",
+                    help="comma-separated worker counts to try")
+    args = ap.parse_args()
+    n = args.statements
+    available = os.cpu_count() or 1
+
+    program = parse("parallel {\n" + "\n".join(f"v{i % 256} = {i};" for i in range(n)) + "\n}")
+    print(f"{n} independent branches, {available} CPU(s) available")
+    for w in (int(c) for c in args.cores.split(",")):
+        if w > available:
+            print(f"{w:3d} cores   skipped")
+            continue
+        t_thread = run(Interpreter(scheduler="pool", workers=w), program)
+        t_proc = run(ProcessInterpreter(workers=w), program)
+        print(f"{w:3d} cores   threads {t_thread:7.3f} s   processes {t_proc:7.3f} s   x{t_thread / t_proc:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+bench_reduce.py
+
+Usage:
+  python benchmarks/bench_reduce.py [--iterations 50000] [--workers N]
+                                    [--engines tree,vm,process]
+
+Sums 0..N-1 into one shared variable from a `parallel for`, three ways:
+ - atomic:    `atomic { total = total + i; }` on every iteration
+ - lock:      `lock(m); total = total + i; unlock(m);` on every iteration
+ - reduce:    `reduce(+: total)`, one private partial per worker combined
+              at the join
+Reports iterations/s and checks every variant produces the same total.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime.interpreter import Interpreter
+from concurrentlang.runtime.process_interpreter import ProcessInterpreter
+from concurrentlang.runtime.vm import VM
+
+def parse(src):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(src, lexer=lexer)
+
+VARIANTS = {
+    "atomic": "parallel for i in 0..{n} {{ atomic {{ total = total + i; }} }}",
+    "lock": "parallel for i in 0..{n} {{ lock(m); total = total + i; unlock(m); }}",
+    "reduce": "parallel for i in 0..{n} reduce(+: total) {{ total = total + i; }}",
+}
+
+ENGINES = {
+    "tree": lambda workers: Interpreter(workers=workers),
+    "vm": lambda workers: VM(workers=workers),
+    "process": lambda workers: ProcessInterpreter(workers=workers),
+}
+
+def main():
+    ap = argparse.ArgumentParser(description="reduce clause vs atomic/lock per update")
+    ap.add_argument("--iterations", type=int, default=50000)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    ap.add_argument("--engines", default="tree,vm,process")
+    args = ap.parse_args()
+    n = args.iterations
+
+    programs = {name: parse("int total = 0;\n" + src.format(n=n)) for name, src in VARIANTS.items()}
+    print(f"sum of {n} indices, {args.workers} workers")
+    for engine in args.engines.split(","):
+        base = None
+        for name, program in programs.items():
+            interp = ENGINES[engine](args.workers)
+            t0 = time.perf_counter()
+            interp.exec_program(program)
+            elapsed = time.perf_counter() - t0
+            assert interp.globals["total"] == n * (n - 1) // 2, (engine, name)
+            base = base or elapsed
+            print(f"{engine:8s} {name:7s} {n / elapsed:12,.0f} it/s   x{base / elapsed:.1f}")
+
+if __name__ == "__main__":
+    main()
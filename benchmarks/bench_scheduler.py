@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+bench_scheduler.py
+
+Usage:
+  python benchmarks/bench_scheduler.py [--statements 10000] [--workers N]
+
+Thread-per-statement vs pooled execution of large `parallel { }` blocks:
+ - independent: N assignments, each its own branch
+ - blocking:    N/2 receivers listed before N/2 senders on one channel,
+                which forces the pool to compensate blocked workers
+Reports wall time, OS threads started and the pool's peak worker count.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime.interpreter import Interpreter
+
+def parse(src):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(src, lexer=lexer)
+
+def run(program, scheduler, workers):
+    interp = Interpreter(scheduler=scheduler, workers=workers)
+    t0 = time.perf_counter()
+    interp.exec_program(program)
+    elapsed = time.perf_counter() - t0
+    tm = interp.thread_manager
+    threads = len(tm.threads) if scheduler == "thread" else tm.peak_workers
+    return elapsed, threads
+
+def main():
+    ap = argparse.ArgumentParser(description="Thread-per-statement vs worker pool")
+    ap.add_argument("--statements", type=int, default=10000)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    args = ap.parse_args()
+    n = args.statements
+
+    independent = parse("parallel {\n" + "\n".join(f"v{i % 100} = {i};" for i in range(n)) + "\n}")
+    blocking = parse("chan<int> c;\nparallel {\n"
+                     + "\n".join("x = recv(c);" for _ in range(n // 2)) + "\n"
+                     + "\n".join(f"send(c, {i});" for i in range(n // 2)) + "\n}")
+
+    for label, program in (("independent", independent), ("blocking", blocking)):
+        t_thread, n_thread = run(program, "thread", None)
+        t_pool, n_pool = run(program, "pool", args.workers)
+        print(f"{label:11s} thread-per-stmt {t_thread:7.3f} s ({n_thread} threads)   "
+              f"pool {t_pool:7.3f} s (peak {n_pool} workers)   x{t_thread / t_pool:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+bench_select.py
+
+Usage:
+  python benchmarks/bench_select.py [--channels 1,4,16,64] [--messages 2000] [--rate 5000]
+
+Fan-in latency: N producer threads each send --messages timestamps on their
+own channel, together at about --rate messages per second (so the consumer
+is not overloaded and latency measures wakeup cost). They are merged either
+ - by one consumer using select over all N channels, or
+ - by one forwarding thread per channel (recv, then send to a merged
+   channel) and a consumer on the merged channel, the pre-select pattern.
+Reports median and p99 send-to-receive latency and threads used.
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from concurrentlang.runtime.interpreter import Channel, select_recv
+
+def producers(chans, messages, interval):
+    def produce(ch):
+        for _ in range(messages):
+            ch.send(time.perf_counter())
+            time.sleep(interval)
+    threads = [threading.Thread(target=produce, args=(ch,)) for ch in chans]
+    for t in threads:
+        t.start()
+    return threads
+
+def fan_in_select(n, messages, interval):
+    chans = [Channel() for _ in range(n)]
+    latencies = []
+    threads = producers(chans, messages, interval)
+    for _ in range(n * messages):
+        for ch in chans:
+            ok, sent = ch.try_recv()
+            if ok:
+                break
+        else:
+            _, sent = select_recv(chans)
+        latencies.append(time.perf_counter() - sent)
+    for t in threads:
+        t.join()
+    return latencies, n + 1
+
+def fan_in_threads(n, messages, interval):
+    chans = [Channel() for _ in range(n)]
+    merged = Channel()
+    def forward(ch):
+        for _ in range(messages):
+            merged.send(ch.recv())
+    forwarders = [threading.Thread(target=forward, args=(ch,)) for ch in chans]
+    for t in forwarders:
+        t.start()
+    latencies = []
+    threads = producers(chans, messages, interval)
+    for _ in range(n * messages):
+        sent = merged.recv()
+        latencies.append(time.perf_counter() - sent)
+    for t in threads + forwarders:
+        t.join()
+    return latencies, 2 * n + 1
+
+def main():
+    ap = argparse.ArgumentParser(description="Fan-in latency: select vs thread per channel")
+    ap.add_argument("--channels", type=str, default="1,4,16,64")
+    ap.add_argument("--messages", type=int, default=2000)
+    ap.add_argument("--rate", type=float, default=5000,
+                    help="total messages per second over all producers")
+    args = ap.parse_args()
+
+    for n in (int(c) for c in args.channels.split(",")):
+        interval = n / args.rate
+        for label, fn in (("select", fan_in_select), ("thread/channel", fan_in_threads)):
+            latencies, threads = fn(n, args.messages, interval)
+            latencies.sort()
+            median = statistics.median(latencies) * 1e6
+            p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+            print(f"{n:3d} channels {label:14s} median {median:8.1f} us   p99 {p99:9.1f} us   {threads} threads")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+bench_server.py
+
+Usage:
+  python benchmarks/bench_server.py [--statements 200] [--repeat 10] [--clients 4]
+
+End-to-end latency to get diagnostics and LLVM IR for one program, median
+of --repeat runs:
+ - cold CLI       `concurrentlang build FILE --no-cache`: Python startup,
+                  package import, parser tables, then the work
+ - warm client    `concurrentlang client llvm FILE` against a running
+                  `concurrentlang serve`: startup and import of the client
+                  process, then one socket round trip
+ - warm request   client.request() from a process that is already running,
+                  as an editor plugin would send it
+and the throughput of --clients threads sending requests at once.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from concurrentlang import client
+from programs import generate_program
+
+def median_time(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return statistics.median(times)
+
+def main():
+    ap = argparse.ArgumentParser(description="Cold CLI vs warm compile server latency")
+    ap.add_argument("--statements", type=int, default=200)
+    ap.add_argument("--repeat", type=int, default=10)
+    ap.add_argument("--clients", type=int, default=4)
+    args = ap.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    cl = [sys.executable, "-m", "concurrentlang"]
+    with tempfile.TemporaryDirectory() as root:
+        prog = os.path.join(root, "prog.cl")
+        Path(prog).write_text(generate_program(args.statements))
+        sock = os.path.join(root, "server.sock")
+        quiet = dict(env=env, stdout=subprocess.DEVNULL, check=True)
+
+        cold = median_time(lambda: subprocess.run(
+            cl + ["build", prog, "--no-cache", "-j", "1", "-o", os.path.join(root, "out")], **quiet),
+            args.repeat)
+
+        daemon = subprocess.Popen(cl + ["serve", "--socket", sock], env=env, stdout=subprocess.DEVNULL)
+        try:
+            while not os.path.exists(sock):
+                time.sleep(0.05)
+            time.sleep(0.2)
+            via_client = median_time(lambda: subprocess.run(
+                cl + ["client", "llvm", prog, "--socket", sock], **quiet), args.repeat)
+            req = {"op": "llvm", "path": prog}
+            warm = median_time(lambda: client.request(req, sock), args.repeat)
+
+            per_client = args.repeat * 5
+            def work():
+                for _ in range(per_client):
+                    assert client.request(req, sock)["status"] == "ok"
+            threads = [threading.Thread(target=work) for _ in range(args.clients)]
+            t0 = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            rate = args.clients * per_client / (time.perf_counter() - t0)
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+    print(f"program of {args.statements} statements, median of {args.repeat}")
+    print(f"  cold CLI     {cold * 1000:8.1f} ms")
+    print(f"  warm client  {via_client * 1000:8.1f} ms  (x{cold / via_client:.1f})")
+    print(f"  warm request {warm * 1000:8.1f} ms  (x{cold / warm:.1f})")
+    print(f"  {args.clients} concurrent clients: {rate:.0f} requests/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+bench_soak.py
+
+Usage:
+  python benchmarks/bench_soak.py [--statements 1000000] [--block 1000]
+                                  [--engine tree|vm] [--scheduler thread|pool] [--interval 1.0]
+
+Memory soak test: runs --statements parallel branches in one exec_program
+call, as a sequence of `parallel { }` blocks of --block assignments each.
+A sampler thread prints resident set size and the scheduler's tracked
+thread count every --interval seconds. With per-block joins and pruned
+bookkeeping, both should stay flat after warm-up.
+"""
+import argparse
+import os
+import resource
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from concurrentlang.ast import nodes as ast
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime.interpreter import Interpreter
+from concurrentlang.runtime.vm import VM, compile_program
+
+def parse(src):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(src, lexer=lexer)
+
+def rss_kib():
+    """Current resident set size in KiB (peak RSS where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def main():
+    ap = argparse.ArgumentParser(description="RSS over a long run of parallel blocks")
+    ap.add_argument("--statements", type=int, default=1000000)
+    ap.add_argument("--block", type=int, default=1000)
+    ap.add_argument("--engine", choices=("tree", "vm"), default="tree")
+    ap.add_argument("--scheduler", choices=("thread", "pool"), default="thread")
+    ap.add_argument("--interval", type=float, default=1.0)
+    args = ap.parse_args()
+
+    block = parse("parallel {\n" + "\n".join(f"v{i % 64} = {i};" for i in range(args.block)) + "\n}")
+    program = ast.Program(block.statements * max(1, args.statements // args.block))
+    if args.engine == "vm":
+        program = compile_program(program)
+        interp = VM(scheduler=args.scheduler)
+    else:
+        interp = Interpreter(scheduler=args.scheduler)
+
+    t0 = time.perf_counter()
+    finished = threading.Event()
+
+    def sample():
+        tracked = len(getattr(interp.thread_manager, "threads", ()))
+        print(f"{time.perf_counter() - t0:10.1f} {rss_kib():10d} {tracked:16d}", flush=True)
+
+    def sampler():
+        while not finished.wait(args.interval):
+            sample()
+
+    print(f"{'elapsed s':>10s} {'RSS KiB':>10s} {'tracked threads':>16s}")
+    sample()
+    threading.Thread(target=sampler, daemon=True).start()
+    interp.exec_program(program)
+    finished.set()
+    sample()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+bench_vm_dispatch.py
+
+Usage:
+  python benchmarks/bench_vm_dispatch.py [--statements 100000] [--repeat 5]
+
+Cost of the bytecode VM's dispatch loop per executed instruction, best of
+--repeat runs (garbage collection off), on straight-line programs that each
+exercise one family of opcodes:
+  assign   STORE_CONST, MOVE
+  arith    LOAD_NAME, LOAD_CONST, BINARY, STORE_NAME
+  loop     one parallel for worker: FOR_ITER, LOAD_LOCAL, BINARY, STORE_NAME, JUMP
+  chan     SEND_CONST, RECV on a bounded channel
+  lock     LOCK, UNLOCK
+  atomic   ATOMIC_ENTER, STORE_CONST, ATOMIC_EXIT
+Only execution is timed.
+"""
+import argparse
+import gc
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime import vm
+
+# m is also taken in a parallel branch, so lock elision keeps it
+PRELUDE = "chan<int, 4> c;\nparallel {\natomic { lock(m); x = 1; unlock(m); }\nx = 2;\n}\n"
+
+def source(kind, n):
+    if kind == "assign":
+        body = "".join(f"x{k % 50} = {k};\ny{k % 50} = x{k % 50};\n" for k in range(n // 2))
+    elif kind == "arith":
+        body = "".join(f"x{k % 50} = x{(k + 1) % 50} + y * 2;\n" for k in range(n))
+    elif kind == "loop":
+        body = f"parallel for i in 0..{n} schedule(static) {{ t = i + 1; }}\n"
+    elif kind == "chan":
+        body = "send(c, 1);\nv = recv(c);\n" * (n // 2)
+    elif kind == "lock":
+        body = "lock(m);\nunlock(m);\n" * (n // 2)
+    else:
+        body = "atomic { a = 1; }\n" * n
+    return PRELUDE + body
+
+def executed(code, kind, n):
+    # instructions run: the straight-line code, plus the loop body n times
+    if kind != "loop":
+        return len(code.ops)
+    body = next(b for op, b in zip(code.ops, code.b) if op == vm.PARALLEL_FOR)
+    return len(code.ops) + n * len(body.ops)
+
+def main():
+    ap = argparse.ArgumentParser(description="Bytecode VM dispatch cost per instruction")
+    ap.add_argument("--statements", type=int, default=100000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    parser_obj, lexer = parser_mod.build_parser()
+    for kind in ("assign", "arith", "loop", "chan", "lock", "atomic"):
+        program = parser_obj.parse(source(kind, args.statements), lexer=lexer.clone())
+        code = vm.compile_program(program)
+        best = float("inf")
+        gc.disable()
+        try:
+            for _ in range(args.repeat):
+                machine = vm.VM(workers=1)
+                t0 = time.perf_counter()
+                machine.exec_program(code)
+                best = min(best, time.perf_counter() - t0)
+        finally:
+            gc.enable()
+        print(f"{kind:7s} {best / executed(code, kind, args.statements) * 1e9:7.1f} ns/instruction")
+
+if __name__ == "__main__":
+    main()
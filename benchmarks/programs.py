@@ -0,0 +1,37 @@
+"""Synthetic ConcurrentLang program generators shared by the benchmarks."""
+
+def statement(i, nvars=64):
+    """One statement from a fixed rotation of the language's statement forms."""
+    v = f"v{i % nvars}"
+    k = i % 6
+    if k == 0:
+        return f"{v} = {i};"
+    if k == 1:
+        return f"{v} = v{(i + 1) % nvars};"
+    if k == 2:
+        return f"send(c, {i});"
+    if k == 3:
+        return f"lock(m{i % 8});"
+    if k == 4:
+        return f"unlock(m{(i - 1) % 8});"
+    return f"{v} = recv(c);"
+
+def generate_program(n, shape="top", nvars=64):
+    """Return source text with ``n`` generated statements.
+
+    shape: "top" puts them at top level, "parallel" / "atomic" wraps them in a
+    single block of that kind. Declarations for the variables and the channel
+    they use are emitted first and are not counted in ``n``.
+    """
+    lines = [f"int v{j} = 0;" for j in range(nvars)]
+    lines.append("chan<int> c;")
+    body = (statement(i, nvars) for i in range(n))
+    if shape == "top":
+        lines.extend(body)
+    elif shape in ("parallel", "atomic"):
+        lines.append(shape + " {")
+        lines.extend(body)
+        lines.append("}")
+    else:
+        raise ValueError(f"unknown program shape: {shape}")
+    return "\n".join(lines) + "\n"
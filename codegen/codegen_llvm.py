@@ -12,11 +12,16 @@ This generator produces a textual LLVM module (module.ll) in the "test" folder
     declare void @chan_send(i64* %chan, i64 %val)
     declare i64  @chan_recv(i64* %chan)
 - Lowers `parallel` blocks and `spawn` into separate functions (stubs).
+  Variables private to one branch (sem/escape.py) become `alloca`s of the
+  block's function, loaded from / stored back to their global if the
+  program declares one. Blocks nested in a branch get pointers to the
+  enclosing branch's allocas as arguments.
 - Lowers `lock`/`unlock` and `atomic` into calls to declared runtime helpers:
     declare void @lock_acquire(i8* %lock)
     declare void @lock_release(i8* %lock)
     declare void @atomic_enter()
     declare void @atomic_exit()
+  Locks only one task uses (sem/lock_elision.py) are elided.
 - Produces a readable .ll file; it is intentionally conservative and *not*
   a full/production-quality LLVM codegen. It aims to be useful as a first pass
   and to generate inspectable IR in the repo's test/ folder.
@@ -25,10 +30,15 @@ Usage:
     from concurrentlang.codegen.codegen_llvm import generate_module
     generate_module(ast_root)                 # writes ./test/module.ll
     generate_module(ast_root, output_path="outdir")  # writes outdir/module.ll
+    generate_module(ast_root, passes=PassManager())  # optimize the AST first
+    generate_module(ast_root, "out", filename="prog.ll")  # writes out/prog.ll
+    ir = emit_module(ast_root)                # the IR text, nothing written
 """
 
 import os
 from concurrentlang.ast import nodes
+from concurrentlang.opt.effects import effects
+from concurrentlang.sem import escape, lock_elision
 
 # Simple name sanitization for LLVM identifiers
 def llvm_ident(name: str) -> str:
@@ -43,6 +53,14 @@ class LLVMEmitter:
         self.parallel_counter = 0
         self.spawn_counter = 0
         self.used_globals = set()
+        self.private = {}    # branch -> private variable names, from sem/escape.py
+        self.locals = {}     # name -> pointer of a branch-private variable in the current function
+        self.lock_modes = {} # lock name -> mode, from sem/lock_elision.py
+
+    def var(self, name):
+        # pointer operand for a variable: its alloca or its global
+        name = llvm_ident(name)
+        return self.locals.get(name, f"@{name}")
 
     def emit(self, line=""):
         self.lines.append(line)
@@ -82,13 +100,14 @@ class LLVMEmitter:
             # fallback
             self.emit(f"@{name} = global i64 0 ; unknown type {typ}, emitted as i64")
 
-    def emit_channel(self, channame: str):
+    def emit_channel(self, channame: str, capacity=None):
         name = "chan_" + llvm_ident(channame)
         if name in self.used_globals:
             return
         self.used_globals.add(name)
         # Represent channel as i64* placeholder (actual runtime provides layout)
-        self.emit(f"@{name} = global i64* null ; channel placeholder")
+        bound = f" (capacity {capacity})" if capacity else ""
+        self.emit(f"@{name} = global i64* null ; channel placeholder{bound}")
 
     def new_function_name(self, prefix="fn"):
         self.func_counter += 1
@@ -100,7 +119,7 @@ class LLVMEmitter:
             if isinstance(stmt, nodes.VarDecl):
                 self.emit_global_var(stmt.name, stmt.typ)
             elif isinstance(stmt, nodes.ChannelDecl):
-                self.emit_channel(stmt.name)
+                self.emit_channel(stmt.name, stmt.capacity)
 
         # Emit header (runtime decls)
         self.header()
@@ -127,17 +146,17 @@ class LLVMEmitter:
         # Variable declaration with initializer: handled as global; initialization here will store initial value
         if isinstance(stmt, nodes.VarDecl):
             if stmt.init and isinstance(stmt.init, nodes.Literal):
-                name = llvm_ident(stmt.name)
-                out.append(f"; initialize @{name} with literal {stmt.init.value}")
-                out.append(f"store i64 {int(stmt.init.value)}, i64* @{name}")
+                name = self.var(stmt.name)
+                out.append(f"; initialize {name} with literal {stmt.init.value}")
+                out.append(f"store i64 {int(stmt.init.value)}, i64* {name}")
         elif isinstance(stmt, nodes.Assign):
             # Only handle Identifier <- Literal for now
             tgt = stmt.target
             expr = stmt.expr
             if isinstance(tgt, nodes.Identifier) and isinstance(expr, nodes.Literal):
-                name = llvm_ident(tgt.name)
-                out.append(f"; assign {expr.value} to @{name}")
-                out.append(f"store i64 {int(expr.value)}, i64* @{name}")
+                name = self.var(tgt.name)
+                out.append(f"; assign {expr.value} to {name}")
+                out.append(f"store i64 {int(expr.value)}, i64* {name}")
             else:
                 out.append(f"; assign: complex expr not lowered (target={type(tgt).__name__}, expr={type(expr).__name__})")
         elif isinstance(stmt, nodes.ChannelDecl):
@@ -157,25 +176,48 @@ class LLVMEmitter:
             # recv target = recv(chan)
             if isinstance(stmt.chan, nodes.Identifier) and isinstance(stmt.target, nodes.Identifier):
                 chan_g = "chan_" + llvm_ident(stmt.chan.name)
-                tgt = llvm_ident(stmt.target.name)
-                out.append(f"; recv into @{tgt} from @{chan_g}")
+                tgt = self.var(stmt.target.name)
+                out.append(f"; recv into {tgt} from @{chan_g}")
                 out.append(f"%recv_tmp = call i64 @chan_recv(i64* @{chan_g})")
-                out.append(f"store i64 %recv_tmp, i64* @{tgt}")
+                out.append(f"store i64 %recv_tmp, i64* {tgt}")
             else:
                 out.append("; recv: complex pattern not lowered")
         elif isinstance(stmt, nodes.ParallelBlock):
             # create a helper function for the block and call it (no real threading here)
             self.parallel_counter += 1
             fname = f"parallel_block_{self.parallel_counter}"
+            # the enclosing branch's private variables are passed by pointer,
+            # so the block reads and writes the caller's allocas, not @globals
+            outer = self.locals
+            used = {llvm_ident(n) for names in effects(stmt.statements) for n in names}
+            inherited = sorted(name for name in outer if name in used)
+            args = ", ".join(f"i64* {outer[name]}" for name in inherited)
+            params = ", ".join(f"i64* %{name}.ptr" for name in inherited)
             out.append(f"; parallel block -> call @{fname} (stubbed sequentially)")
-            out.append(f"call void @{fname}()")
+            out.append(f"call void @{fname}({args})")
             # emit the function definition after main
             self.emit("")  # blank line separator
-            self.emit(f"define void @{fname}() {{")
+            self.emit(f"define void @{fname}({params}) {{")
             self.emit("entry:")
+            self.locals = {name: f"%{name}.ptr" for name in inherited}
+            owned = [llvm_ident(n) for s in stmt.statements for n in self.private.get(s, ())]
+            # where each private variable lives outside the block, if anywhere
+            homes = {name: self.locals.get(name, f"@{name}") for name in owned
+                     if name in self.locals or name in self.used_globals}
+            for name in owned:
+                self.emit(f"  %{name} = alloca i64 ; private to one branch")
+                if name in homes:
+                    self.emit(f"  %{name}.in = load i64, i64* {homes[name]}")
+                    self.emit(f"  store i64 %{name}.in, i64* %{name}")
+                self.locals[name] = f"%{name}"
             for s in stmt.statements:
                 for l in self.lower_statement(s, parent_context=fname):
                     self.emit("  " + l)
+            for name in owned:
+                if name in homes:
+                    self.emit(f"  %{name}.out = load i64, i64* %{name}")
+                    self.emit(f"  store i64 %{name}.out, i64* {homes[name]}")
+            self.locals = outer
             self.emit("  ret void")
             self.emit("}")
             self.emit("")  # blank line after function
@@ -197,6 +239,10 @@ class LLVMEmitter:
             self.emit("  ret void")
             self.emit("}")
             self.emit("")
+        elif isinstance(stmt, (nodes.Lock, nodes.Unlock)) and \
+                self.lock_modes.get(stmt.var.name) == lock_elision.ELIDE:
+            out.append(f"; {'lock' if isinstance(stmt, nodes.Lock) else 'unlock'} "
+                       f"@{llvm_ident(stmt.var.name)} elided (one task only)")
         elif isinstance(stmt, nodes.Lock):
             # call runtime helper with lock pointer as i8* (we represent lock as global by name)
             if isinstance(stmt.var, nodes.Identifier):
@@ -224,25 +270,42 @@ class LLVMEmitter:
             out.append(f"; unhandled stmt type: {type(stmt).__name__}")
         return out
 
-def generate_module(ast_root, output_path=None):
+def emit_module(ast_root, passes=None):
+    """
+    Return the textual LLVM IR for the given AST root, without writing it.
+    passes: optional concurrentlang.opt.pipeline.PassManager run over the AST
+    (in place) before lowering.
+    """
+    if not isinstance(ast_root, nodes.Program):
+        raise TypeError("generate_module expects ast_root of type nodes.Program")
+    emitter = LLVMEmitter()
+    if passes is not None:
+        passes.run(ast_root)
+    emitter.private = escape.analyze(ast_root).private
+    emitter.lock_modes = lock_elision.analyze(ast_root)
+
+    emitter.lower_program(ast_root)
+    return "\n".join(emitter.lines)
+
+def generate_module(ast_root, output_path=None, passes=None, filename="module.ll"):
     """
     Generate a textual LLVM IR file (module.ll) for the given AST root.
-    output_path: directory path where 'module.ll' will be written. Defaults to './test'.
+    output_path: directory path where the file will be written. Defaults to './test'.
+    passes: optional concurrentlang.opt.pipeline.PassManager run over the AST
+    (in place) before lowering.
+    filename: name of the file written in output_path, e.g. one per input
+    when compiling many programs into the same directory.
     """
     if output_path is None:
         output_path = os.path.join(os.getcwd(), "test")
     if not os.path.exists(output_path):
         os.makedirs(output_path, exist_ok=True)
 
-    emitter = LLVMEmitter()
-    if not isinstance(ast_root, nodes.Program):
-        raise TypeError("generate_module expects ast_root of type nodes.Program")
-
-    emitter.lower_program(ast_root)
+    ir = emit_module(ast_root, passes)
 
-    out_file = os.path.join(output_path, "module.ll")
+    out_file = os.path.join(output_path, filename)
     with open(out_file, "w", encoding="utf-8") as f:
-        f.write("\n".join(emitter.lines))
+        f.write(ir)
     print(f"LLVM IR written to {out_file}")
     return out_file
 
@@ -2,13 +2,18 @@
 `from concurrentlang.grammar import lexer` when project files live
 as top-level packages (e.g. `grammar`, `runtime`, `ast`, `sem`).
 
-This module preloads the common subpackages and registers
-`concurrentlang.<pkg>` and `concurrentlang.<pkg>.<sub>` entries in
-`sys.modules` so legacy imports in the repository continue to work.
+This module registers one `concurrentlang.<pkg>` package in `sys.modules`
+per project folder, with the folder as its `__path__`, and loads nothing
+else: `concurrentlang.<pkg>.<sub>` is found and executed by the regular
+import system the first time it is imported, or accessed as an attribute
+of its package, so importing `concurrentlang.ast.nodes` does not pay for
+the parser or the runtimes. An error while importing a submodule
+propagates like any other import error.
 """
 import sys
 import os
-import importlib.util
+import importlib
+import importlib.machinery
 import types
 
 # Ensure repo root (parent of this file) is first on sys.path so local
@@ -21,38 +26,41 @@ if ROOT not in sys.path:
 # Map of project folders and the module files we want to expose under
 # `concurrentlang.<pkg>.<sub>` so code that does
 # `from concurrentlang.grammar import lexer` works even when the repo
-# uses plain folders (no package __init__.py).
+# uses plain folders (no package __init__.py). Listed modules can also be
+# reached as attributes (`concurrentlang.sem.escape`) without an import.
 MAPPINGS = {
-    'grammar': ['lexer', 'parser'],
-    'runtime': ['interpreter', 'runtime', 'atomic'],
-    'ast': ['nodes'],
-    'sem': ['semantic', 'deadlock_detector', 'race_detector'],
+    'grammar': ['lexer', 'parser', 'astcache'],
+    'runtime': ['scheduler', 'interpreter', 'runtime', 'atomic', 'vm', 'async_interpreter', 'process_interpreter'],
+    'ast': ['nodes', 'ops', 'serialize'],
+    'sem': ['analysis', 'semantic', 'deadlock_detector', 'escape', 'lock_elision', 'race_detector', 'resolver', 'sequentialize', 'checks', 'incremental'],
+    'opt': ['effects', 'constprop', 'dse', 'syncelim', 'pipeline'],
+    'codegen': ['codegen_llvm'],
 }
 
+def _lazy_getattr(pkg_name, subs):
+    # module __getattr__ (PEP 562): import a listed submodule on first use;
+    # the import system then sets it on the package
+    def __getattr__(name):
+        if name in subs:
+            return importlib.import_module(f'{pkg_name}.{name}')
+        raise AttributeError(f"module {pkg_name!r} has no attribute {name!r}")
+    return __getattr__
+
 for pkg, subs in MAPPINGS.items():
-    pkg_mod = types.ModuleType(f'concurrentlang.{pkg}')
+    folder = os.path.join(ROOT, pkg)
+    if not os.path.isdir(folder):
+        continue
+    name = f'concurrentlang.{pkg}'
+    spec = importlib.machinery.ModuleSpec(name, None, is_package=True)
+    spec.submodule_search_locations = [folder]
+    pkg_mod = types.ModuleType(name)
+    pkg_mod.__spec__ = spec
+    pkg_mod.__package__ = name
     # Mark as package by providing a __path__ so importlib treats it as one
-    pkg_mod.__path__ = [os.path.join(ROOT, pkg)]
-    # register package module early so submodules can import the package
-    sys.modules[f'concurrentlang.{pkg}'] = pkg_mod
-    added_any = False
-    for sub in subs:
-        candidate = os.path.join(ROOT, pkg, f'{sub}.py')
-        if not os.path.isfile(candidate):
-            continue
-        name = f'concurrentlang.{pkg}.{sub}'
-        spec = importlib.util.spec_from_file_location(name, candidate)
-        if spec is None or spec.loader is None:
-            continue
-        mod = importlib.util.module_from_spec(spec)
-        try:
-            spec.loader.exec_module(mod)
-        except Exception:
-            continue
-        sys.modules[name] = mod
-        setattr(pkg_mod, sub, mod)
-        added_any = True
-    if added_any:
-        globals()[pkg] = pkg_mod
+    pkg_mod.__path__ = spec.submodule_search_locations
+    pkg_mod.__getattr__ = _lazy_getattr(name, frozenset(subs))
+    pkg_mod.__dir__ = (lambda subs: lambda: sorted(subs))(subs)
+    sys.modules[name] = pkg_mod
+    globals()[pkg] = pkg_mod
 
 __all__ = list(MAPPINGS.keys())
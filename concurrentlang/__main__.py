@@ -0,0 +1,26 @@
+"""Command line entry point.
+
+  concurrentlang build PATH ...   compile many programs (concurrentlang/build.py)
+  concurrentlang serve            run a compile server (concurrentlang/server.py)
+  concurrentlang client OP FILE   send a program to the compile server (concurrentlang/client.py)
+  concurrentlang [--file F] ...   parse and run one program (run_example.py)
+"""
+import sys
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["build"]:
+        from concurrentlang import build
+        return build.main(argv[1:])
+    if argv[:1] == ["serve"]:
+        from concurrentlang import server
+        return server.main(argv[1:])
+    if argv[:1] == ["client"]:
+        from concurrentlang import client
+        return client.main(argv[1:])
+    import run_example
+    sys.argv = [sys.argv[0]] + list(argv)
+    return run_example.main()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""
+concurrentlang build
+
+Usage:
+  concurrentlang build PATH [PATH ...] [--out-dir build] [--jobs N] [--report FILE]
+                       [--no-cache] [--cache-dir DIR] [--no-opt] [--disable-pass NAME]
+  python -m concurrentlang build ...
+
+Compiles many programs at once. Each PATH is a .cl file, a directory
+(searched recursively for .cl files) or a glob pattern. For every input this:
+ - parses it and runs the static checks (sem/checks.py); lexer and parser
+   errors and the checks' warnings are its diagnostics
+ - runs the AST optimization pipeline (opt/pipeline.py) unless --no-opt
+ - lowers it with codegen_llvm to <out-dir>/<input path>.ll
+The inputs are spread over a pool of worker processes (--jobs, default: CPU
+count), which share the parser tables built before they start. Each input's
+AST, diagnostics and IR are stored in a content-addressed cache keyed by the
+source text, the build options and a hash of the compiler's own sources, so
+an input that has not changed since it was last built is only copied out.
+A JSON report (default: <out-dir>/build-report.json) lists each file's
+status, diagnostics and per-phase timings. Exits with status 1 when an input
+has syntax errors.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from concurrentlang.ast import serialize
+from concurrentlang.codegen import codegen_llvm
+from concurrentlang.grammar import lexer as lexmod
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.opt import pipeline
+from concurrentlang.sem import checks
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# the folders whose code decides a build's diagnostics and IR
+TOOLCHAIN = ('ast', 'codegen', 'grammar', 'opt', 'sem')
+
+def collect(paths):
+    """Sorted .cl files named by ``paths``: files, directories (searched
+    recursively) or glob patterns. Raises FileNotFoundError for a path
+    that matches nothing."""
+    files = set()
+    for path in paths:
+        matches = glob.glob(path, recursive=True)
+        if not matches:
+            raise FileNotFoundError(f"no input matches {path}")
+        for m in matches:
+            if os.path.isdir(m):
+                files.update(glob.glob(os.path.join(m, '**', '*.cl'), recursive=True))
+            else:
+                files.add(m)
+    return sorted(os.path.normpath(f) for f in files)
+
+def output_path(src, out_dir):
+    """Where the IR of the input ``src`` goes: its path below the current
+    directory (or its file name, for inputs outside it), under ``out_dir``."""
+    rel = os.path.relpath(src)
+    if rel.startswith(os.pardir):
+        rel = os.path.basename(src)
+    return os.path.join(out_dir, os.path.splitext(rel)[0] + '.ll')
+
+def toolchain_hash():
+    """Digest of the grammar, the node schema and the sources of the
+    passes that produce a build's outputs; part of every cache key."""
+    h = hashlib.sha256()
+    h.update(parser_mod.grammar_hash().encode())
+    h.update(serialize.schema_hash().encode())
+    for pkg in TOOLCHAIN:
+        folder = os.path.join(ROOT, pkg)
+        for name in sorted(os.listdir(folder)):
+            if name.endswith('.py'):
+                h.update(name.encode())
+                with open(os.path.join(folder, name), 'rb') as f:
+                    h.update(f.read())
+    return h.hexdigest()[:16]
+
+class ArtifactCache:
+    """Build outputs by content: the entry for a key is a directory
+    ``<root>/<key[:2]>/<key>`` holding result.json (status and diagnostics)
+    and, for a successful build, ast.bin and module.ll."""
+    def __init__(self, root=None):
+        if root is None:
+            root = os.path.join(parser_mod.cache_root(), 'build')
+        self.root = root
+
+    @staticmethod
+    def key(toolchain, options, src):
+        h = hashlib.sha256()
+        h.update(toolchain.encode())
+        h.update(json.dumps(options, sort_keys=True).encode())
+        h.update(src)
+        return h.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key):
+        """The entry directory for ``key`` and its result, or (None, None)."""
+        entry = self.path(key)
+        try:
+            with open(os.path.join(entry, 'result.json'), encoding='utf-8') as f:
+                return entry, json.load(f)
+        except (OSError, ValueError):
+            return None, None
+
+    def put(self, key, files):
+        """Store ``files`` (name -> bytes) as the entry for ``key``."""
+        entry = self.path(key)
+        tmp = f'{entry}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(tmp, exist_ok=True)
+            for name, data in files.items():
+                with open(os.path.join(tmp, name), 'wb') as f:
+                    f.write(data)
+            # a complete entry appears at once; if another worker stored
+            # the same key meanwhile, keep theirs
+            os.replace(tmp, entry)
+        except OSError:
+            # The cache is an optimization; a read-only or full disk is not an error.
+            shutil.rmtree(tmp, ignore_errors=True)
+
+def parse_source(text):
+    """Parse ``text`` without printing anything; returns (program, errors).
+    The lexer and parser recover from errors, so the program is None when
+    they reported any."""
+    parser_obj, lexer = parser_mod.build_parser()
+    with lexmod.recording(echo=False) as errors:
+        program = parser_obj.parse(text, lexer=lexer)
+    if program is None and not errors:
+        errors = ["Syntax error"]
+    return (None if errors else program), errors
+
+def lower(program, options):
+    """Optimize ``program`` in place as ``options`` (a dict with 'opt' and
+    'disabled', the pass names to skip) say, and return its LLVM IR."""
+    passes = pipeline.PassManager(disabled=options['disabled']) if options['opt'] else None
+    return codegen_llvm.emit_module(program, passes)
+
+def compile_file(job):
+    """Build one input; ``job`` is (source path, output path, options,
+    toolchain hash, cache root or None). Returns its report record."""
+    src_path, out_path, options, toolchain, cache_root = job
+    start = time.perf_counter()
+    times = {}
+    record = {'file': src_path, 'output': None, 'status': None, 'diagnostics': [], 'seconds': times}
+    with open(src_path, 'rb') as f:
+        src = f.read()
+    cache = ArtifactCache(cache_root) if cache_root is not None else None
+    key = ArtifactCache.key(toolchain, options, src)
+    entry, result = cache.get(key) if cache is not None else (None, None)
+    if result is not None:
+        record['diagnostics'] = result['diagnostics']
+        if result['status'] == 'ok':
+            os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+            shutil.copyfile(os.path.join(entry, 'module.ll'), out_path)
+            record['output'] = out_path
+            record['status'] = 'cached'
+        else:
+            record['status'] = result['status']
+        times['total'] = time.perf_counter() - start
+        return record
+
+    t0 = time.perf_counter()
+    try:
+        program, errors = parse_source(src.decode('utf-8'))
+    except UnicodeDecodeError as e:
+        program, errors = None, [f"Source is not valid UTF-8: {e.reason} at byte {e.start}"]
+    times['parse'] = time.perf_counter() - t0
+    files = {}
+    if errors:
+        record['status'] = 'error'
+        record['diagnostics'] = errors
+    else:
+        t0 = time.perf_counter()
+        record['diagnostics'] = checks.check(program).warnings
+        times['check'] = time.perf_counter() - t0
+        files['ast.bin'] = serialize.dumps(program)
+        t0 = time.perf_counter()
+        files['module.ll'] = lower(program, options).encode()
+        times['codegen'] = time.perf_counter() - t0
+        os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+        with open(out_path, 'wb') as f:
+            f.write(files['module.ll'])
+        record['output'] = out_path
+        record['status'] = 'ok'
+    if cache is not None:
+        result = {'status': record['status'], 'diagnostics': record['diagnostics']}
+        files['result.json'] = json.dumps(result).encode()
+        cache.put(key, files)
+    times['total'] = time.perf_counter() - start
+    return record
+
+def build(paths, out_dir='build', jobs=None, cache_root=None, use_cache=True,
+          opt=True, disabled=()):
+    """Compile every input named by ``paths`` (see collect()); returns the
+    report: a dict with a record per file, in input order."""
+    files = collect(paths)
+    outputs = [output_path(f, out_dir) for f in files]
+    if len(set(outputs)) != len(outputs):
+        raise ValueError("inputs outside the current directory share a file name")
+    if use_cache and cache_root is None:
+        cache_root = ArtifactCache().root
+    options = {'opt': opt, 'disabled': sorted(disabled)}
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(files)))
+    start = time.perf_counter()
+    # parser tables and the toolchain hash are computed once, before the
+    # workers fork
+    parser_mod.build_parser()
+    toolchain = toolchain_hash()
+    work = [(f, o, options, toolchain, cache_root if use_cache else None)
+            for f, o in zip(files, outputs)]
+    if workers == 1:
+        records = [compile_file(job) for job in work]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            records = list(pool.map(compile_file, work, chunksize=max(1, len(work) // (workers * 4))))
+    report = {'files': records, 'workers': workers, 'seconds': time.perf_counter() - start}
+    for status in ('ok', 'cached', 'error'):
+        report[status] = sum(r['status'] == status for r in records)
+    return report
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="concurrentlang build",
+                                 description="Compile ConcurrentLang programs to LLVM IR in parallel")
+    ap.add_argument("paths", nargs="+", metavar="PATH",
+                    help=".cl file, directory (searched recursively) or glob pattern")
+    ap.add_argument("--out-dir", "-o", default="build",
+                    help="Directory the .ll files and the report go to (default: build)")
+    ap.add_argument("--jobs", "-j", type=int, default=None,
+                    help="Worker processes (default: CPU count)")
+    ap.add_argument("--report", default=None,
+                    help="Path of the JSON build report (default: <out-dir>/build-report.json)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="Compile every input, without reading or filling the artifact cache")
+    ap.add_argument("--cache-dir", default=None,
+                    help="Artifact cache directory (default: <cache root>/build)")
+    ap.add_argument("--no-opt", action="store_true",
+                    help="Lower the parsed AST as written, without the optimization passes")
+    ap.add_argument("--disable-pass", action="append", default=[], metavar="NAME",
+                    choices=tuple(pipeline.PASSES),
+                    help="Skip one optimization pass (constprop, dse or sync); may be repeated")
+    args = ap.parse_args(argv)
+
+    try:
+        report = build(args.paths, args.out_dir, args.jobs, args.cache_dir, not args.no_cache,
+                       not args.no_opt, args.disable_pass)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}")
+        return 2
+    for r in report['files']:
+        for d in r['diagnostics']:
+            print(f"{r['file']}: {d}")
+    report_path = args.report or os.path.join(args.out_dir, 'build-report.json')
+    os.makedirs(os.path.dirname(report_path) or '.', exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"{len(report['files'])} files: {report['ok']} built, {report['cached']} cached, "
+          f"{report['error']} failed in {report['seconds']:.2f} s ({report['workers']} workers); "
+          f"report in {report_path}")
+    return 1 if report['error'] else 0
@@ -0,0 +1,76 @@
+"""
+concurrentlang client
+
+Usage:
+  concurrentlang client {check,ast,llvm} FILE [--socket PATH] [--no-opt] [--disable-pass NAME]
+
+Thin client of the compile server (concurrentlang/server.py, which also
+describes the protocol): sends one request -- the file's path, or its text
+read from stdin for FILE "-" -- prints the diagnostics and the AST or IR,
+and exits with status 1 on syntax errors. It only needs the standard
+library, so it starts without loading the compiler.
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+
+from concurrentlang.paths import cache_root
+
+OPS = ('check', 'ast', 'llvm')
+
+def default_socket():
+    path = os.environ.get('CONCURRENTLANG_SOCKET')
+    if not path:
+        path = os.path.join(cache_root(), 'server.sock')
+    return path
+
+def request(req, path=None, timeout=None):
+    """Send the request ``req`` to the server on ``path``; returns its reply.
+    Raises OSError when no server is listening there."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        # a blocking connect waits while the server's backlog is full
+        s.connect(path or default_socket())
+        s.settimeout(timeout)
+        s.sendall(json.dumps(req).encode() + b'\n')
+        with s.makefile('rb') as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError("compile server closed the connection")
+    return json.loads(line)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="concurrentlang client",
+                                 description="Send a program to a running ConcurrentLang compile server")
+    ap.add_argument("op", choices=OPS, help="diagnostics only, or with the AST or the LLVM IR")
+    ap.add_argument("file", help="Path of the .cl file, or - to send stdin")
+    ap.add_argument("--socket", default=None, help="Socket path of the server")
+    ap.add_argument("--no-opt", action="store_true",
+                    help="Lower the parsed AST as written, without the optimization passes")
+    ap.add_argument("--disable-pass", action="append", default=[], metavar="NAME",
+                    choices=("constprop", "dse", "sync"),
+                    help="Skip one optimization pass (constprop, dse or sync); may be repeated")
+    args = ap.parse_args(argv)
+
+    req = {'op': args.op, 'opt': not args.no_opt, 'disabled': args.disable_pass}
+    if args.file == "-":
+        req['source'] = sys.stdin.read()
+    else:
+        req['path'] = os.path.abspath(args.file)
+    try:
+        reply = request(req, args.socket)
+    except OSError as e:
+        print(f"Error: no compile server at {args.socket or default_socket()} ({e}); "
+              f"start one with `concurrentlang serve`")
+        return 2
+    if 'error' in reply:
+        print(f"Error: {reply['error']}")
+        return 2
+    for d in reply['diagnostics']:
+        print(f"{args.file}: {d}")
+    if 'ast' in reply:
+        print(json.dumps(reply['ast'], indent=2))
+    elif 'llvm' in reply:
+        print(reply['llvm'])
+    return 1 if reply['status'] == 'error' else 0
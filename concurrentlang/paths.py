@@ -0,0 +1,16 @@
+"""Where ConcurrentLang keeps its on-disk state. Standard library only, so
+the compile server's client can find the server without loading the
+compiler."""
+import os
+
+def cache_root():
+    """Directory for on-disk caches (parser tables, ...).
+
+    Honours ``CONCURRENTLANG_CACHE_DIR``, then ``XDG_CACHE_HOME``, and falls
+    back to ``~/.cache/concurrentlang``.
+    """
+    root = os.environ.get('CONCURRENTLANG_CACHE_DIR')
+    if not root:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        root = os.path.join(base, 'concurrentlang')
+    return root
@@ -0,0 +1,136 @@
+"""
+concurrentlang serve
+
+Usage:
+  concurrentlang serve [--socket PATH]
+
+A compile server keeps the parser tables, the analyses and the LLVM backend
+loaded in one long-lived process, so a request costs only the work on its
+program, without interpreter startup, package import or build_parser().
+It listens on a Unix socket (--socket, default: $CONCURRENTLANG_SOCKET or
+<cache root>/server.sock) and serves each connection on its own thread;
+concurrentlang/client.py is the client side.
+
+The protocol is one JSON object per line each way. A request names an op
+and gives either the program text or a file path the server reads:
+  {"op": "check" | "ast" | "llvm", "source": "..."}   or   {"op": ..., "path": "..."}
+with, for "llvm", optional "opt" (default true) and "disabled" (pass names).
+The reply has "status" ("ok" or "error" for syntax errors) and
+"diagnostics" (syntax errors, or the static checks' warnings) and, for a
+program that parses, "ast" (the tree as JSON) or "llvm" (the IR text); a
+request that cannot be served gets {"error": "..."} instead.
+"""
+import argparse
+import json
+import os
+import signal
+import socketserver
+import stat
+import sys
+
+from concurrentlang import build, client
+from concurrentlang.ast import serialize
+from concurrentlang.client import OPS
+from concurrentlang.sem import checks
+
+def respond(request):
+    """The reply to one decoded request (see the module docstring)."""
+    if not isinstance(request, dict) or request.get('op') not in OPS:
+        return {'error': f"op must be one of {', '.join(OPS)}"}
+    if isinstance(request.get('source'), str):
+        text = request['source']
+    elif 'path' in request:
+        try:
+            with open(request['path'], encoding='utf-8') as f:
+                text = f.read()
+        except OSError as e:
+            return {'error': f"cannot read {request['path']}: {e.strerror}"}
+    else:
+        return {'error': "request needs a 'source' text or a 'path'"}
+    program, errors = build.parse_source(text)
+    if errors:
+        return {'status': 'error', 'diagnostics': errors}
+    reply = {'status': 'ok', 'diagnostics': checks.check(program).warnings}
+    if request['op'] == 'ast':
+        reply['ast'] = serialize.to_simple(program)
+    elif request['op'] == 'llvm':
+        options = {'opt': request.get('opt', True), 'disabled': request.get('disabled', [])}
+        try:
+            reply['llvm'] = build.lower(program, options)
+        except ValueError as e:  # unknown pass name
+            return {'error': str(e)}
+    return reply
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # any number of requests per connection, answered in order
+        for line in self.rfile:
+            try:
+                reply = respond(json.loads(line))
+            except ValueError as e:
+                reply = {'error': f"bad request: {e}"}
+            except Exception as e:
+                # keep serving; the client still gets an answer
+                reply = {'error': f"internal error: {type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(reply).encode() + b'\n')
+            self.wfile.flush()
+
+class CompileServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Compile server listening on the Unix socket ``path``; call
+    serve_forever() to run it and server_close() to remove the socket."""
+    daemon_threads = True
+    request_queue_size = 128  # clients connecting at once
+
+    def __init__(self, path=None):
+        path = path or client.default_socket()
+        if os.path.exists(path):
+            # a socket left behind by a server that did not shut down
+            # cleanly is replaced; a live one, or any other file, is not
+            if not stat.S_ISSOCK(os.stat(path).st_mode):
+                raise OSError(f"{path} exists and is not a socket")
+            try:
+                client.request({'op': 'check', 'source': ''}, path)
+            except OSError:
+                os.unlink(path)
+            else:
+                raise OSError(f"a compile server is already listening on {path}")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # the socket is created by bind() and accepts connections from
+        # listen() on: make it owner-only from the start rather than
+        # chmod-ing it once another user may already have connected
+        umask = os.umask(0o177)
+        try:
+            super().__init__(path, _Handler)
+        finally:
+            os.umask(umask)
+        # load the parser tables and run every stage once before serving
+        respond({'op': 'llvm', 'source': "int x = 0;\nparallel {\nlock(m);\nx = 1;\nunlock(m);\n}\n"})
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="concurrentlang serve",
+                                 description="Run a ConcurrentLang compile server on a Unix socket")
+    ap.add_argument("--socket", default=None,
+                    help="Socket path (default: $CONCURRENTLANG_SOCKET or <cache root>/server.sock)")
+    args = ap.parse_args(argv)
+    try:
+        server = CompileServer(args.socket)
+    except OSError as e:
+        print(f"Error: {e}")
+        return 2
+    # stop cleanly (and remove the socket) on SIGTERM as on Ctrl-C
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"Compile server listening on {server.server_address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
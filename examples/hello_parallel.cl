@@ -1,7 +1,5 @@
-```text
 int x = 0;
 chan<int> c;
 parallel {
   send(c, 42);
 }
-```
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""On-disk cache of parsed ASTs keyed by source hash.
+
+Entries live under ``<cache_root>/ast`` and are keyed by the SHA-256 of the
+source text together with the grammar hash and the AST serialization schema,
+so a grammar or node change simply misses instead of loading a stale tree.
+"""
+import hashlib
+import os
+import threading
+
+from concurrentlang.grammar import lexer as lexmod
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.ast import serialize
+
+class ASTCache:
+    def __init__(self, root=None):
+        if root is None:
+            root = os.path.join(parser_mod.cache_root(), 'ast')
+        self.root = root
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, src):
+        h = hashlib.sha256()
+        h.update(parser_mod.grammar_hash().encode())
+        h.update(serialize.schema_hash().encode())
+        h.update(src.encode('utf-8'))
+        return h.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], key + '.ast')
+
+    def get(self, src):
+        """Return the cached AST for ``src`` or None."""
+        try:
+            with open(self.path(self.key(src)), 'rb') as f:
+                node = serialize.loads(f.read())
+        except (OSError, ValueError, IndexError, KeyError, TypeError):
+            # unreadable, foreign or damaged (a truncated or flipped entry
+            # can still unmarshal, and then fail while it is decoded)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return node
+
+    def put(self, src, node):
+        path = self.path(self.key(src))
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, 'wb') as f:
+                f.write(serialize.dumps(node))
+            os.replace(tmp, path)
+        except OSError:
+            # The cache is an optimization; a read-only or full disk is not an error.
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+def parse_cached(src, cache=None):
+    """Parse ``src``, reusing ``cache`` (an ASTCache) when it has the tree.
+
+    Returns the Program, or None when the lexer or parser reported an error
+    (the tree PLY recovers to then lacks statements, and is never cached).
+    """
+    if cache is not None:
+        node = cache.get(src)
+        if node is not None:
+            return node
+    parser_obj, lexer = parser_mod.build_parser()
+    with lexmod.recording() as errors:
+        node = parser_obj.parse(src, lexer=lexer)
+    if errors or node is None:
+        return None
+    if cache is not None:
+        cache.put(src, node)
+    return node
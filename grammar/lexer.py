@@ -1,4 +1,7 @@
 # Minimal PLY lexer for ConcurrentLang
+import contextlib
+import sys
+import threading
 import ply.lex as lex
 
 # Reserved words
@@ -11,13 +14,20 @@ reserved = {
     'send': 'SEND',
     'recv': 'RECV',
     'atomic': 'ATOMIC',
+    'select': 'SELECT',
+    'case': 'CASE',
+    'for': 'FOR',
+    'in': 'IN',
+    'schedule': 'SCHEDULE',
+    'reduce': 'REDUCE',
     'int': 'INT',      # example type
     'bool': 'BOOL',
 }
 
 tokens = [
     'ID', 'NUMBER', 'LBRACE', 'RBRACE', 'LPAREN', 'RPAREN',
-    'LT', 'GT', 'SEMI', 'COMMA', 'ASSIGN',
+    'LT', 'GT', 'SEMI', 'COMMA', 'ASSIGN', 'COLON', 'DOTDOT',
+    'PLUS', 'MINUS', 'TIMES', 'DIVIDE', 'MOD',
 ] + list(reserved.values())
 
 # Token regexes
@@ -30,11 +40,20 @@ t_GT = r'>'
 t_SEMI = r';'
 t_COMMA = r','
 t_ASSIGN = r'='
+t_COLON = r':'
+t_DOTDOT = r'\.\.'
+t_PLUS = r'\+'
+t_MINUS = r'-'
+t_TIMES = r'\*'
+t_DIVIDE = r'/'
+t_MOD = r'%'
 
 t_ignore = ' \t\r'
 
 def t_ID(t):
     r'[A-Za-z_][A-Za-z0-9_]*'
+    # Intern names so every occurrence of an identifier shares one string.
+    t.value = sys.intern(t.value)
     t.type = reserved.get(t.value, 'ID')
     return t
 
@@ -52,9 +71,36 @@ def t_comment(t):
     pass
 
 def t_error(t):
-    print(f"Illegal character {t.value[0]!r} at line {t.lineno}")
+    report_error(f"Illegal character {t.value[0]!r} at line {t.lineno}")
     t.lexer.skip(1)
 
+# Both PLY stages recover from an error and go on, so a partial tree comes
+# back either way; the errors a thread reports are also collected here while
+# it runs inside recording().
+_recording = threading.local()
+
+def report_error(message):
+    """Print a lexer or parser error and note it for recording()."""
+    errors = getattr(_recording, 'errors', None)
+    if errors is None:
+        print(message)
+        return
+    if _recording.echo:
+        print(message)
+    errors.append(message)
+
+@contextlib.contextmanager
+def recording(echo=True):
+    """Collect the errors reported on this thread in the block into the
+    list it yields; they are only printed as well if `echo`."""
+    outer = getattr(_recording, 'errors', None), getattr(_recording, 'echo', True)
+    _recording.errors = errors = []
+    _recording.echo = echo
+    try:
+        yield errors
+    finally:
+        _recording.errors, _recording.echo = outer
+
 def build_lexer(**kwargs):
     # Use importlib to get the actual module object for this name so PLY
     # can find the token definitions even when this file is loaded as
@@ -1,20 +1,47 @@
+import copy
+import hashlib
+import importlib
+import importlib.util
+import os
+import threading
+
 import ply.yacc as yacc
 from concurrentlang.grammar import lexer as lexmod
 from concurrentlang.ast import nodes as ast
+from concurrentlang.paths import cache_root
 
 tokens = lexmod.tokens
 
 precedence = (
-    # Define precedences if you add operators later
+    ('left', 'PLUS', 'MINUS'),
+    ('left', 'TIMES', 'DIVIDE', 'MOD'),
+    ('right', 'UMINUS'),
 )
 
+# Chunking policies accepted by `schedule(...)` on a parallel for
+SCHEDULES = ('static', 'dynamic', 'guided')
+# Operators accepted by `reduce(op: vars)`
+REDUCE_OPS = ('+', '*', 'min', 'max')
+
+def _ident(p, name):
+    # Shared Identifier when the parser was built with hashcons=True.
+    hc = p.parser.hashcons
+    return hc.identifier(name) if hc is not None else ast.Identifier(name)
+
+def _literal(p, value):
+    hc = p.parser.hashcons
+    return hc.literal(value) if hc is not None else ast.Literal(value)
+
 def p_program(p):
     "program : statements"
     p[0] = ast.Program(p[1])
 
 def p_statements_multiple(p):
     "statements : statements statement"
-    p[0] = p[1] + [p[2]]
+    # Extend the list in place: rebuilding it on every reduction made
+    # parsing N statements O(N^2).
+    p[1].append(p[2])
+    p[0] = p[1]
 
 def p_statements_single(p):
     "statements : statement"
@@ -29,21 +56,102 @@ def p_channel_decl(p):
     "statement : CHAN LT type GT ID SEMI"
     p[0] = ast.ChannelDecl(p[5], p[3])
 
+# bounded channel: chan<int, 16> c;
+def p_channel_decl_bounded(p):
+    "statement : CHAN LT type COMMA NUMBER GT ID SEMI"
+    if p[5] <= 0:
+        lexmod.report_error(f"Channel capacity must be positive: {p[7]} (line {p.lineno(5)})")
+    p[0] = ast.ChannelDecl(p[7], p[3], p[5] if p[5] > 0 else None)
+
 def p_parallel_block(p):
     "statement : PARALLEL LBRACE statements RBRACE"
     p[0] = ast.ParallelBlock(p[3])
 
+# parallel reduce(+: total) { ... }
+def p_parallel_block_reduce(p):
+    "statement : PARALLEL reductions LBRACE statements RBRACE"
+    p[0] = ast.ParallelBlock(p[4], p[2])
+
+def p_reductions_multiple(p):
+    "reductions : reductions reduction"
+    p[0] = p[1] + p[2]
+
+def p_reductions_single(p):
+    "reductions : reduction"
+    p[0] = p[1]
+
+def p_reduction(p):
+    "reduction : REDUCE LPAREN reduce_op COLON reduce_vars RPAREN"
+    p[0] = [ast.Reduction(p[3], _ident(p, name)) for name in p[5]]
+
+def p_reduce_op(p):
+    """reduce_op : PLUS
+                 | TIMES
+                 | ID"""
+    if p[1] not in REDUCE_OPS:
+        lexmod.report_error(f"Unknown reduction operator: {p[1]} (line {p.lineno(1)}), expected one of {', '.join(REDUCE_OPS)}")
+        p[1] = '+'
+    p[0] = p[1]
+
+def p_reduce_vars_multiple(p):
+    "reduce_vars : reduce_vars COMMA ID"
+    p[1].append(p[3])
+    p[0] = p[1]
+
+def p_reduce_vars_single(p):
+    "reduce_vars : ID"
+    p[0] = [p[1]]
+
+# parallel for i in 0..n { ... }
+def p_parallel_for(p):
+    "statement : PARALLEL FOR ID IN expression DOTDOT expression LBRACE statements RBRACE"
+    p[0] = ast.ParallelFor(_ident(p, p[3]), p[5], p[7], p[9])
+
+# parallel for i in 0..n schedule(dynamic, 4) reduce(+: total) { ... }
+def p_parallel_for_clauses(p):
+    "statement : PARALLEL FOR ID IN expression DOTDOT expression loop_clauses LBRACE statements RBRACE"
+    kind, chunk, reductions = 'static', None, []
+    for clause in p[8]:
+        if isinstance(clause, tuple):
+            kind, chunk = clause
+        else:
+            reductions.extend(clause)
+    p[0] = ast.ParallelFor(_ident(p, p[3]), p[5], p[7], p[10], kind, chunk, reductions)
+
+def p_loop_clauses_multiple(p):
+    "loop_clauses : loop_clauses loop_clause"
+    p[1].append(p[2])
+    p[0] = p[1]
+
+def p_loop_clauses_single(p):
+    "loop_clauses : loop_clause"
+    p[0] = [p[1]]
+
+def p_loop_clause(p):
+    """loop_clause : schedule
+                   | reduction"""
+    p[0] = p[1]
+
+def p_schedule(p):
+    """schedule : SCHEDULE LPAREN ID RPAREN
+                | SCHEDULE LPAREN ID COMMA expression RPAREN"""
+    kind = p[3]
+    if kind not in SCHEDULES:
+        lexmod.report_error(f"Unknown schedule: {kind} (line {p.lineno(3)}), expected one of {', '.join(SCHEDULES)}")
+        kind = 'static'
+    p[0] = (kind, p[5] if len(p) == 7 else None)
+
 def p_spawn(p):
     "statement : SPAWN LPAREN expression RPAREN SEMI"
     p[0] = ast.Spawn(p[3])
 
 def p_lock(p):
     "statement : LOCK LPAREN ID RPAREN SEMI"
-    p[0] = ast.Lock(ast.Identifier(p[3]))
+    p[0] = ast.Lock(_ident(p, p[3]))
 
 def p_unlock(p):
     "statement : UNLOCK LPAREN ID RPAREN SEMI"
-    p[0] = ast.Unlock(ast.Identifier(p[3]))
+    p[0] = ast.Unlock(_ident(p, p[3]))
 
 def p_atomic(p):
     "statement : ATOMIC LBRACE statements RBRACE"
@@ -51,23 +159,69 @@ def p_atomic(p):
 
 def p_send(p):
     "statement : SEND LPAREN ID COMMA expression RPAREN SEMI"
-    p[0] = ast.Send(ast.Identifier(p[3]), p[5])
+    p[0] = ast.Send(_ident(p, p[3]), p[5])
 
 def p_recv(p):
     "statement : ID ASSIGN RECV LPAREN ID RPAREN SEMI"
-    p[0] = ast.Recv(ast.Identifier(p[1]), ast.Identifier(p[5]))
+    p[0] = ast.Recv(_ident(p, p[1]), _ident(p, p[5]))
+
+# select { case x = recv(a): ... case y = recv(b): ... }
+def p_select(p):
+    "statement : SELECT LBRACE select_cases RBRACE"
+    p[0] = ast.Select(p[3])
+
+def p_select_cases_multiple(p):
+    "select_cases : select_cases select_case"
+    p[1].append(p[2])
+    p[0] = p[1]
+
+def p_select_cases_single(p):
+    "select_cases : select_case"
+    p[0] = [p[1]]
+
+def p_select_case(p):
+    "select_case : CASE ID ASSIGN RECV LPAREN ID RPAREN COLON statements"
+    p[0] = ast.SelectCase(_ident(p, p[2]), _ident(p, p[6]), p[9])
+
+def p_select_case_empty(p):
+    "select_case : CASE ID ASSIGN RECV LPAREN ID RPAREN COLON"
+    p[0] = ast.SelectCase(_ident(p, p[2]), _ident(p, p[6]), [])
 
 def p_assign(p):
     "statement : ID ASSIGN expression SEMI"
-    p[0] = ast.Assign(ast.Identifier(p[1]), p[3])
+    p[0] = ast.Assign(_ident(p, p[1]), p[3])
 
 def p_expression_literal(p):
     "expression : NUMBER"
-    p[0] = ast.Literal(p[1])
+    p[0] = _literal(p, p[1])
 
 def p_expression_id(p):
     "expression : ID"
-    p[0] = ast.Identifier(p[1])
+    p[0] = _ident(p, p[1])
+
+def p_expression_binop(p):
+    """expression : expression PLUS expression
+                  | expression MINUS expression
+                  | expression TIMES expression
+                  | expression DIVIDE expression
+                  | expression MOD expression"""
+    p[0] = ast.BinaryOp(p[2], p[1], p[3])
+
+def p_expression_call(p):
+    "expression : ID LPAREN expression COMMA expression RPAREN"
+    if p[1] not in ('min', 'max'):
+        lexmod.report_error(f"Unknown function: {p[1]} (line {p.lineno(1)}), expected min or max")
+        p[0] = _literal(p, 0)
+        return
+    p[0] = ast.BinaryOp(p[1], p[3], p[5])
+
+def p_expression_uminus(p):
+    "expression : MINUS expression %prec UMINUS"
+    p[0] = ast.BinaryOp('-', _literal(p, 0), p[2])
+
+def p_expression_group(p):
+    "expression : LPAREN expression RPAREN"
+    p[0] = p[2]
 
 def p_type(p):
     "type : INT"
@@ -75,17 +229,131 @@ def p_type(p):
 
 def p_error(p):
     if p:
-        print(f"Syntax error at token {p.type}, value {p.value} (line {p.lineno})")
+        lexmod.report_error(f"Syntax error at token {p.type}, value {p.value} (line {p.lineno})")
     else:
-        print("Syntax error at EOF")
+        lexmod.report_error("Syntax error at EOF")
+
+def _rules(module, prefix):
+    # Grammar/lexer rules in definition order: functions by line number
+    # (PLY's own ordering), string rules by name.
+    funcs, strings = [], []
+    for name in dir(module):
+        if not name.startswith(prefix):
+            continue
+        obj = getattr(module, name)
+        if callable(obj):
+            funcs.append((obj.__code__.co_firstlineno, name, obj.__doc__ or ''))
+        elif isinstance(obj, str):
+            strings.append((name, obj))
+    funcs.sort()
+    return [(name, doc) for _, name, doc in funcs] + strings
+
+_grammar_hash = None
 
-def build_parser():
-    lex = lexmod.build_lexer()
-    # Ensure we pass the actual module object (not the top-level package)
-    import importlib
+def grammar_hash():
+    """Short hex digest identifying the current lexer + grammar definition.
+
+    Any change to tokens, reserved words, token regexes, productions or
+    precedence yields a new hash, so tables cached under it can never be stale.
+    """
+    global _grammar_hash
+    if _grammar_hash is None:
+        h = hashlib.sha256()
+        h.update(yacc.__tabversion__.encode())
+        h.update(repr(sorted(lexmod.tokens)).encode())
+        h.update(repr(sorted(lexmod.reserved.items())).encode())
+        h.update(repr(_rules(lexmod, 't_')).encode())
+        module = importlib.import_module(__name__)
+        h.update(repr(_rules(module, 'p_')).encode())
+        h.update(repr(precedence).encode())
+        _grammar_hash = h.hexdigest()[:16]
+    return _grammar_hash
+
+def _table_dir():
+    path = os.path.join(cache_root(), 'tables')
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError:
+        return None
+    return path
+
+def _load_lextab(path):
+    spec = importlib.util.spec_from_file_location(os.path.basename(path)[:-3], path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+def _build_lexer(tabdir, key):
+    if tabdir is None:
+        return lexmod.build_lexer()
+    path = os.path.join(tabdir, f'lextab_{key}.py')
+    if os.path.exists(path):
+        try:
+            return lexmod.build_lexer(optimize=1, lextab=_load_lextab(path))
+        except Exception:
+            pass  # partial or foreign file: regenerate below
+    # Write under a private name first so concurrent builders never see a
+    # half-written table.
+    tmpname = f'lextab_{key}_{os.getpid()}_{threading.get_ident()}'
+    lexer = lexmod.build_lexer(optimize=1, lextab=tmpname, outputdir=tabdir)
+    try:
+        os.replace(os.path.join(tabdir, tmpname + '.py'), path)
+    except OSError:
+        pass
+    return lexer
+
+def _build_yacc(tabdir, key):
     module = importlib.import_module(__name__)
-    parser = yacc.yacc(module=module)
-    return parser, lex
+    if tabdir is None:
+        return yacc.yacc(module=module, debug=False, write_tables=False)
+    path = os.path.join(tabdir, f'parsetab_{key}.pickle')
+    if os.path.exists(path):
+        try:
+            # PLY re-checks the table signature and regenerates on mismatch.
+            return yacc.yacc(module=module, debug=False, picklefile=path)
+        except Exception:
+            pass  # truncated/corrupt pickle: regenerate below
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    parser = yacc.yacc(module=module, debug=False, picklefile=tmp)
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return parser
+
+# Process-wide (parser, lexer) template, built once on first use.
+_template = None
+_template_lock = threading.Lock()
+
+def build_parser(hashcons=False):
+    """Return a ``(parser, lexer)`` pair for ``parser.parse(src, lexer=lexer)``.
+
+    The LALR tables and the lexer's master regex are built once per process
+    and cached on disk under :func:`cache_root`, keyed by :func:`grammar_hash`.
+    Every call returns a fresh parser/lexer over the shared tables, so the
+    pair may be used independently of other callers (including other threads).
+
+    With ``hashcons=True`` the parser shares one Identifier/Literal instance
+    per distinct name/value across everything it parses (see
+    nodes.HashConser), which shrinks large generated programs considerably.
+    """
+    global _template
+    if _template is None:
+        with _template_lock:
+            if _template is None:
+                key = grammar_hash()
+                tabdir = _table_dir()
+                _template = (_build_yacc(tabdir, key), _build_lexer(tabdir, key))
+    template, lex = _template
+    parser = copy.copy(template)
+    parser.hashcons = ast.HashConser() if hashcons else None
+    return parser, lex.clone()
+
+def reset_parser_cache():
+    """Drop the in-process template so the next build_parser() reloads tables."""
+    global _template
+    with _template_lock:
+        _template = None
 
 if __name__ == '__main__':
     parser, lex = build_parser()
@@ -0,0 +1,101 @@
+# concurrentlang/opt/constprop.py
+#
+# Constant propagation and folding. Walking each statement list in order,
+# the pass remembers which names currently hold a known integer (from
+# `x = 3;` or `int x = 3;`), replaces later reads of them with the literal
+# and folds BinaryOp nodes whose operands are both literals. A fact only
+# holds while no other task can change the name: inside a parallel block a
+# name written by a sibling branch, and inside a parallel for a name
+# written by the body (another iteration may write it at any time), is
+# volatile and never propagated. After a nested construct every name it
+# may write is forgotten. Division or modulo by a literal zero is left for
+# the runtime to report.
+from concurrentlang.ast import nodes
+from concurrentlang.ast.ops import BINARY_OPS
+from concurrentlang.opt.effects import effects
+
+class ConstantPropagation:
+    name = 'constprop'
+
+    def run(self, program):
+        self.replaced = 0  # reads replaced by a literal
+        self.folded = 0    # BinaryOp nodes folded to a literal
+        self.block(program.statements, {}, frozenset())
+        return {'replaced': self.replaced, 'folded': self.folded}
+
+    def expr(self, e, env):
+        if isinstance(e, nodes.Identifier):
+            if e.name in env:
+                self.replaced += 1
+                return nodes.Literal(env[e.name])
+        elif isinstance(e, nodes.BinaryOp):
+            e.left = self.expr(e.left, env)
+            e.right = self.expr(e.right, env)
+            left, right = e.left, e.right
+            if isinstance(left, nodes.Literal) and isinstance(right, nodes.Literal):
+                if not (e.op in ('/', '%') and right.value == 0):
+                    self.folded += 1
+                    return nodes.Literal(BINARY_OPS[e.op](left.value, right.value))
+        return e
+
+    def store(self, name, value, env, volatile):
+        # `value` is the stored expression; None means unknown
+        if isinstance(value, nodes.Literal) and name not in volatile:
+            env[name] = value.value
+        else:
+            env.pop(name, None)
+
+    def block(self, stmts, env, volatile):
+        # `env` (name -> value) is updated in place as the list runs
+        for s in stmts:
+            self.stmt(s, env, volatile)
+
+    def stmt(self, s, env, volatile):
+        if isinstance(s, nodes.VarDecl):
+            s.init = self.expr(s.init, env)
+            # a declaration without an initializer stores 0
+            init = nodes.Literal(0) if s.init is None else s.init
+            self.store(s.name, init, env, volatile)
+        elif isinstance(s, nodes.ChannelDecl):
+            env.pop(s.name, None)
+        elif isinstance(s, nodes.Assign):
+            s.expr = self.expr(s.expr, env)
+            self.store(s.target.name, s.expr, env, volatile)
+        elif isinstance(s, nodes.Send):
+            s.value = self.expr(s.value, env)
+        elif isinstance(s, nodes.Recv):
+            env.pop(s.target.name, None)
+        elif isinstance(s, nodes.Spawn):
+            s.expr = self.expr(s.expr, env)
+        elif isinstance(s, nodes.Atomic):
+            self.block(s.statements, env, volatile)
+        elif isinstance(s, nodes.Select):
+            for case in s.cases:
+                inner = dict(env)
+                inner.pop(case.target.name, None)
+                self.block(case.statements, inner, volatile)
+            self.forget(s, env)
+        elif isinstance(s, nodes.ParallelBlock):
+            private = {r.var.name for r in s.reductions}
+            writes = [effects([sub])[1] - private for sub in s.statements]
+            for i, sub in enumerate(s.statements):
+                others = set().union(*writes[:i], *writes[i + 1:])
+                inner_volatile = volatile | others
+                inner = {k: v for k, v in env.items()
+                         if k not in inner_volatile and k not in private}
+                self.block([sub], inner, inner_volatile)
+            self.forget(s, env)
+        elif isinstance(s, nodes.ParallelFor):
+            s.start = self.expr(s.start, env)
+            s.stop = self.expr(s.stop, env)
+            s.chunk = self.expr(s.chunk, env)
+            private = {r.var.name for r in s.reductions} | {s.var.name}
+            inner_volatile = volatile | (effects(s.statements)[1] - private)
+            inner = {k: v for k, v in env.items()
+                     if k not in inner_volatile and k not in private}
+            self.block(s.statements, inner, inner_volatile)
+            self.forget(s, env)
+
+    def forget(self, s, env):
+        for name in effects([s])[1]:
+            env.pop(name, None)
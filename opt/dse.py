@@ -0,0 +1,87 @@
+# concurrentlang/opt/dse.py
+#
+# Dead-store elimination. Scanning each statement list backwards, an
+# assignment is dead when a later statement of the same list overwrites
+# its target before anything reads it, and no other task can observe the
+# name in between: a name that a sibling parallel branch, another
+# iteration of the enclosing parallel for, or a spawned task may access
+# is never considered. Stores at the end of a list stay (the value is
+# visible after the list). Only plain assignments are removed: a `recv`
+# keeps its store because the receive itself is a channel side effect,
+# and an assignment whose expression may fail (division or modulo by
+# anything but a non-zero literal) is kept so the error still happens.
+from concurrentlang.ast import nodes
+from concurrentlang.opt.effects import effects, expr_reads
+
+def _may_fail(e):
+    if isinstance(e, nodes.BinaryOp):
+        if e.op in ('/', '%'):
+            if not isinstance(e.right, nodes.Literal) or e.right.value == 0:
+                return True
+        return _may_fail(e.left) or _may_fail(e.right)
+    return False
+
+def _overwrites(s):
+    # names `s` always stores to, after reading what it reads
+    if isinstance(s, nodes.VarDecl):
+        return (s.name,)
+    if isinstance(s, nodes.ChannelDecl):
+        return (s.name,)
+    if isinstance(s, nodes.Assign):
+        return (s.target.name,)
+    if isinstance(s, nodes.Recv):
+        return (s.target.name,)
+    return ()
+
+def _accesses(stmts):
+    reads, writes = effects(stmts)
+    return reads | writes
+
+class DeadStoreElimination:
+    name = 'dse'
+
+    def run(self, program):
+        self.removed = 0  # assignments removed
+        self.block(program.statements, frozenset())
+        return {'removed': self.removed}
+
+    def block(self, stmts, shared):
+        # `shared`: names other tasks may access while this list runs
+        spawned = set()
+        for s in stmts:
+            if isinstance(s, nodes.Spawn):
+                expr_reads(s.expr, spawned)
+        shared = shared | spawned
+        for s in stmts:
+            self.nested(s, shared)
+
+        dead = set()  # names overwritten before their next read
+        keep = []
+        for s in reversed(stmts):
+            if (isinstance(s, nodes.Assign) and s.target.name in dead
+                    and s.target.name not in shared and not _may_fail(s.expr)):
+                self.removed += 1
+                continue
+            keep.append(s)
+            # `s` reads before it stores (`x = x + 1` reads x)
+            dead.update(_overwrites(s))
+            dead -= effects([s])[0]
+        keep.reverse()
+        stmts[:] = keep
+
+    def nested(self, s, shared):
+        if isinstance(s, nodes.Atomic):
+            self.block(s.statements, shared)
+        elif isinstance(s, nodes.Select):
+            for case in s.cases:
+                self.block(case.statements, shared)
+        elif isinstance(s, nodes.ParallelBlock):
+            private = {r.var.name for r in s.reductions}
+            accesses = [_accesses([sub]) - private for sub in s.statements]
+            for i, sub in enumerate(s.statements):
+                others = set().union(*accesses[:i], *accesses[i + 1:])
+                # each branch is a one-statement list of its own
+                self.block([sub], shared | others)
+        elif isinstance(s, nodes.ParallelFor):
+            private = {r.var.name for r in s.reductions} | {s.var.name}
+            self.block(s.statements, shared | (_accesses(s.statements) - private))
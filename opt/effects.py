@@ -0,0 +1,67 @@
+# concurrentlang/opt/effects.py
+#
+# Variable names a statement subtree reads and writes, as seen from the
+# task that runs it. The index of a parallel for and a construct's
+# reduction variables are private inside the construct, so uses of those
+# names there do not count; a reduction variable is read and written by
+# the construct itself (its partials start from and combine into it).
+# Lock names live in their own namespace and are not variables.
+from concurrentlang.ast import nodes
+
+def expr_reads(e, out):
+    """Add the names expression ``e`` reads to ``out``."""
+    if isinstance(e, nodes.Identifier):
+        out.add(e.name)
+    elif isinstance(e, nodes.BinaryOp):
+        expr_reads(e.left, out)
+        expr_reads(e.right, out)
+
+def effects(stmts):
+    """(reads, writes): the names ``stmts`` may read and may write."""
+    reads, writes = set(), set()
+    for s in stmts:
+        _stmt(s, reads, writes)
+    return reads, writes
+
+def _private(s, body, private, reads, writes):
+    r, w = effects(body)
+    reads |= r - private
+    writes |= w - private
+    for red in s.reductions:
+        reads.add(red.var.name)
+        writes.add(red.var.name)
+
+def _stmt(s, reads, writes):
+    if isinstance(s, nodes.VarDecl):
+        expr_reads(s.init, reads)
+        writes.add(s.name)
+    elif isinstance(s, nodes.ChannelDecl):
+        writes.add(s.name)
+    elif isinstance(s, nodes.Assign):
+        expr_reads(s.expr, reads)
+        writes.add(s.target.name)
+    elif isinstance(s, nodes.Send):
+        reads.add(s.chan.name)
+        expr_reads(s.value, reads)
+    elif isinstance(s, nodes.Recv):
+        reads.add(s.chan.name)
+        writes.add(s.target.name)
+    elif isinstance(s, nodes.Select):
+        for case in s.cases:
+            reads.add(case.chan.name)
+            writes.add(case.target.name)
+            for sub in case.statements:
+                _stmt(sub, reads, writes)
+    elif isinstance(s, nodes.Spawn):
+        expr_reads(s.expr, reads)
+    elif isinstance(s, nodes.ParallelBlock):
+        private = {r.var.name for r in s.reductions}
+        _private(s, s.statements, private, reads, writes)
+    elif isinstance(s, nodes.ParallelFor):
+        for e in (s.start, s.stop, s.chunk):
+            expr_reads(e, reads)
+        private = {r.var.name for r in s.reductions} | {s.var.name}
+        _private(s, s.statements, private, reads, writes)
+    elif isinstance(s, nodes.Atomic):
+        for sub in s.statements:
+            _stmt(sub, reads, writes)
@@ -0,0 +1,61 @@
+# concurrentlang/opt/pipeline.py
+#
+# Pass manager for AST-level optimizations, run between parsing and any
+# backend (the interpreters, the VM and codegen_llvm all take the
+# optimized Program). A pass is any object with a `name` and a
+# `run(program)` that rewrites the Program in place and returns a dict of
+# counters; PASSES lists the built-in ones in their default order. Passes
+# run before sem/resolver.py, on the unannotated tree.
+import time
+
+from concurrentlang.ast import nodes
+from concurrentlang.opt.constprop import ConstantPropagation
+from concurrentlang.opt.dse import DeadStoreElimination
+from concurrentlang.opt.syncelim import RedundantSyncElimination
+
+# name -> pass class, in pipeline order: folding first exposes dead
+# stores, and removing those can leave empty critical sections behind
+PASSES = {
+    'constprop': ConstantPropagation,
+    'dse': DeadStoreElimination,
+    'sync': RedundantSyncElimination,
+}
+
+class PassStats:
+    """Counters one pass reported for one program, and its run time."""
+    def __init__(self, name, counts, elapsed):
+        self.name = name
+        self.counts = counts
+        self.elapsed = elapsed  # seconds
+
+    def as_dict(self):
+        return {'pass': self.name, **self.counts, 'seconds': self.elapsed}
+
+    def __str__(self):
+        counts = " ".join(f"{k}={v}" for k, v in self.counts.items())
+        return f"{self.name}: {counts} ({self.elapsed * 1000:.2f} ms)"
+
+class PassManager:
+    """Runs `passes` (default: every built-in pass) in order, skipping the
+    names in `disabled`."""
+    def __init__(self, passes=None, disabled=()):
+        if passes is None:
+            passes = [cls() for cls in PASSES.values()]
+        unknown = set(disabled) - {p.name for p in passes}
+        if unknown:
+            raise ValueError(f"Unknown optimization pass(es): {', '.join(sorted(unknown))}")
+        self.passes = [p for p in passes if p.name not in disabled]
+        self.stats = []  # PassStats of the last run()
+
+    def run(self, program: nodes.Program):
+        """Optimize ``program`` in place; returns the list of PassStats."""
+        self.stats = []
+        for p in self.passes:
+            t0 = time.perf_counter()
+            counts = p.run(program)
+            self.stats.append(PassStats(p.name, counts, time.perf_counter() - t0))
+        return self.stats
+
+def optimize(program: nodes.Program, disabled=()):
+    """Run the default pipeline over ``program``; returns the PassStats."""
+    return PassManager(disabled=disabled).run(program)
@@ -0,0 +1,38 @@
+# concurrentlang/opt/syncelim.py
+#
+# Redundant synchronization elimination: a `lock(m);` directly followed by
+# `unlock(m);` in the same statement list guards nothing and is removed,
+# as is an `atomic { }` whose body is empty (e.g. after dead-store
+# elimination). Removing an inner pair can make an outer one adjacent
+# (`lock(a); lock(b); unlock(b); unlock(a);`), so both go. The statements
+# of a parallel block are separate branches, never a lock/unlock pair.
+from concurrentlang.ast import nodes
+
+class RedundantSyncElimination:
+    name = 'sync'
+
+    def run(self, program):
+        self.pairs = 0    # lock/unlock pairs removed
+        self.atomics = 0  # empty atomic blocks removed
+        self.block(program.statements, sequential=True)
+        return {'pairs': self.pairs, 'atomics': self.atomics}
+
+    def block(self, stmts, sequential):
+        out = []
+        for s in stmts:
+            body = getattr(s, 'statements', None)
+            if body is not None:
+                self.block(body, not isinstance(s, nodes.ParallelBlock))
+            if isinstance(s, nodes.Select):
+                for case in s.cases:
+                    self.block(case.statements, True)
+            if isinstance(s, nodes.Atomic) and not s.statements:
+                self.atomics += 1
+                continue
+            if (sequential and isinstance(s, nodes.Unlock) and out
+                    and isinstance(out[-1], nodes.Lock) and out[-1].var.name == s.var.name):
+                out.pop()
+                self.pairs += 1
+                continue
+            out.append(s)
+        stmts[:] = out
@@ -3,42 +3,31 @@
 run_example.py
 
 Usage:
-  python run_example.py [--file examples/hello_parallel.cl] [--dump-ast ast.json] [--dump-state state.json]
+  python run_example.py [--file examples/hello_parallel.cl] [--dump-ast ast.json] [--dump-state state.json] [--no-cache]
+                        [--engine tree|vm|async|process] [--scheduler thread|pool] [--workers N]
+                        [--no-sequentialize] [--no-opt] [--disable-pass NAME]
 
 This script:
- - builds the PLY parser/lexer (expects concurrentlang.grammar.parser.build_parser)
- - parses the input .cl file into an AST
- - prints a short AST summary to stdout
- - runs the interpreter (expects concurrentlang.runtime.interpreter.Interpreter)
+ - loads the AST from the on-disk AST cache when the source is unchanged
+ - otherwise builds the PLY parser/lexer (expects concurrentlang.grammar.parser.build_parser),
+   parses the input .cl file into an AST and stores it in the cache
+ - prints a short AST summary to stdout (the dump below is the parsed tree too)
+ - runs the AST optimization pipeline (concurrentlang.opt.pipeline: constant
+   propagation, dead-store elimination, redundant lock/atomic removal) and
+   prints each pass's statistics; --disable-pass turns one pass off, --no-opt
+   all of them
+ - runs the interpreter (concurrentlang.runtime.interpreter.Interpreter, or the
+   bytecode VM in concurrentlang.runtime.vm with --engine vm, or the asyncio
+   backend in concurrentlang.runtime.async_interpreter with --engine async, or
+   forked worker processes with --engine process)
+ - reports how many parallel blocks were sequentialized (run inline or batched
+   because their branches cannot block on or interfere with each other)
  - optionally writes AST or final runtime state to JSON files
 """
 import argparse
 import json
 from pathlib import Path
 
-def ast_to_simple(obj):
-    """Convert AST nodes to serializable dicts (simple heuristic)."""
-    try:
-        # If node has __dict__, convert fields recursively
-        if hasattr(obj, '__dict__'):
-            d = {'_type': obj.__class__.__name__}
-            for k, v in obj.__dict__.items():
-                if isinstance(v, list):
-                    d[k] = [ast_to_simple(i) for i in v]
-                else:
-                    d[k] = ast_to_simple(v)
-            return d
-        # lists / tuples
-        if isinstance(obj, (list, tuple)):
-            return [ast_to_simple(i) for i in obj]
-        # primitive
-        if isinstance(obj, (str, int, float, bool)) or obj is None:
-            return obj
-        # fallback to repr
-        return repr(obj)
-    except Exception:
-        return repr(obj)
-
 def main():
     parser = argparse.ArgumentParser(description="Parse and run a ConcurrentLang example")
     parser.add_argument("--file", "-f", type=str, default="examples/hello_parallel.cl",
@@ -47,6 +36,24 @@ def main():
                         help="Optional path to write AST as JSON")
     parser.add_argument("--dump-state", type=str, default=None,
                         help="Optional path to write final interpreter state as JSON")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always re-parse instead of using the on-disk AST cache")
+    parser.add_argument("--engine", choices=("tree", "vm", "async", "process"), default="tree",
+                        help="Execution engine: tree-walking interpreter (default), bytecode VM, "
+                             "asyncio tasks on one event loop or forked worker processes")
+    parser.add_argument("--scheduler", choices=("thread", "pool"), default="thread",
+                        help="Run parallel branches on one thread each (default) or a work-stealing pool")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Pool size for --scheduler pool or --engine process, and the number of "
+                             "workers a parallel for splits into (default: CPU count)")
+    parser.add_argument("--no-sequentialize", action="store_true",
+                        help="Run every parallel block with one task per branch, even blocks whose "
+                             "branches are independent")
+    parser.add_argument("--no-opt", action="store_true",
+                        help="Run the parsed AST as written, without the optimization passes")
+    parser.add_argument("--disable-pass", action="append", default=[], metavar="NAME",
+                        choices=("constprop", "dse", "sync"),
+                        help="Skip one optimization pass (constprop, dse or sync); may be repeated")
     args = parser.parse_args()
 
     src_path = Path(args.file)
@@ -56,8 +63,13 @@ def main():
 
     # Import parser factory and interpreter from the package
     try:
-        from concurrentlang.grammar import parser as parser_mod
+        from concurrentlang.ast.serialize import to_simple
+        from concurrentlang.grammar import astcache
+        from concurrentlang.opt import pipeline
         from concurrentlang.runtime.interpreter import Interpreter
+        from concurrentlang.runtime.vm import VM
+        from concurrentlang.runtime.async_interpreter import AsyncInterpreter
+        from concurrentlang.runtime.process_interpreter import ProcessInterpreter
     except Exception as e:
         print("Error importing concurrentlang modules. Make sure your package files exist and PYTHONPATH includes the repo root.")
         print("Import error:", e)
@@ -71,20 +83,19 @@ def main():
     if args.dump_ast is None:
         args.dump_ast = str(tests_dir / (src_path.stem + "_ast.json"))
 
-    # Build parser and lexer
-    try:
-        parser_obj, lexer = parser_mod.build_parser()
-    except Exception as e:
-        print("Error building parser/lexer:", e)
-        return
-
-    # Read source and parse
+    # Read source and parse (or load the cached AST)
     src = src_path.read_text(encoding='utf-8')
+    cache = None if args.no_cache else astcache.ASTCache()
     try:
-        ast_root = parser_obj.parse(src, lexer=lexer)
+        ast_root = astcache.parse_cached(src, cache)
     except Exception as e:
         print("Parse error:", e)
         return
+    if ast_root is None:
+        # the lexer/parser printed what went wrong
+        return
+    if cache is not None and cache.hits:
+        print("AST loaded from cache")
 
     # Print a simple AST summary
     print("=== Parsed AST (summary) ===")
@@ -92,7 +103,7 @@ def main():
     # Optionally pretty dump to JSON
     if args.dump_ast:
         try:
-            serial = ast_to_simple(ast_root)
+            serial = to_simple(ast_root)
             with open(args.dump_ast, 'w', encoding='utf-8') as f:
                 json.dump(serial, f, indent=2)
             print(f"AST dumped to {args.dump_ast}")
@@ -102,15 +113,32 @@ def main():
         # minimal textual print
         try:
             import pprint
-            pprint.pprint(ast_to_simple(ast_root))
+            pprint.pprint(to_simple(ast_root))
         except Exception:
             print(repr(ast_root))
 
+    # Optimize the tree every engine runs (the cache keeps the parsed one,
+    # and the dump above shows the program as written)
+    if not args.no_opt:
+        print("=== Optimization ===")
+        for stats in pipeline.optimize(ast_root, disabled=args.disable_pass):
+            print(stats)
+
     # Run interpreter
     try:
-        interp = Interpreter()
+        if args.engine == "async":
+            # every branch is a task on one event loop; --scheduler does not apply
+            interp = AsyncInterpreter(workers=args.workers, sequentialize=not args.no_sequentialize)
+        elif args.engine == "process":
+            interp = ProcessInterpreter(workers=args.workers, sequentialize=not args.no_sequentialize)
+        else:
+            engine = VM if args.engine == "vm" else Interpreter
+            interp = engine(scheduler=args.scheduler, workers=args.workers,
+                            sequentialize=not args.no_sequentialize)
         interp.exec_program(ast_root)
         print("Interpreter finished.")
+        if interp.seq_stats is not None:
+            print(f"Sequentialization: {interp.seq_stats}")
         # show final global state if available
         if hasattr(interp, "globals"):
             print("=== Final globals ===")
@@ -131,14 +159,17 @@ def main():
                         return [serialize(i) for i in obj]
                     # try to detect runtime types
                     try:
-                        from concurrentlang.runtime.interpreter import Channel, Lock, ThreadManager
-                        if isinstance(obj, Channel):
+                        from concurrentlang.runtime.interpreter import Channel, Lock
+                        from concurrentlang.runtime.scheduler import ThreadManager
+                        from concurrentlang.runtime.async_interpreter import AsyncChannel, AsyncLock
+                        from concurrentlang.runtime.process_interpreter import ProcessChannel
+                        if isinstance(obj, (Channel, AsyncChannel, ProcessChannel)):
                             return {
                                 '_type': 'Channel',
                                 'repr': repr(obj),
-                                'queue_size': getattr(obj.q, 'qsize', lambda: None)(),
+                                'queue_size': obj.qsize(),
                             }
-                        if isinstance(obj, Lock):
+                        if isinstance(obj, (Lock, AsyncLock)):
                             return {'_type': 'Lock', 'repr': repr(obj)}
                         if isinstance(obj, ThreadManager):
                             return {'_type': 'ThreadManager', 'threads': len(getattr(obj, 'threads', []))}
@@ -0,0 +1,290 @@
+# Coroutine (asyncio) execution backend for ConcurrentLang
+#
+# AsyncInterpreter runs the whole program on one event loop: every parallel
+# branch and spawn becomes an asyncio task instead of an OS thread, channels
+# are awaitable queues and lock/atomic stripes map onto asyncio locks. Storage,
+# resolution and expression evaluation are shared with Interpreter, so the
+# final globals match the threaded backend.
+
+import asyncio
+from collections import deque
+
+from concurrentlang.ast import nodes as ast
+from concurrentlang.runtime.interpreter import (
+    Interpreter, combine_partials, privatize, publish, reduction_init, worker_frame,
+)
+from concurrentlang.runtime.atomic import StripedLocks
+
+class AsyncChannel:
+    """Awaitable queue; a send hands its value straight to the
+    longest-waiting receiver if there is one. capacity > 0 bounds the
+    buffer and send() waits while it is full."""
+    __slots__ = ('capacity', 'buf', 'waiters', 'senders')
+
+    def __init__(self, capacity=0):
+        self.capacity = capacity or 0
+        self.buf = deque()
+        self.waiters = deque()   # receivers waiting for a value
+        self.senders = deque()   # senders waiting for room
+
+    def try_send(self, v):
+        """Deliver or buffer `v` unless the channel is full."""
+        waiters = self.waiters
+        while waiters:
+            fut = waiters.popleft()
+            if not fut.done():
+                fut.set_result(v)
+                return True
+        if self.capacity and len(self.buf) >= self.capacity:
+            return False
+        self.buf.append(v)
+        return True
+
+    async def send(self, v):
+        while not self.try_send(v):
+            fut = asyncio.get_running_loop().create_future()
+            self.senders.append(fut)
+            await fut
+
+    def try_recv(self):
+        """Return (True, value) if a value is ready, else (False, None)."""
+        if not self.buf:
+            return False, None
+        v = self.buf.popleft()
+        self._wake_sender()
+        return True, v
+
+    async def recv(self):
+        ok, v = self.try_recv()
+        if ok:
+            return v
+        fut = asyncio.get_running_loop().create_future()
+        self.waiters.append(fut)
+        # a sender waiting for room can now hand its value straight to us
+        self._wake_sender()
+        return await fut
+
+    def _wake_sender(self):
+        senders = self.senders
+        while senders:
+            fut = senders.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                return
+
+    def qsize(self):
+        return len(self.buf)
+
+class _SelectWaiter:
+    """Stands in a channel's waiter queue for a select(); delivering to it
+    completes the select's shared future with (case index, value)."""
+    __slots__ = ('fut', 'index')
+
+    def __init__(self, fut, index):
+        self.fut = fut
+        self.index = index
+
+    def done(self):
+        return self.fut.done()
+
+    def set_result(self, v):
+        self.fut.set_result((self.index, v))
+
+async def select_recv(channels):
+    """Receive from the first ready channel: (index, value)."""
+    for i, ch in enumerate(channels):
+        ok, v = ch.try_recv()
+        if ok:
+            return i, v
+    fut = asyncio.get_running_loop().create_future()
+    waiters = [_SelectWaiter(fut, i) for i in range(len(channels))]
+    for ch, w in zip(channels, waiters):
+        ch.waiters.append(w)
+        ch._wake_sender()
+    try:
+        return await fut
+    finally:
+        for ch, w in zip(channels, waiters):
+            try:
+                ch.waiters.remove(w)
+            except ValueError:
+                pass  # already taken by the delivering send
+
+class AsyncLock:
+    """Reentrant per-task lock, mirroring the threaded runtime's RLock."""
+    __slots__ = ('_lock', '_owner', '_count')
+    reentrant = True
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._owner = None
+        self._count = 0
+
+    async def acquire(self):
+        task = asyncio.current_task()
+        if self._owner is task:
+            self._count += 1
+            return
+        await self._lock.acquire()
+        self._owner = task
+        self._count = 1
+
+    def release(self):
+        if self._owner is not asyncio.current_task():
+            raise RuntimeError("cannot release un-acquired lock")
+        self._count -= 1
+        if not self._count:
+            self._owner = None
+            self._lock.release()
+
+class FastAsyncLock(asyncio.Lock):
+    """Non-reentrant lock for locks sem/lock_elision.py proves no task
+    takes while already holding them: no owner bookkeeping."""
+    reentrant = False
+
+class AsyncInterpreter(Interpreter):
+    def __init__(self, workers=None, sequentialize=True):
+        # `workers` only sets how many tasks a parallel for (or a batched
+        # independent parallel block) splits into
+        super().__init__(workers=workers, sequentialize=sequentialize)
+        self.thread_manager = None
+        self.atomic_locks = None
+        self.errors = []
+
+    def make_lock(self, reentrant):
+        return AsyncLock() if reentrant else FastAsyncLock()
+
+    def exec_program(self, program: ast.Program):
+        self.prepare(program)
+        asyncio.run(self._run_program(program))
+
+    async def _run_program(self, program):
+        # asyncio primitives must be created inside the running loop's thread;
+        # locks left from an earlier exec_program belong to that run's loop
+        self.locks = {}
+        self.build_lock_table()
+        self.atomic_locks = StripedLocks(factory=AsyncLock)
+        await self.exec_block(program.statements)
+
+    async def exec_block(self, statements, frame=None):
+        """Run a statement list; tasks spawned in it are joined at its end."""
+        spawned = []
+        for stmt in statements:
+            if isinstance(stmt, ast.Spawn):
+                spawned.append(asyncio.ensure_future(self._run_spawned(stmt.expr, frame)))
+            else:
+                await self.exec_stmt(stmt, frame)
+        if spawned:
+            await self.join(spawned)
+
+    async def join(self, aws):
+        for result in await asyncio.gather(*aws, return_exceptions=True):
+            if isinstance(result, Exception):
+                self.errors.append(result)
+                print("Task error:", result)
+
+    async def exec_stmt(self, s, frame=None):
+        if isinstance(s, ast.Assign):
+            self.store(s.target.slot, self.eval_expr(s.expr, frame), frame)
+        elif isinstance(s, ast.VarDecl):
+            self.store(s.slot, self.eval_expr(s.init, frame) if s.init is not None else 0, frame)
+        elif isinstance(s, ast.ChannelDecl):
+            self.slots[s.slot] = AsyncChannel(s.capacity)
+        elif isinstance(s, ast.Send):
+            ch = self.channel(s.chan)
+            v = self.eval_expr(s.value, frame)
+            if not ch.try_send(v):
+                await ch.send(v)
+        elif isinstance(s, ast.Recv):
+            ch = self.channel(s.chan)
+            ok, val = ch.try_recv()
+            if not ok:
+                val = await ch.recv()
+            self.store(s.target.slot, val, frame)
+        elif isinstance(s, ast.Select):
+            i, val = await select_recv([self.channel(case.chan) for case in s.cases])
+            case = s.cases[i]
+            self.store(case.target.slot, val, frame)
+            await self.exec_block(case.statements, frame)
+        elif isinstance(s, ast.ParallelBlock):
+            tasks = self.branch_tasks(s)
+            reductions = s.reductions
+            init = reduction_init(reductions, self.slots, frame)
+            privates = s.privates
+            if tasks is None:
+                partials = [None] if reductions else None
+                await self._run_branches(s.statements, frame, reductions, init, partials, 0, privates)
+            else:
+                partials = self.partials(len(tasks), reductions) if reductions else None
+                await self.join([self._branch_task(statements, frame, reductions, init, partials, w, privates)
+                                 for w, statements in enumerate(tasks)])
+            if partials is not None:
+                combine_partials(reductions, partials, self.slots, frame)
+        elif isinstance(s, ast.ParallelFor):
+            sched = self.loop_schedule(
+                s.schedule,
+                self.eval_expr(s.start, frame),
+                self.eval_expr(s.stop, frame),
+                self.eval_expr(s.chunk, frame),
+            )
+            init = reduction_init(s.reductions, self.slots, frame)
+            partials = self.partials(sched.workers, s.reductions)
+            await self.join([self._loop_worker(s, sched, w, frame, init, partials)
+                             for w in range(sched.workers)])
+            combine_partials(s.reductions, partials, self.slots, frame)
+        elif isinstance(s, ast.Spawn):
+            await self.exec_block([s], frame)
+        elif isinstance(s, ast.Lock):
+            lk = self.lock_table[s.slot]
+            if lk is not None:
+                await lk.acquire()
+        elif isinstance(s, ast.Unlock):
+            lk = self.lock_table[s.slot]
+            if lk is not None:
+                lk.release()
+        elif isinstance(s, ast.Atomic):
+            locks = self.atomic_locks.locks
+            stripes = self.atomic_locks.stripes(s.footprint)
+            for i in stripes:
+                await locks[i].acquire()
+            try:
+                await self.exec_block(s.statements, frame)
+            finally:
+                self.atomic_locks.release(stripes)
+        else:
+            raise NotImplementedError(f"Unimplemented exec for node type: {type(s)}")
+
+    def _branch_task(self, statements, frame, reductions, init, partials, worker, privates):
+        if len(statements) == 1 and not reductions and statements[0] not in privates:
+            return self.exec_stmt(statements[0], frame)
+        return self._run_branches(statements, frame, reductions, init, partials, worker, privates)
+
+    async def _run_branches(self, statements, frame, reductions=(), init=(), partials=None, worker=0,
+                            privates=None):
+        if reductions or privates:
+            frame = worker_frame(frame, self.layout.nlocals, reductions, init)
+        for st in statements:
+            owned = privates.get(st) if privates else None
+            if owned:
+                privatize(owned, self.slots, frame)
+                await self.exec_stmt(st, frame)
+                publish(owned, self.slots, frame)
+            else:
+                await self.exec_stmt(st, frame)
+        if reductions:
+            partials[worker] = [frame[r.local] for r in reductions]
+
+    async def _loop_worker(self, s, sched, worker, frame, init, partials):
+        local = worker_frame(frame, self.layout.nlocals, s.reductions, init)
+        k = ~s.var.slot
+        for lo, hi in sched.chunks(worker):
+            for i in range(lo, hi):
+                local[k] = i
+                await self.exec_block(s.statements, local)
+        partials[worker] = [local[r.local] for r in s.reductions]
+
+    async def _run_spawned(self, expr, frame=None):
+        try:
+            self.eval_expr(expr, frame)
+        except Exception as e:
+            print("Spawned thread error:", e)
@@ -1,10 +1,47 @@
-from threading import RLock
-_global_atomic_lock = RLock()
-
-@contextlib.contextmanager
-def atomic():
-    _global_atomic_lock.acquire()
-    try:
-        yield
-    finally:
-        _global_atomic_lock.release()
\ No newline at end of file
+# Striped locks for `atomic { }` blocks
+#
+# sem/resolver.py records on every Atomic node its footprint: the sorted
+# storage slots the block (including nested blocks) reads or writes.
+# StripedLocks maps a footprint to a sorted tuple of stripes (slot % n) and
+# acquires those locks in ascending order, so atomic blocks contend only
+# when they share a stripe, and two blocks can never deadlock against each
+# other. A nested block's footprint is contained in its parent's, so it only
+# re-enters stripes the parent already holds.
+
+import contextlib
+import threading
+
+DEFAULT_STRIPES = 64
+
+class StripedLocks:
+    def __init__(self, n=DEFAULT_STRIPES, factory=threading.RLock):
+        self.n = n
+        self.locks = [factory() for _ in range(n)]
+        self._stripes = {None: tuple(range(n))}  # unknown footprint: every stripe
+
+    def stripes(self, footprint):
+        """Sorted stripe indices guarding `footprint` (memoized)."""
+        stripes = self._stripes.get(footprint)
+        if stripes is None:
+            n = self.n
+            stripes = self._stripes[footprint] = tuple(sorted({slot % n for slot in footprint}))
+        return stripes
+
+    def acquire(self, stripes):
+        locks = self.locks
+        for i in stripes:
+            locks[i].acquire()
+
+    def release(self, stripes):
+        locks = self.locks
+        for i in reversed(stripes):
+            locks[i].release()
+
+    @contextlib.contextmanager
+    def hold(self, footprint):
+        stripes = self.stripes(footprint)
+        self.acquire(stripes)
+        try:
+            yield
+        finally:
+            self.release(stripes)
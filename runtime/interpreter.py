@@ -2,32 +2,189 @@
 # Place this at concurrentlang/runtime/interpreter.py
 
 import threading
-import queue
 import contextlib
+import functools
+import os
 import time
+from collections import deque
 from concurrentlang.ast import nodes as ast
+from concurrentlang.ast.ops import BINARY_OPS
+from concurrentlang.sem import lock_elision, resolver, sequentialize
+from concurrentlang.runtime.scheduler import LoopSchedule, make_scheduler
+from concurrentlang.runtime.atomic import StripedLocks
 
 class Channel:
-    def __init__(self, maxsize=0):
-        self.q = queue.Queue(maxsize=maxsize)
+    """FIFO channel over a deque (CPython's ring buffer of blocks).
+
+    capacity 0 is unbounded; otherwise send() blocks while `capacity` values
+    are buffered. Waiters are counted and the notifier takes a waiter off
+    the count, so condition variables are only signalled for a thread that
+    has not been woken yet. send_many/recv_many move a whole batch under one
+    lock acquisition. A blocked select() registers one shared wakeup event
+    with every channel it waits on; sends set it.
+    """
+    __slots__ = ('capacity', '_buf', '_lock', '_not_empty', '_not_full',
+                 '_recv_waiting', '_send_waiting', '_selectors')
+
+    def __init__(self, capacity=0):
+        self.capacity = capacity or 0
+        self._buf = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._recv_waiting = 0   # receivers waiting and not yet notified
+        self._send_waiting = 0   # senders waiting and not yet notified
+        self._selectors = []     # wakeup events of blocked select()s
+
+    # the helpers below expect self._lock to be held
+
+    def _wake_receivers(self, k):
+        for event in self._selectors:
+            event.set()
+        k = min(k, self._recv_waiting)
+        if k:
+            self._recv_waiting -= k
+            self._not_empty.notify(k)
+
+    def _wake_senders(self, k):
+        k = min(k, self._send_waiting)
+        if k:
+            self._send_waiting -= k
+            self._not_full.notify(k)
+
+    def _wait_room(self):
+        while len(self._buf) >= self.capacity:
+            self._send_waiting += 1
+            self._not_full.wait()
+
+    def _wait_value(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self._buf:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise RuntimeError("Channel receive timed out")
+            self._recv_waiting += 1
+            if not self._not_empty.wait(remaining):
+                self._recv_waiting -= 1  # timed out without being notified
+
+    def try_send(self, v):
+        """Buffer `v` unless the channel is full; return whether it was sent."""
+        with self._lock:
+            if self.capacity and len(self._buf) >= self.capacity:
+                return False
+            self._buf.append(v)
+            if self._recv_waiting or self._selectors:
+                self._wake_receivers(1)
+            return True
+
     def send(self, v):
-        self.q.put(v)
+        with self._lock:
+            if self.capacity:
+                self._wait_room()
+            self._buf.append(v)
+            if self._recv_waiting or self._selectors:
+                self._wake_receivers(1)
+
+    def send_many(self, values):
+        """Send every value in order, taking the lock once per batch that fits."""
+        values = list(values)
+        i = 0
+        with self._lock:
+            while i < len(values):
+                room = len(values) - i
+                if self.capacity:
+                    self._wait_room()
+                    room = min(room, self.capacity - len(self._buf))
+                self._buf.extend(values[i:i + room])
+                i += room
+                if self._recv_waiting or self._selectors:
+                    self._wake_receivers(room)
+
+    def try_recv(self):
+        """Return (True, value) if a value is ready, else (False, None)."""
+        with self._lock:
+            if not self._buf:
+                return False, None
+            v = self._buf.popleft()
+            if self._send_waiting:
+                self._wake_senders(1)
+            return True, v
+
     def recv(self, timeout=None):
-        try:
-            return self.q.get(timeout=timeout)
-        except queue.Empty:
-            raise RuntimeError("Channel receive timed out")
+        with self._lock:
+            if not self._buf:
+                self._wait_value(timeout)
+            v = self._buf.popleft()
+            if self._send_waiting:
+                self._wake_senders(1)
+            return v
+
+    def recv_many(self, n, timeout=None):
+        """Wait for at least one value, then take up to `n` as a list."""
+        with self._lock:
+            if not self._buf:
+                self._wait_value(timeout)
+            buf = self._buf
+            k = min(n, len(buf))
+            out = [buf.popleft() for _ in range(k)]
+            if self._send_waiting:
+                self._wake_senders(k)
+            return out
+
+    def qsize(self):
+        return len(self._buf)
+
+    def add_selector(self, event):
+        with self._lock:
+            self._selectors.append(event)
+
+    def remove_selector(self, event):
+        with self._lock:
+            self._selectors.remove(event)
+
+def select_recv(channels):
+    """Wait until one of `channels` has a value; return (index, value).
+
+    Channels are tried in order. While none is ready the caller sleeps on
+    one Event registered with all of them, so a send to any of them wakes
+    it without polling.
+    """
+    event = threading.Event()
+    for ch in channels:
+        ch.add_selector(event)
+    try:
+        while True:
+            # clear before trying so a send after the tries still wakes us
+            event.clear()
+            for i, ch in enumerate(channels):
+                ok, v = ch.try_recv()
+                if ok:
+                    return i, v
+            event.wait()
+    finally:
+        for ch in channels:
+            ch.remove_selector(event)
 
 class Lock:
+    """Runtime lock behind lock(m)/unlock(m); reentrant like an RLock."""
+    reentrant = True
+
     def __init__(self):
-        self._lock = threading.RLock()
+        self._use(threading.RLock())
+
+    def _use(self, mutex):
+        # lock(m)/unlock(m) only need try_acquire() and release(): they are
+        # the mutex's own methods, bound per instance, so the hot path makes
+        # no Python-level call (try_acquire() returns True if it got the lock)
+        self._lock = mutex
+        self.try_acquire = functools.partial(mutex.acquire, False)
+        self.release = mutex.release
+
     def acquire(self, timeout=None):
         if timeout is None:
             return self._lock.acquire()
         else:
             return self._lock.acquire(timeout=timeout)
-    def release(self):
-        self._lock.release()
     @contextlib.contextmanager
     def hold(self):
         self.acquire()
@@ -36,104 +193,353 @@ class Lock:
         finally:
             self.release()
 
-# simple global atomic lock (note: Python has GIL; this is illustrative)
-_global_atomic_lock = threading.RLock()
-@contextlib.contextmanager
-def atomic_block():
-    _global_atomic_lock.acquire()
-    try:
-        yield
-    finally:
-        _global_atomic_lock.release()
+class FastLock(Lock):
+    """Non-reentrant Lock over a plain mutex, for locks sem/lock_elision.py
+    proves no task takes while already holding them."""
+    reentrant = False
 
-class ThreadManager:
     def __init__(self):
-        self.threads = []
+        self._use(threading.Lock())
+
+# Marks a slot whose variable has not been assigned yet.
+UNSET = object()
+
+# Start value of a worker's private reduction partial: the operator's
+# identity. min/max have none over unbounded ints, but they are idempotent,
+# so their partials start from the shared value itself.
+REDUCE_IDENTITY = {'+': 0, '*': 1}
+
+def load(slots, slot, frame):
+    """Value of variable `slot` (a frame local if negative); unset reads as 0."""
+    v = slots[slot] if slot >= 0 else frame[~slot]
+    return 0 if v is UNSET else v
+
+def reduction_init(reductions, slots, frame):
+    """Start values of each worker's partials for `reductions`."""
+    return [REDUCE_IDENTITY[r.op] if r.op in REDUCE_IDENTITY else load(slots, r.slot, frame)
+            for r in reductions]
 
-    def spawn(self, fn, *args, **kwargs):
-        t = threading.Thread(target=fn, args=args, kwargs=kwargs)
-        t.start()
-        self.threads.append(t)
-        return t
+def worker_frame(frame, nlocals, reductions=(), init=()):
+    """Private frame for one worker of a parallel construct: a copy of the
+    enclosing frame with the reduction partials set to their start values."""
+    local = list(frame) if frame is not None else [0] * nlocals
+    for r, v in zip(reductions, init):
+        local[r.local] = v
+    return local
 
-    def join_all(self):
-        for t in self.threads:
-            t.join()
+def privatize(owned, slots, frame):
+    """Load the variables a parallel branch owns (sem/escape.py) into their
+    local slots in the branch's frame."""
+    for slot, k in owned:
+        v = slots[slot]
+        frame[k] = 0 if v is UNSET else v
+
+def publish(owned, slots, frame):
+    """Store the variables a branch owns back to their slots."""
+    for slot, k in owned:
+        slots[slot] = frame[k]
+
+def combine_partials(reductions, partials, slots, frame):
+    """Fold each worker's partials into the reduction variables, once each.
+
+    `partials` holds one row per worker (None for a worker that never
+    finished) with a value per reduction.
+    """
+    for j, r in enumerate(reductions):
+        op = BINARY_OPS[r.op]
+        v = load(slots, r.slot, frame)
+        for row in partials:
+            if row is not None:
+                v = op(v, row[j])
+        if r.slot >= 0:
+            slots[r.slot] = v
+        else:
+            frame[~r.slot] = v
 
 class Interpreter:
-    def __init__(self):
-        # globals holds variables and channel/runtime objects
-        self.globals = {}
+    def __init__(self, scheduler='thread', workers=None, sequentialize=True):
+        # Variables and channel/runtime objects live in `slots`, indexed by the
+        # storage slot sem.resolver assigns to each name; locks live in
+        # `lock_table` the same way (None for an elided lock). Both are
+        # (re)built by exec_program(), before any task starts.
+        self.layout = resolver.Layout()
+        self.slots = []
+        self.lock_table = []
         self.locks = {}  # string -> Lock()
-        self.thread_manager = ThreadManager()
+        self._locks_guard = threading.Lock()
+        # atomic blocks lock the stripes covering their footprint
+        self.atomic_locks = StripedLocks()
+        # runs parallel branches and spawns: 'thread' (one OS thread each) or
+        # 'pool' (bounded work-stealing pool of `workers` threads)
+        self.thread_manager = make_scheduler(scheduler, workers)
+        # loop workers a parallel for splits its iterations across
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        # run independent parallel blocks inline or batched (sem/sequentialize.py);
+        # seq_stats counts how the last program's blocks were planned
+        self.sequentialize = sequentialize
+        self.seq_stats = None
+
+    @property
+    def globals(self):
+        """Snapshot of the assigned variables as a name -> value dict."""
+        return {name: v for name, v in zip(self.layout.names, self.slots) if v is not UNSET}
 
-    def get_lock(self, name):
-        if name not in self.locks:
-            self.locks[name] = Lock()
-        return self.locks[name]
+    def make_lock(self, reentrant):
+        return Lock() if reentrant else FastLock()
+
+    def get_lock(self, name, mode=lock_elision.REENTRANT):
+        """The lock for `name`, created on first use; `mode` is how the
+        program uses it (sem/lock_elision.py). Elided locks have none."""
+        if mode == lock_elision.ELIDE:
+            return None
+        reentrant = mode == lock_elision.REENTRANT
+        with self._locks_guard:
+            lk = self.locks.get(name)
+            if lk is None or (reentrant and not lk.reentrant):
+                lk = self.locks[name] = self.make_lock(reentrant)
+            return lk
+
+    def build_lock_table(self):
+        self.lock_table = [self.get_lock(name, mode)
+                           for name, mode in zip(self.layout.lock_names, self.layout.lock_modes)]
+
+    def prepare(self, program: ast.Program):
+        """Resolve `program` and lay out storage; values of names already
+        present (from an earlier exec_program) are carried over. The lock
+        table is built separately (build_lock_table)."""
+        previous = self.globals
+        self.layout = resolver.resolve(program)
+        if self.sequentialize:
+            self.seq_stats = sequentialize.analyze(program, self.workers)
+        self.slots = [previous.get(name, UNSET) for name in self.layout.names]
 
     def exec_program(self, program: ast.Program):
-        for stmt in program.statements:
-            self.exec_stmt(stmt)
-        # Wait for all spawned threads
+        self.prepare(program)
+        self.build_lock_table()
+        self.exec_block(program.statements)
+        # Safety net: every task is already joined by its block
         self.thread_manager.join_all()
 
-    def exec_stmt(self, s):
+    def exec_block(self, statements, frame=None):
+        """Run a statement list; tasks spawned in it are joined at its end.
+
+        `frame` holds the parallel for indices in scope (local slots), or is
+        None outside any loop.
+        """
+        spawned = None
+        for stmt in statements:
+            if isinstance(stmt, ast.Spawn):
+                if spawned is None:
+                    spawned = self.thread_manager.group()
+                spawned.spawn(self._run_spawned, stmt.expr, frame)
+            else:
+                self.exec_stmt(stmt, frame)
+        if spawned is not None:
+            spawned.join()
+
+    def loop_schedule(self, kind, start, stop, chunk):
+        return LoopSchedule(kind, start, stop, self.workers, chunk)
+
+    def partials(self, workers, reductions):
+        """One row per worker for the reduction partials of a construct."""
+        return [None] * workers
+
+    def branch_tasks(self, s):
+        """Statement lists to run as the tasks of parallel block `s`, or None
+        to run the whole block inline: one task per branch as written, or
+        the batches the sequentialization cost model planned for an
+        independent block."""
+        n = sequentialize.plan(s.cost, self.workers) if self.sequentialize else None
+        if n is None:
+            return [[sub] for sub in s.statements]
+        return None if n == 1 else sequentialize.batches(s.statements, n)
+
+    def run_parallel(self, s, frame):
+        """Run the top-level statements of parallel block `s` as tasks and
+        wait for all of them."""
+        tasks = self.branch_tasks(s)
+        reductions = s.reductions
+        init = reduction_init(reductions, self.slots, frame)
+        privates = s.privates
+        if tasks is None:
+            partials = [None] if reductions else None
+            self._run_branches(s.statements, frame, reductions, init, partials, 0, privates)
+        else:
+            partials = self.partials(len(tasks), reductions) if reductions else None
+            group = self.thread_manager.group()
+            for w, statements in enumerate(tasks):
+                group.spawn(self._run_branches, statements, frame, reductions, init, partials, w, privates)
+            group.join()
+        if partials is not None:
+            combine_partials(reductions, partials, self.slots, frame)
+
+    def _run_branches(self, statements, frame, reductions=(), init=(), partials=None, worker=0,
+                      privates=None):
+        # one worker of a parallel block: its branches run one after another,
+        # updating one set of reduction partials; a branch that owns private
+        # variables keeps them in the worker's frame while it runs
+        if reductions or privates:
+            frame = worker_frame(frame, self.layout.nlocals, reductions, init)
+        for st in statements:
+            owned = privates.get(st) if privates else None
+            if owned:
+                privatize(owned, self.slots, frame)
+                self.exec_stmt(st, frame)
+                publish(owned, self.slots, frame)
+            else:
+                self.exec_stmt(st, frame)
+        if reductions:
+            partials[worker] = [frame[r.local] for r in reductions]
+
+    def run_loop(self, s, frame):
+        """Split the iterations of parallel for `s` across loop workers.
+
+        A loop that needs a single worker runs inline; otherwise each
+        worker is a task on the scheduler and the loop finishes when all of
+        them have. Reduction partials are combined after the join.
+        """
+        sched = self.loop_schedule(
+            s.schedule,
+            self.eval_expr(s.start, frame),
+            self.eval_expr(s.stop, frame),
+            self.eval_expr(s.chunk, frame),
+        )
+        init = reduction_init(s.reductions, self.slots, frame)
+        partials = self.partials(sched.workers, s.reductions) if s.reductions else None
+        if sched.workers == 1:
+            self._loop_worker(s, sched, 0, frame, init, partials)
+        elif sched.workers:
+            group = self.thread_manager.group()
+            for w in range(sched.workers):
+                group.spawn(self._loop_worker, s, sched, w, frame, init, partials)
+            group.join()
+        if partials is not None:
+            combine_partials(s.reductions, partials, self.slots, frame)
+
+    def _loop_worker(self, s, sched, worker, frame, init=(), partials=None):
+        # each worker gets a private frame; outer loop indices are copied in
+        local = worker_frame(frame, self.layout.nlocals, s.reductions, init)
+        k = ~s.var.slot
+        body = s.statements
+        for lo, hi in sched.chunks(worker):
+            for i in range(lo, hi):
+                local[k] = i
+                self.exec_block(body, local)
+        if partials is not None:
+            partials[worker] = [local[r.local] for r in s.reductions]
+
+    def store(self, slot, val, frame):
+        if slot >= 0:
+            self.slots[slot] = val
+        else:
+            frame[~slot] = val
+
+    def channel(self, ident):
+        ch = self.slots[ident.slot]
+        if ch is UNSET:
+            raise RuntimeError(f"Unknown channel: {ident.name}")
+        return ch
+
+    def recv(self, ch):
+        ok, val = ch.try_recv()
+        if not ok:
+            # tell the scheduler before blocking so a pooled worker can be
+            # compensated while we wait for a sender
+            with self.thread_manager.blocking():
+                val = ch.recv()
+        return val
+
+    def select(self, channels):
+        """Receive from the first ready channel: (index, value)."""
+        for i, ch in enumerate(channels):
+            ok, v = ch.try_recv()
+            if ok:
+                return i, v
+        with self.thread_manager.blocking():
+            return select_recv(channels)
+
+    def send(self, ch, v):
+        if not ch.try_send(v):
+            # bounded channel is full: wait for a receiver to make room
+            with self.thread_manager.blocking():
+                ch.send(v)
+
+    def acquire(self, lk):
+        if not lk.try_acquire():
+            with self.thread_manager.blocking():
+                lk.acquire()
+
+    def exec_stmt(self, s, frame=None):
         if isinstance(s, ast.VarDecl):
-            init_val = self.eval_expr(s.init) if s.init is not None else 0
-            self.globals[s.name] = init_val
+            init_val = self.eval_expr(s.init, frame) if s.init is not None else 0
+            self.store(s.slot, init_val, frame)
         elif isinstance(s, ast.ChannelDecl):
-            # For now ignore the element type; create an unbounded channel
-            self.globals[s.name] = Channel()
+            # For now ignore the element type; capacity None is unbounded
+            self.slots[s.slot] = Channel(s.capacity)
         elif isinstance(s, ast.Assign):
-            val = self.eval_expr(s.expr)
-            self.globals[s.target.name] = val
+            val = self.eval_expr(s.expr, frame)
+            slot = s.target.slot
+            if slot >= 0:
+                self.slots[slot] = val
+            else:
+                frame[~slot] = val
         elif isinstance(s, ast.Send):
-            ch = self.globals.get(s.chan.name)
-            if ch is None:
-                raise RuntimeError(f"Unknown channel: {s.chan.name}")
-            val = self.eval_expr(s.value)
-            ch.send(val)
+            ch = self.channel(s.chan)
+            val = self.eval_expr(s.value, frame)
+            self.send(ch, val)
         elif isinstance(s, ast.Recv):
-            ch = self.globals.get(s.chan.name)
-            if ch is None:
-                raise RuntimeError(f"Unknown channel: {s.chan.name}")
-            val = ch.recv()
-            self.globals[s.target.name] = val
+            ch = self.channel(s.chan)
+            val = self.recv(ch)
+            self.store(s.target.slot, val, frame)
+        elif isinstance(s, ast.Select):
+            i, val = self.select([self.channel(case.chan) for case in s.cases])
+            case = s.cases[i]
+            self.store(case.target.slot, val, frame)
+            self.exec_block(case.statements, frame)
         elif isinstance(s, ast.ParallelBlock):
-            # naive: spawn a thread per top-level statement inside the block
-            for sub in s.statements:
-                # capture sub in default arg to avoid late-binding
-                self.thread_manager.spawn(lambda st=sub: self.exec_stmt(st))
+            # one task per top-level statement inside the block; the block
+            # finishes when all of them have
+            self.run_parallel(s, frame)
+        elif isinstance(s, ast.ParallelFor):
+            self.run_loop(s, frame)
         elif isinstance(s, ast.Spawn):
-            # spawn an expression interpreted as a callable: for now, if expr is Identifier referencing a function (not implemented),
-            # else if it's a literal or other expression we just evaluate it in a new thread.
-            def run_expr():
-                try:
-                    self.eval_expr(s.expr)
-                except Exception as e:
-                    print("Spawned thread error:", e)
-            self.thread_manager.spawn(run_expr)
+            # a spawn outside a statement list is its own scope
+            self.exec_block([s], frame)
         elif isinstance(s, ast.Lock):
-            lk = self.get_lock(s.var.name)
-            lk.acquire()
+            lk = self.lock_table[s.slot]
+            if lk is not None:
+                self.acquire(lk)
         elif isinstance(s, ast.Unlock):
-            lk = self.get_lock(s.var.name)
-            lk.release()
+            lk = self.lock_table[s.slot]
+            if lk is not None:
+                lk.release()
         elif isinstance(s, ast.Atomic):
-            with atomic_block():
-                for ss in s.statements:
-                    self.exec_stmt(ss)
+            with self.atomic_locks.hold(s.footprint):
+                self.exec_block(s.statements, frame)
         else:
             raise NotImplementedError(f"Unimplemented exec for node type: {type(s)}")
 
-    def eval_expr(self, e):
+    def _run_spawned(self, expr, frame=None):
+        # spawn an expression interpreted as a callable: for now, if expr is Identifier referencing a function (not implemented),
+        # else if it's a literal or other expression we just evaluate it in a new thread.
+        try:
+            self.eval_expr(expr, frame)
+        except Exception as e:
+            print("Spawned thread error:", e)
+
+    def eval_expr(self, e, frame=None):
         if e is None:
             return None
         if isinstance(e, ast.Literal):
             return e.value
         if isinstance(e, ast.Identifier):
-            # return value from globals (0 default)
-            return self.globals.get(e.name, 0)
-        # extend with arithmetic / function calls as needed
-        raise NotImplementedError(f"Unimplemented eval for expression type: {type(e)}")
\ No newline at end of file
+            slot = e.slot
+            if slot < 0:
+                return frame[~slot]
+            # unassigned variables read as 0
+            v = self.slots[slot]
+            return 0 if v is UNSET else v
+        if isinstance(e, ast.BinaryOp):
+            return BINARY_OPS[e.op](self.eval_expr(e.left, frame), self.eval_expr(e.right, frame))
+        # extend with function calls as needed
+        raise NotImplementedError(f"Unimplemented eval for expression type: {type(e)}")
@@ -0,0 +1,377 @@
+# Multi-process execution backend for ConcurrentLang
+#
+# ProcessInterpreter runs parallel branches in forked worker processes so
+# CPU-bound branches are not serialized by the GIL. Storage is shared the
+# way the threaded backends share it, through the resolver's slot layout:
+#  - int values live in a multiprocessing.shared_memory int64 array
+#  - channels declared by the program are created before any fork and
+#    carried over a pipe (int64 values travel as 8 raw bytes, anything else
+#    pickled)
+#  - locks and the atomic lock stripes are multiprocessing RLocks made from
+#    the layout up front
+# Branches that may block (recv, lock, or blocks containing them) each get
+# a dedicated process; the remaining branches of a parallel block are split
+# into contiguous chunks, one per worker. Each worker of a `parallel for` is a
+# process; dynamic/guided chunks are claimed through a shared-memory cursor.
+# Reduction partials come back to the parent in a shared int64 array.
+#
+# Requires the 'fork' start method (POSIX). Non-int values, and ints that do
+# not fit in 64 bits, assigned inside a child process stay local to that
+# process. A branch process that fails is reported when it is joined (its
+# parent fails in turn), like a task error on the threaded backends. Sends block once the pipe's
+# buffer (~64KiB, roughly 7000 messages) is full until someone receives.
+
+import contextlib
+import multiprocessing
+import multiprocessing.connection
+import os
+import pickle
+import struct
+import sys
+import weakref
+from multiprocessing import shared_memory
+
+from concurrentlang.ast import nodes as ast
+from concurrentlang.sem import resolver, sequentialize
+from concurrentlang.runtime.interpreter import Interpreter, Lock, UNSET
+from concurrentlang.runtime.atomic import StripedLocks
+from concurrentlang.runtime.scheduler import LoopSchedule
+
+_INT = struct.Struct('<q')
+_TAG_INT = b'i'
+_TAG_PICKLE = b'p'
+
+# SharedSlots flag values
+_EMPTY, _INT_VALUE, _CHANNEL, _LOCAL = 0, 1, 2, 3
+
+# range of the shared int64 storage
+_INT_MIN, _INT_MAX = -2 ** 63, 2 ** 63 - 1
+
+def _context():
+    return multiprocessing.get_context('fork')
+
+class ProcessChannel:
+    """Channel over a one-way pipe, safe to use from any process forked
+    after it was created. capacity > 0 bounds it with a semaphore counting
+    free places; otherwise it is unbounded by convention (see above)."""
+
+    def __init__(self, ctx, capacity=0):
+        self.capacity = capacity or 0
+        self._r, self._w = ctx.Pipe(duplex=False)
+        self._rlock = ctx.Lock()
+        self._wlock = ctx.Lock()
+        self._size = ctx.Value('q', 0)
+        self._room = ctx.Semaphore(self.capacity) if self.capacity else None
+
+    def try_send(self, v):
+        """Send `v` unless the channel is full; return whether it was sent."""
+        if self._room is not None and not self._room.acquire(False):
+            return False
+        self._write(v)
+        return True
+
+    def send(self, v):
+        if self._room is not None:
+            self._room.acquire()
+        self._write(v)
+
+    def _write(self, v):
+        if type(v) is int and _INT_MIN <= v <= _INT_MAX:
+            data = _TAG_INT + _INT.pack(v)
+        else:
+            data = _TAG_PICKLE + pickle.dumps(v, pickle.HIGHEST_PROTOCOL)
+        with self._wlock:
+            self._w.send_bytes(data)
+        with self._size.get_lock():
+            self._size.value += 1
+
+    def _decode(self, data):
+        with self._size.get_lock():
+            self._size.value -= 1
+        if self._room is not None:
+            self._room.release()
+        if data[:1] == _TAG_INT:
+            return _INT.unpack_from(data, 1)[0]
+        return pickle.loads(data[1:])
+
+    def try_recv(self):
+        """Return (True, value) if a value is ready, else (False, None)."""
+        if not self._rlock.acquire(False):
+            return False, None
+        try:
+            if not self._r.poll():
+                return False, None
+            data = self._r.recv_bytes()
+        finally:
+            self._rlock.release()
+        return True, self._decode(data)
+
+    def recv(self, timeout=None):
+        with self._rlock:
+            if timeout is not None and not self._r.poll(timeout):
+                raise RuntimeError("Channel receive timed out")
+            data = self._r.recv_bytes()
+        return self._decode(data)
+
+    def qsize(self):
+        return self._size.value
+
+    def fileno(self):
+        # lets multiprocessing.connection.wait() watch the read end
+        return self._r.fileno()
+
+class ProcessLock(Lock):
+    """Process-shared lock with the runtime Lock interface; a plain
+    (non-reentrant) one unless `reentrant`."""
+
+    def __init__(self, ctx, reentrant=True):
+        self._use(ctx.RLock() if reentrant else ctx.Lock())
+        self.reentrant = reentrant
+
+def _release_shm(shm, views):
+    for view in views:
+        view.release()
+    shm.close()
+    shm.unlink()
+
+class SharedSlots:
+    """Slot storage backed by shared memory: an int64 value and a flag byte
+    per slot. Behaves like the list Interpreter keeps in `slots`."""
+
+    def __init__(self, n, channels):
+        self._n = n
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, n * 9))
+        self._ints = self._shm.buf[:n * 8].cast('q')
+        self._flags = self._shm.buf[n * 8:n * 9]
+        self._channels = channels    # slot -> ProcessChannel, made before fork
+        self._local = {}             # slot -> non-int value, this process only
+        weakref.finalize(self, _release_shm, self._shm, (self._ints, self._flags))
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        return (self[i] for i in range(self._n))
+
+    def __getitem__(self, i):
+        flag = self._flags[i]
+        if flag == _INT_VALUE:
+            return self._ints[i]
+        if flag == _CHANNEL:
+            return self._channels[i]
+        if flag == _LOCAL:
+            return self._local.get(i, UNSET)
+        return UNSET
+
+    def __setitem__(self, i, v):
+        if type(v) is int and _INT_MIN <= v <= _INT_MAX:
+            self._ints[i] = v
+            self._flags[i] = _INT_VALUE
+        elif v is UNSET:
+            self._flags[i] = _EMPTY
+        elif v is self._channels.get(i):
+            self._flags[i] = _CHANNEL
+        else:
+            self._local[i] = v
+            self._flags[i] = _LOCAL
+
+class SharedLoopSchedule(LoopSchedule):
+    """LoopSchedule whose claim cursor lives in shared memory, so the
+    worker processes of a dynamic/guided parallel for split the range
+    instead of each running all of it."""
+
+    def __init__(self, ctx, *args):
+        super().__init__(*args)
+        self._cursor = ctx.Value('q', self.start)
+
+    def claim(self):
+        cursor = self._cursor
+        with cursor.get_lock():
+            lo = cursor.value
+            if lo >= self.stop:
+                return None
+            hi = min(lo + self.size(self.stop - lo), self.stop)
+            cursor.value = hi
+        return lo, hi
+
+class SharedPartials:
+    """Reduction partials written by worker processes: row w of an int64
+    shared array holds worker w's values, flagged once it stored them."""
+
+    def __init__(self, ctx, workers, n):
+        self.n = n
+        self._values = ctx.Array('q', workers * n, lock=False)
+        self._done = ctx.Array('b', workers, lock=False)
+
+    def __setitem__(self, w, values):
+        n = self.n
+        for v in values:
+            # the array would silently keep only the low 64 bits
+            if not _INT_MIN <= v <= _INT_MAX:
+                raise OverflowError(f"reduction partial {v} does not fit in 64 bits")
+        self._values[w * n:(w + 1) * n] = values
+        self._done[w] = 1
+
+    def __iter__(self):
+        n = self.n
+        for w, done in enumerate(self._done):
+            yield self._values[w * n:(w + 1) * n] if done else None
+
+class ProcessManager:
+    """Scheduler that runs every task in a forked process. A task whose
+    process fails (its own traceback is printed by the child) is recorded in
+    `errors` and reported when it is joined."""
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.procs = []
+        self.errors = []
+
+    def spawn(self, fn, *args, **kwargs):
+        p = self._start(fn, args, kwargs)
+        self.procs.append(p)
+        return p
+
+    def _start(self, fn, args, kwargs):
+        # flush so the child does not re-emit output buffered in the parent
+        sys.stdout.flush()
+        sys.stderr.flush()
+        p = self.ctx.Process(target=self._run, args=(fn, args, kwargs))
+        p.start()
+        return p
+
+    def group(self):
+        return ProcessGroup(self)
+
+    def _run(self, fn, args, kwargs):
+        # runs in the child: only wait for processes this task starts
+        self.procs = []
+        self.errors = []
+        try:
+            fn(*args, **kwargs)
+        finally:
+            self.join_all()
+        if self.errors:
+            # a branch this task started failed: so does the task
+            sys.exit(1)
+
+    def join_all(self):
+        procs, self.procs = self.procs, []
+        self._join(procs)
+
+    def _join(self, procs):
+        for p in procs:
+            p.join()
+            if p.exitcode:
+                e = RuntimeError(f"branch process {p.pid} exited with status {p.exitcode}")
+                self.errors.append(e)
+                print("Process task error:", e)
+
+    def blocking(self):
+        # blocking branches have their own process; nothing to compensate
+        return contextlib.nullcontext()
+
+class ProcessGroup:
+    """Processes started through one ProcessManager, joined together."""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.procs = []
+
+    def spawn(self, fn, *args, **kwargs):
+        self.procs.append(self.manager._start(fn, args, kwargs))
+
+    def join(self):
+        procs, self.procs = self.procs, []
+        self.manager._join(procs)
+
+def may_block(stmt):
+    """True if running `stmt` can wait on another branch (recv or lock)."""
+    todo = [stmt]
+    while todo:
+        s = todo.pop()
+        if isinstance(s, (ast.Recv, ast.Lock, ast.Select)):
+            return True
+        body = getattr(s, 'statements', None)
+        if body:
+            todo.extend(body)
+    return False
+
+def _channel_decls(program):
+    todo = list(program.statements)
+    while todo:
+        s = todo.pop()
+        if isinstance(s, ast.ChannelDecl):
+            yield s
+        elif isinstance(s, ast.Select):
+            todo.extend(s.cases)
+        body = getattr(s, 'statements', None)
+        if body:
+            todo.extend(body)
+
+class ProcessInterpreter(Interpreter):
+    def __init__(self, workers=None, sequentialize=True):
+        super().__init__(sequentialize=sequentialize)
+        self.ctx = _context()
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.thread_manager = ProcessManager(self.ctx)
+        self.errors = self.thread_manager.errors
+        self.atomic_locks = StripedLocks(factory=self.ctx.RLock)
+        self.channels = {}
+
+    def make_lock(self, reentrant):
+        return ProcessLock(self.ctx, reentrant)
+
+    def prepare(self, program: ast.Program):
+        """Resolve `program` and lay out shared storage, channels and locks
+        before any branch is forked."""
+        previous = self.globals
+        self.layout = resolver.resolve(program)
+        if self.sequentialize:
+            self.seq_stats = sequentialize.analyze(program, self.workers)
+        self.channels = {d.slot: ProcessChannel(self.ctx, d.capacity) for d in _channel_decls(program)}
+        self.slots = SharedSlots(len(self.layout.names), self.channels)
+        for slot, name in enumerate(self.layout.names):
+            if name in previous:
+                self.slots[slot] = previous[name]
+        self.build_lock_table()
+
+    def loop_schedule(self, kind, start, stop, chunk):
+        if kind == 'static':
+            return LoopSchedule(kind, start, stop, self.workers, chunk)
+        return SharedLoopSchedule(self.ctx, kind, start, stop, self.workers, chunk)
+
+    def partials(self, workers, reductions):
+        return SharedPartials(self.ctx, workers, len(reductions))
+
+    def branch_tasks(self, s):
+        if self.sequentialize and s.cost is not None:
+            return super().branch_tasks(s)
+        # blocking branches get a process each, the rest are batched
+        tasks, batch = [], []
+        for sub in s.statements:
+            if may_block(sub):
+                tasks.append([sub])
+            else:
+                batch.append(sub)
+        if batch:
+            tasks.extend(sequentialize.batches(batch, min(self.workers, len(batch))))
+        return tasks
+
+    def exec_stmt(self, s, frame=None):
+        if isinstance(s, ast.ChannelDecl):
+            self.slots[s.slot] = self.channels[s.slot]
+        else:
+            super().exec_stmt(s, frame)
+
+    def select(self, channels):
+        """Receive from the first ready channel: (index, value). Blocks in
+        multiprocessing.connection.wait() on all the pipes at once."""
+        while True:
+            for i, ch in enumerate(channels):
+                ok, v = ch.try_recv()
+                if ok:
+                    return i, v
+            # another receiver may win the race for a ready pipe; retry
+            multiprocessing.connection.wait(channels)
+
@@ -0,0 +1,318 @@
+# Schedulers that run parallel branches / spawned tasks for the interpreter.
+#
+# Both expose the same small interface:
+#   spawn(fn, *args, **kwargs)  start a task
+#   group()                     a TaskGroup: tasks started through it are
+#                               joined together by group.join()
+#   join_all()                  wait until every task (including tasks they
+#                               spawned) has finished
+#   blocking()                  context manager wrapped around operations that
+#                               may block on another task (recv, lock)
+#
+# LoopSchedule splits the iteration space of a `parallel for` into chunks
+# that a fixed number of loop workers (tasks on one of the schedulers) claim.
+#
+# ThreadManager starts one OS thread per task. WorkStealingPool runs tasks on
+# a bounded set of worker threads with per-worker deques; when a worker is
+# about to block it is compensated with an extra worker so tasks waiting in
+# the queues (e.g. the sender a blocked recv needs) still get to run.
+
+import contextlib
+import os
+import threading
+from collections import deque
+
+class TaskGroup:
+    """Tasks started through one scheduler that are joined together.
+
+    join() waits for exactly the tasks spawned through this group, so a
+    parallel block or a scope's spawns can finish at a fixed point while
+    other tasks keep running.
+    """
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self._cond = threading.Condition(threading.Lock())
+        self._pending = 0
+
+    def spawn(self, fn, *args, **kwargs):
+        with self._cond:
+            self._pending += 1
+        self.scheduler.spawn(self._run, fn, args, kwargs)
+
+    def _run(self, fn, args, kwargs):
+        try:
+            fn(*args, **kwargs)
+        finally:
+            with self._cond:
+                self._pending -= 1
+                if not self._pending:
+                    self._cond.notify_all()
+
+    def join(self):
+        with self._cond:
+            if not self._pending:
+                return
+        # waiting on other tasks: let a pool compensate this worker
+        with self.scheduler.blocking():
+            with self._cond:
+                while self._pending:
+                    self._cond.wait()
+
+class ThreadManager:
+    # threads is pruned of finished threads whenever it reaches _prune_at,
+    # which then doubles past the live count (amortized O(1) per spawn)
+    PRUNE_MIN = 64
+
+    def __init__(self):
+        self.threads = []
+        self._prune_at = self.PRUNE_MIN
+        self._lock = threading.Lock()
+
+    def spawn(self, fn, *args, **kwargs):
+        t = threading.Thread(target=fn, args=args, kwargs=kwargs)
+        t.start()
+        with self._lock:
+            threads = self.threads
+            threads.append(t)
+            if len(threads) >= self._prune_at:
+                self.threads = threads = [t for t in threads if t.is_alive()]
+                self._prune_at = max(self.PRUNE_MIN, 2 * len(threads))
+        return t
+
+    def group(self):
+        return TaskGroup(self)
+
+    def join_all(self):
+        # threads may start more threads while we wait; repeat until none
+        while self.threads:
+            with self._lock:
+                threads, self.threads = self.threads, []
+            for t in threads:
+                t.join()
+        self._prune_at = self.PRUNE_MIN
+
+    @contextlib.contextmanager
+    def blocking(self):
+        # every task has its own thread; blocking never starves anyone
+        yield
+
+class WorkStealingPool:
+    """Fixed-size worker pool with work-stealing deques.
+
+    Each worker pushes tasks it spawns onto its own deque and pops them LIFO;
+    idle workers steal FIFO from the other deques, and tasks spawned from
+    outside the pool go through a shared injection deque. Workers sleep on a
+    condition variable when there is nothing to do.
+
+    blocking() marks the calling worker as blocked; if that leaves fewer than
+    `workers` runnable (or idle) workers, a compensation worker is started. Surplus workers retire once they run out of work. `max_workers`
+    optionally caps the total; a cap below the number of simultaneously
+    blocked tasks can deadlock programs whose unblocking task is still queued.
+    """
+
+    def __init__(self, workers=None, max_workers=None):
+        self.size = max(1, workers or os.cpu_count() or 4)
+        self.max_workers = max(self.size, max_workers) if max_workers else None
+        self._lock = threading.Lock()
+        self._work = threading.Condition(self._lock)   # tasks queued / stop
+        self._done = threading.Condition(self._lock)   # pending reached 0
+        self._local = threading.local()
+        self._inject = deque()
+        self._queues = ()        # per-worker deques (replaced, never mutated)
+        self._threads = []
+        self._pending = 0        # spawned but not finished
+        self._workers = 0        # live worker threads
+        self._blocked = 0        # workers inside blocking()
+        self._idle = 0           # workers waiting for work (not yet notified)
+        self._stopping = False
+        # statistics
+        self.spawned = 0
+        self.stolen = 0
+        self.compensations = 0
+        self.peak_workers = 0
+        self.errors = []
+
+    def spawn(self, fn, *args, **kwargs):
+        task = (fn, args, kwargs)
+        q = getattr(self._local, 'queue', None)
+        with self._lock:
+            self._pending += 1
+            self.spawned += 1
+            (q if q is not None else self._inject).append(task)
+            if self._idle:
+                # the notifier accounts for the wakeup so a second spawn
+                # before the woken worker runs does not count on it again
+                self._idle -= 1
+                self._work.notify()
+            elif self._workers - self._blocked < self.size:
+                self._start_worker()
+
+    def group(self):
+        return TaskGroup(self)
+
+    def join_all(self):
+        with self._lock:
+            while self._pending:
+                self._done.wait()
+            # Everything finished: stop the workers so idle pools do not
+            # keep threads around; the next spawn() starts new ones.
+            self._stopping = True
+            self._idle = 0
+            self._work.notify_all()
+            threads, self._threads = self._threads, []
+        for t in threads:
+            t.join()
+        with self._lock:
+            self._stopping = False
+
+    @contextlib.contextmanager
+    def blocking(self):
+        if getattr(self._local, 'queue', None) is None:
+            yield  # not one of our workers
+            return
+        with self._lock:
+            self._blocked += 1
+            if not self._idle and self._workers - self._blocked < self.size:
+                self.compensations += 1
+                self._start_worker()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._blocked -= 1
+
+    def _start_worker(self):
+        # caller holds self._lock
+        if self.max_workers is not None and self._workers >= self.max_workers:
+            return
+        q = deque()
+        self._queues = self._queues + (q,)
+        self._workers += 1
+        self.peak_workers = max(self.peak_workers, self._workers)
+        t = threading.Thread(target=self._worker, args=(q,), daemon=True)
+        self._threads.append(t)
+        t.start()
+
+    def _take(self, own, locked=False):
+        # locked: the caller holds self._lock
+        try:
+            return own.pop()
+        except IndexError:
+            pass
+        try:
+            return self._inject.popleft()
+        except IndexError:
+            pass
+        for q in self._queues:
+            if q and q is not own:
+                try:
+                    task = q.popleft()
+                except IndexError:
+                    continue
+                if locked:
+                    self.stolen += 1
+                else:
+                    # a steal is rare next to a pop from the own deque
+                    with self._lock:
+                        self.stolen += 1
+                return task
+        return None
+
+    def _worker(self, own):
+        self._local.queue = own
+        while True:
+            task = self._take(own)
+            if task is None:
+                with self._lock:
+                    task = self._take(own, locked=True)
+                    if task is None:
+                        if self._stopping or self._workers - self._blocked > self.size:
+                            self._workers -= 1
+                            self._queues = tuple(q for q in self._queues if q is not own)
+                            return
+                        self._idle += 1
+                        self._work.wait()
+                        continue
+            fn, args, kwargs = task
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                self.errors.append(e)
+                print("Worker task error:", e)
+            finally:
+                with self._lock:
+                    self._pending -= 1
+                    if not self._pending:
+                        self._done.notify_all()
+
+class LoopSchedule:
+    """Chunks of the range [start, stop) handed out to `workers` loop workers.
+
+    'static' deals fixed chunks round-robin (by default one contiguous block
+    per worker) with no coordination at run time. 'dynamic' lets workers
+    claim the next `chunk` iterations (default 1) from a shared cursor as
+    they finish, which balances uneven iterations. 'guided' claims
+    shrinking chunks: the remaining iterations divided by the number of
+    workers, but never fewer than `chunk`.
+
+    `workers` is reduced to the number of chunks when there are fewer.
+    """
+
+    KINDS = ('static', 'dynamic', 'guided')
+
+    def __init__(self, kind, start, stop, workers, chunk=None):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown loop schedule: {kind!r} (expected one of {', '.join(self.KINDS)})")
+        n = max(0, stop - start)
+        workers = max(1, workers)
+        if not chunk or chunk < 1:
+            chunk = max(1, -(-n // workers)) if kind == 'static' else 1
+        self.kind = kind
+        self.start = start
+        self.stop = start + n
+        self.chunk = chunk
+        self.nchunks = -(-n // chunk)
+        self.workers = min(workers, self.nchunks)
+        self._lock = threading.Lock()
+        self._next = start
+
+    def chunks(self, worker):
+        """Yield the (lo, hi) ranges loop worker number `worker` runs."""
+        if self.kind == 'static':
+            for c in range(worker, self.nchunks, self.workers):
+                lo = self.start + c * self.chunk
+                yield lo, min(lo + self.chunk, self.stop)
+            return
+        while True:
+            r = self.claim()
+            if r is None:
+                return
+            yield r
+
+    def claim(self):
+        """Take the next chunk from the shared cursor, or None when done."""
+        with self._lock:
+            lo = self._next
+            if lo >= self.stop:
+                return None
+            hi = min(lo + self.size(self.stop - lo), self.stop)
+            self._next = hi
+        return lo, hi
+
+    def size(self, remaining):
+        if self.kind == 'guided':
+            return max(self.chunk, -(-remaining // self.workers))
+        return self.chunk
+
+SCHEDULERS = ('thread', 'pool')
+
+def make_scheduler(kind='thread', workers=None):
+    """Build a scheduler by name ('thread' or 'pool'), or pass one through."""
+    if not isinstance(kind, str):
+        return kind
+    if kind == 'thread':
+        return ThreadManager()
+    if kind == 'pool':
+        return WorkStealingPool(workers)
+    raise ValueError(f"Unknown scheduler: {kind!r} (expected one of {', '.join(SCHEDULERS)})")
@@ -0,0 +1,560 @@
+# Bytecode VM for ConcurrentLang
+#
+# compile_program() lowers a Program once into Code objects: a flat opcode
+# array with two parallel operand arrays (operands are resolved up front:
+# constants, storage slots and sub-code objects are stored directly), plus
+# the constant table and the resolver Layout naming the slots. VM.run() executes a Frame
+# over a Code in a single dispatch loop; every `parallel` branch and `spawn`
+# gets its own Frame on its own thread, and each worker of a `parallel for`
+# runs one Frame that loops over the body (FOR_ITER ... JUMP) with its own
+# locals (the loop indices). A
+# parallel block or loop joins its tasks before the next instruction; spawns are joined by a JOIN at the end of the
+# statement list they appear in. The VM shares the runtime objects
+# (Channel, Lock, ThreadManager) with the tree-walking Interpreter and
+# produces the same final globals.
+
+import itertools
+import os
+import threading
+
+from concurrentlang.ast import nodes as ast
+from concurrentlang.ast.ops import BINARY_OPS
+from concurrentlang.sem import lock_elision, resolver, sequentialize
+from concurrentlang.runtime.interpreter import (
+    Channel, FastLock, Lock, UNSET, combine_partials, privatize, publish, reduction_init,
+    select_recv, worker_frame,
+)
+from concurrentlang.runtime.atomic import StripedLocks
+from concurrentlang.runtime.scheduler import LoopSchedule, make_scheduler
+
+# Opcodes (operands: a, b); "slot" operands index VM.slots / VM.lock_table.
+# The instructions most programs spend their time in come first and are
+# dispatched inline in VM.run(); every opcode from SEND_CONST on goes through
+# the VM._HANDLERS table instead of a long comparison chain.
+STORE_CONST = 0    # slots[a] = b
+MOVE = 1           # slots[a] = slots[b] (0 if unset)
+LOAD_NAME = 2      # push slots[a] (0 if unset)
+STORE_NAME = 3     # slots[a] = pop()
+LOAD_CONST = 4     # push a
+BINARY = 5         # right = pop(); push(a(pop(), right)); a is the operator
+LOAD_LOCAL = 6     # push locals[a]
+STORE_LOCAL = 7    # locals[a] = pop()
+FOR_ITER = 8       # locals[a] = next index from the frame's iterator, or
+                   # jump to b when it is exhausted
+JUMP = 9           # continue at a
+SEND_CONST = 10    # channel slots[a] <- b
+SEND = 11          # channel slots[a] <- pop()
+RECV = 12          # slots[b] = value received from channel slots[a]
+                   # (a negative b stores to locals[~b])
+LOCK = 13          # acquire lock_table[a] (never emitted for elided locks)
+UNLOCK = 14        # release lock_table[a]
+ATOMIC_ENTER = 15  # lock the atomic stripes for footprint a
+ATOMIC_EXIT = 16   # unlock the stripes taken by the matching ATOMIC_ENTER
+MAKE_CHAN = 17     # slots[a] = Channel(capacity b)
+PARALLEL = 18      # run each Code in a on its own thread, then join them;
+                   # b = (Reductions whose partials are combined at the join,
+                   # sequentialization cost or None, True if a branch owns
+                   # private variables)
+SPAWN = 19         # run Code a on a new thread in the frame's spawn group
+POP = 20
+JOIN = 21          # join the frame's spawn group (end of a spawning scope)
+SEND_MANY = 22     # channel slots[a] <- each constant in tuple b, one batch
+SELECT = 23        # a = [(chan slot, target slot, Code)]: receive from the
+                   # first ready channel, store, run that case's Code
+PARALLEL_FOR = 24  # a = (local index, schedule kind, Reductions), b = body Code; pops
+                   # chunk, stop, start and runs the body once per index
+PRIVATIZE = 25     # locals[local] = slots[slot] (0 if unset) for each
+                   # (slot, local) pair in a
+PUBLISH = 26       # slots[slot] = locals[local] for each pair in a
+
+OPNAMES = {v: k for k, v in list(globals().items()) if k.isupper() and isinstance(v, int)}
+
+class Code:
+    """A compiled statement sequence."""
+    __slots__ = ('ops', 'a', 'b', 'consts', 'layout', 'costs')
+
+    def __init__(self, layout):
+        self.ops = []
+        self.a = []
+        self.b = []
+        self.consts = []
+        self.layout = layout  # shared by a program's top-level and branch codes
+        self.costs = ()  # top-level Code: sequentialization cost per parallel block
+
+    def __len__(self):
+        return len(self.ops)
+
+    def disassemble(self):
+        lines = []
+        for pc, (op, a, b) in enumerate(zip(self.ops, self.a, self.b)):
+            operands = [x for x in (a, b) if x is not None]
+            what = "cases" if op == SELECT else "branches"
+            text = " ".join(f"<{len(x)} {what}>" if isinstance(x, list)
+                            else "<code>" if isinstance(x, Code)
+                            else x.__name__ if callable(x) else _show(x) for x in operands)
+            lines.append(f"{pc:4d} {OPNAMES[op]:<13s}{text}".rstrip())
+        return "\n".join(lines)
+
+def _show(operand):
+    # reductions print as `op:name` instead of node reprs
+    if isinstance(operand, tuple):
+        return "(" + ", ".join(_show(x) for x in operand) + ")"
+    if isinstance(operand, ast.Reduction):
+        return f"{operand.op}:{operand.var.name}"
+    return repr(operand)
+
+class Compiler:
+    def __init__(self, layout):
+        self.layout = layout
+        self.code = Code(layout)
+        self._consts = set()
+        self._spawns = False  # current block contains a spawn
+
+    def emit(self, op, a=None, b=None):
+        self.code.ops.append(op)
+        self.code.a.append(a)
+        self.code.b.append(b)
+
+    def const(self, value):
+        key = (type(value), value)
+        if key not in self._consts:
+            self._consts.add(key)
+            self.code.consts.append(value)
+        return value
+
+    def sub(self, stmts):
+        c = Compiler(self.layout)
+        c.block(stmts)
+        return c.code
+
+    def branch(self, stmt, owned):
+        # a branch owning private variables loads them into its locals
+        # first and stores them back last
+        c = Compiler(self.layout)
+        if owned:
+            c.emit(PRIVATIZE, owned)
+        c.block([stmt])
+        if owned:
+            c.emit(PUBLISH, owned)
+        return c.code
+
+    def loop_body(self, index, stmts):
+        # FOR_ITER; body; JUMP 0 -- a loop worker runs all its iterations in
+        # one pass through the dispatch loop
+        c = Compiler(self.layout)
+        c.emit(FOR_ITER, index)
+        c.block(stmts)
+        c.emit(JUMP, 0)
+        c.code.b[0] = len(c.code)
+        return c.code
+
+    def block(self, stmts):
+        """Compile a statement list; spawns in it are joined at its end."""
+        outer, self._spawns = self._spawns, False
+        for s in stmts:
+            self.stmt(s)
+        if self._spawns:
+            self.emit(JOIN)
+        self._spawns = outer
+
+    def store(self, slot, e):
+        if slot < 0:
+            self.expr(e)
+            self.emit(STORE_LOCAL, ~slot)
+        # Fuse the common `x = <literal>` / `x = y` forms into one instruction.
+        elif isinstance(e, ast.Literal):
+            self.emit(STORE_CONST, slot, self.const(e.value))
+        elif isinstance(e, ast.Identifier) and e.slot >= 0:
+            self.emit(MOVE, slot, e.slot)
+        else:
+            self.expr(e)
+            self.emit(STORE_NAME, slot)
+
+    def send_const(self, slot, value):
+        # Consecutive constant sends to one channel become a single batch.
+        code = self.code
+        if code.ops and code.a[-1] == slot and code.ops[-1] in (SEND_CONST, SEND_MANY):
+            prev = (code.b[-1],) if code.ops[-1] == SEND_CONST else code.b[-1]
+            code.ops[-1] = SEND_MANY
+            code.b[-1] = prev + (value,)
+        else:
+            self.emit(SEND_CONST, slot, value)
+
+    def stmt(self, s):
+        if isinstance(s, ast.Assign):
+            self.store(s.target.slot, s.expr)
+        elif isinstance(s, ast.VarDecl):
+            self.store(s.slot, s.init if s.init is not None else ast.Literal(0))
+        elif isinstance(s, ast.ChannelDecl):
+            self.emit(MAKE_CHAN, s.slot, s.capacity)
+        elif isinstance(s, ast.Send):
+            if isinstance(s.value, ast.Literal):
+                self.send_const(s.chan.slot, self.const(s.value.value))
+            else:
+                self.expr(s.value)
+                self.emit(SEND, s.chan.slot)
+        elif isinstance(s, ast.Recv):
+            self.emit(RECV, s.chan.slot, s.target.slot)
+        elif isinstance(s, ast.Select):
+            self.emit(SELECT, [(case.chan.slot, case.target.slot, self.sub(case.statements))
+                               for case in s.cases])
+        elif isinstance(s, ast.ParallelBlock):
+            self.emit(PARALLEL, [self.branch(sub, s.privates.get(sub)) for sub in s.statements],
+                      (tuple(s.reductions), s.cost, bool(s.privates)))
+        elif isinstance(s, ast.ParallelFor):
+            self.expr(s.start)
+            self.expr(s.stop)
+            self.expr(s.chunk)
+            self.emit(PARALLEL_FOR, (~s.var.slot, s.schedule, tuple(s.reductions)),
+                      self.loop_body(~s.var.slot, s.statements))
+        elif isinstance(s, ast.Spawn):
+            c = Compiler(self.layout)
+            c.expr(s.expr)
+            c.emit(POP)
+            self.emit(SPAWN, c.code)
+            self._spawns = True
+        elif isinstance(s, (ast.Lock, ast.Unlock)):
+            if self.layout.lock_modes[s.slot] != lock_elision.ELIDE:
+                self.emit(LOCK if isinstance(s, ast.Lock) else UNLOCK, s.slot)
+        elif isinstance(s, ast.Atomic):
+            self.emit(ATOMIC_ENTER, s.footprint)
+            self.block(s.statements)
+            self.emit(ATOMIC_EXIT)
+        else:
+            raise NotImplementedError(f"Unimplemented compile for node type: {type(s)}")
+
+    def expr(self, e):
+        if isinstance(e, ast.Literal):
+            self.emit(LOAD_CONST, self.const(e.value))
+        elif isinstance(e, ast.Identifier):
+            if e.slot < 0:
+                self.emit(LOAD_LOCAL, ~e.slot)
+            else:
+                self.emit(LOAD_NAME, e.slot)
+        elif isinstance(e, ast.BinaryOp):
+            self.expr(e.left)
+            self.expr(e.right)
+            self.emit(BINARY, BINARY_OPS[e.op])
+        elif e is None:
+            self.emit(LOAD_CONST, None)
+        else:
+            raise NotImplementedError(f"Unimplemented compile for expression type: {type(e)}")
+
+def compile_program(program: ast.Program) -> Code:
+    """Resolve and lower a Program to bytecode (done once; the Code can be
+    run many times)."""
+    layout = resolver.resolve(program)
+    costs = sequentialize.analyze(program).costs
+    code = Compiler(layout).sub(program.statements)
+    code.costs = costs
+    return code
+
+class Frame:
+    """Execution state of one thread of control: a Code, a pc, a stack and
+    the loop indices in scope (`locals`, None outside any parallel for)."""
+    __slots__ = ('code', 'pc', 'stack', 'locals', 'indices', 'atomic_held', 'spawned')
+
+    def __init__(self, code, locals=None, indices=None):
+        self.code = code
+        self.pc = 0
+        self.stack = []
+        self.locals = locals
+        self.indices = indices  # iterator feeding FOR_ITER in a loop worker
+        self.atomic_held = []  # stripe tuples of the open atomic blocks
+        self.spawned = None  # TaskGroup of spawns not yet joined
+
+class VM:
+    def __init__(self, scheduler='thread', workers=None, sequentialize=True):
+        # Same storage model as Interpreter: slot-indexed variables and locks.
+        self.layout = resolver.Layout()
+        self.slots = []
+        self.lock_table = []
+        self.locks = {}  # string -> Lock()
+        self._locks_guard = threading.Lock()
+        self.atomic_locks = StripedLocks()
+        self.thread_manager = make_scheduler(scheduler, workers)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        # run independent parallel blocks inline or batched, as planned from
+        # the costs compile_program() recorded
+        self.sequentialize = sequentialize
+        self.seq_stats = None
+
+    @property
+    def globals(self):
+        """Snapshot of the assigned variables as a name -> value dict."""
+        return {name: v for name, v in zip(self.layout.names, self.slots) if v is not UNSET}
+
+    def get_lock(self, name, mode=lock_elision.REENTRANT):
+        """The lock for `name`, created on first use; elided locks have none."""
+        if mode == lock_elision.ELIDE:
+            return None
+        reentrant = mode == lock_elision.REENTRANT
+        with self._locks_guard:
+            lk = self.locks.get(name)
+            if lk is None or (reentrant and not lk.reentrant):
+                lk = self.locks[name] = Lock() if reentrant else FastLock()
+            return lk
+
+    def exec_program(self, program):
+        code = program if isinstance(program, Code) else compile_program(program)
+        previous = self.globals
+        self.layout = code.layout
+        if self.sequentialize:
+            self.seq_stats = sequentialize.Stats(code.costs, self.workers)
+        self.slots = [previous.get(name, UNSET) for name in self.layout.names]
+        self.lock_table = [self.get_lock(name, mode)
+                           for name, mode in zip(self.layout.lock_names, self.layout.lock_modes)]
+        self.run(Frame(code))
+        # Safety net: every task is already joined by its block
+        self.thread_manager.join_all()
+
+    def _channel(self, slot):
+        ch = self.slots[slot]
+        if ch is UNSET:
+            raise RuntimeError(f"Unknown channel: {self.layout.names[slot]}")
+        return ch
+
+    def run(self, frame):
+        code = frame.code
+        ops = code.ops
+        A = code.a
+        B = code.b
+        g = self.slots
+        local = frame.locals
+        stack = frame.stack
+        push = stack.append
+        pop = stack.pop
+        handlers = self._HANDLERS
+        n = len(ops)
+        pc = frame.pc
+        try:
+            while pc < n:
+                op = ops[pc]
+                a = A[pc]
+                if op == STORE_CONST:
+                    g[a] = B[pc]
+                elif op == MOVE:
+                    v = g[B[pc]]
+                    g[a] = 0 if v is UNSET else v
+                elif op >= SEND_CONST:
+                    # channels, locks, tasks: a table lookup and a call, which
+                    # costs less than comparing against every opcode before
+                    # them and little next to the work they do
+                    handlers[op](self, frame, a, B[pc])
+                elif op == LOAD_NAME:
+                    v = g[a]
+                    push(0 if v is UNSET else v)
+                elif op == STORE_NAME:
+                    g[a] = pop()
+                elif op == LOAD_CONST:
+                    push(a)
+                elif op == BINARY:
+                    v = pop()
+                    push(a(pop(), v))
+                elif op == LOAD_LOCAL:
+                    push(local[a])
+                elif op == STORE_LOCAL:
+                    local[a] = pop()
+                elif op == FOR_ITER:
+                    i = next(frame.indices, None)
+                    if i is None:
+                        pc = B[pc]
+                        continue
+                    local[a] = i
+                elif op == JUMP:
+                    pc = a
+                    continue
+                else:
+                    raise RuntimeError(f"Bad opcode {op} at {pc}")
+                pc += 1
+        finally:
+            frame.pc = pc
+            # don't leave spawns running past a frame that died early
+            if frame.spawned is not None:
+                frame.spawned.join()
+                frame.spawned = None
+            # leave atomic regions on error, like the interpreter's `with` does
+            while frame.atomic_held:
+                self.atomic_locks.release(frame.atomic_held.pop())
+
+    # Handlers of the opcodes from SEND_CONST on, called as
+    # handler(vm, frame, a, b); _HANDLERS below is indexed by opcode.
+
+    def _send_const(self, frame, a, b):
+        ch = self.slots[a]
+        if ch is UNSET:
+            ch = self._channel(a)
+        if not ch.try_send(b):
+            with self.thread_manager.blocking():
+                ch.send(b)
+
+    def _send(self, frame, a, b):
+        ch = self.slots[a]
+        if ch is UNSET:
+            ch = self._channel(a)
+        v = frame.stack.pop()
+        if not ch.try_send(v):
+            with self.thread_manager.blocking():
+                ch.send(v)
+
+    def _send_many(self, frame, a, b):
+        ch = self.slots[a]
+        if ch is UNSET:
+            ch = self._channel(a)
+        if ch.capacity:
+            with self.thread_manager.blocking():
+                ch.send_many(b)
+        else:
+            ch.send_many(b)
+
+    def _recv(self, frame, a, b):
+        ch = self.slots[a]
+        if ch is UNSET:
+            ch = self._channel(a)
+        ok, v = ch.try_recv()
+        if not ok:
+            with self.thread_manager.blocking():
+                v = ch.recv()
+        if b >= 0:
+            self.slots[b] = v
+        else:
+            frame.locals[~b] = v
+
+    def _select(self, frame, a, b):
+        g = self.slots
+        chans = []
+        for chan_slot, _, _ in a:
+            ch = g[chan_slot]
+            chans.append(self._channel(chan_slot) if ch is UNSET else ch)
+        for i, ch in enumerate(chans):
+            ok, v = ch.try_recv()
+            if ok:
+                break
+        else:
+            with self.thread_manager.blocking():
+                i, v = select_recv(chans)
+        _, target, body = a[i]
+        if target >= 0:
+            g[target] = v
+        else:
+            frame.locals[~target] = v
+        if body.ops:
+            self.run(Frame(body, frame.locals))
+
+    def _lock(self, frame, a, b):
+        lk = self.lock_table[a]
+        if not lk.try_acquire():
+            with self.thread_manager.blocking():
+                lk.acquire()
+
+    def _unlock(self, frame, a, b):
+        self.lock_table[a].release()
+
+    def _atomic_enter(self, frame, a, b):
+        stripes = self.atomic_locks.stripes(a)
+        self.atomic_locks.acquire(stripes)
+        frame.atomic_held.append(stripes)
+
+    def _atomic_exit(self, frame, a, b):
+        self.atomic_locks.release(frame.atomic_held.pop())
+
+    def _make_chan(self, frame, a, b):
+        self.slots[a] = Channel(b)
+
+    def _parallel(self, frame, a, b):
+        reductions, cost, private = b
+        local = frame.locals
+        ntasks = sequentialize.plan(cost, self.workers) if self.sequentialize else None
+        if ntasks is None and not reductions and not private:
+            group = self.thread_manager.group()
+            for sub in a:
+                group.spawn(self.run, Frame(sub, local))
+            group.join()
+        else:
+            self._run_parallel(a, ntasks, local, reductions, private)
+
+    def _parallel_for(self, frame, a, b):
+        g = self.slots
+        local = frame.locals
+        pop = frame.stack.pop
+        chunk = pop()
+        stop = pop()
+        index, kind, reductions = a
+        sched = LoopSchedule(kind, pop(), stop, self.workers, chunk)
+        init = reduction_init(reductions, g, local)
+        partials = [None] * sched.workers
+        if sched.workers == 1:
+            self._loop_worker(b, index, sched, 0, local, reductions, init, partials)
+        elif sched.workers:
+            group = self.thread_manager.group()
+            for w in range(sched.workers):
+                group.spawn(self._loop_worker, b, index, sched, w, local,
+                            reductions, init, partials)
+            group.join()
+        if reductions:
+            combine_partials(reductions, partials, g, local)
+
+    def _spawn(self, frame, a, b):
+        if frame.spawned is None:
+            frame.spawned = self.thread_manager.group()
+        frame.spawned.spawn(self._run_spawned, Frame(a, frame.locals))
+
+    def _join(self, frame, a, b):
+        if frame.spawned is not None:
+            frame.spawned.join()
+            frame.spawned = None
+
+    def _privatize(self, frame, a, b):
+        privatize(a, self.slots, frame.locals)
+
+    def _publish(self, frame, a, b):
+        publish(a, self.slots, frame.locals)
+
+    def _pop(self, frame, a, b):
+        frame.stack.pop()
+
+    def _loop_worker(self, body, index, sched, worker, outer, reductions, init, partials):
+        # the body's FOR_ITER pulls indices chunk by chunk (claimed lazily)
+        local = worker_frame(outer, self.layout.nlocals, reductions, init)
+        indices = itertools.chain.from_iterable(itertools.starmap(range, sched.chunks(worker)))
+        self.run(Frame(body, local, indices))
+        partials[worker] = [local[r.local] for r in reductions]
+
+    def _run_parallel(self, branches, n, outer, reductions, private):
+        # a parallel block with reductions or private variables, or planned
+        # onto n tasks (n == 1: inline) by sequentialization
+        g = self.slots
+        init = reduction_init(reductions, g, outer)
+        if n == 1:
+            partials = [None]
+            self._run_branches(branches, outer, reductions, init, partials, 0, private)
+        else:
+            tasks = [[sub] for sub in branches] if n is None else sequentialize.batches(branches, n)
+            partials = [None] * len(tasks)
+            group = self.thread_manager.group()
+            for w, codes in enumerate(tasks):
+                group.spawn(self._run_branches, codes, outer, reductions, init, partials, w, private)
+            group.join()
+        if reductions:
+            combine_partials(reductions, partials, g, outer)
+
+    def _run_branches(self, codes, outer, reductions, init, partials, worker, private):
+        # branches owning private variables keep them in a frame of their own
+        if reductions or private:
+            local = worker_frame(outer, self.layout.nlocals, reductions, init)
+        else:
+            local = outer
+        for code in codes:
+            self.run(Frame(code, local))
+        if reductions:
+            partials[worker] = [local[r.local] for r in reductions]
+
+    def _run_spawned(self, frame):
+        try:
+            self.run(frame)
+        except Exception as e:
+            print("Spawned thread error:", e)
+
+# indexed by opcode; the inline ones have no handler
+VM._HANDLERS = tuple(None if op < SEND_CONST else getattr(VM, '_' + OPNAMES[op].lower())
+                     for op in range(len(OPNAMES)))
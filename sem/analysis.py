@@ -0,0 +1,276 @@
+# concurrentlang/sem/analysis.py
+#
+# Single-pass analysis framework. A Walker runs any number of analyses over
+# a program in one traversal. It keeps the facts several of them need in a
+# Context -- the symbol table, the locks held, the enclosing atomic blocks,
+# the task a statement runs in and the names private to the innermost
+# parallel construct -- and calls each analysis's `visit_<NodeType>(node,
+# ctx)` methods through a dispatch table built once per node type, so no
+# analysis walks the tree or tests node classes itself. A visit sees the
+# context the node runs in: for a lock, the locks held before it; for a
+# select case, the context of its body. A statement is visited before the
+# expressions and statements inside it. Identifiers are visited only where
+# they are read (in expressions); a statement's written names are read off
+# the statement itself. After the walk each analysis's `result(ctx)` gives
+# its outcome; they finish in order, and `ctx.results` holds the results of
+# those already finished, so one analysis may build on another's. The walk
+# keeps its own stack of pending statements rather than recursing, so deeply
+# nested programs do not run into Python's recursion limit.
+from concurrentlang.ast import nodes
+
+class SymbolTable:
+    def __init__(self):
+        self.scopes = [{}]
+
+    def push(self):
+        self.scopes.append({})
+
+    def pop(self):
+        self.scopes.pop()
+
+    def declare(self, name, info):
+        self.scopes[-1][name] = info
+
+    def lookup(self, name):
+        for s in reversed(self.scopes):
+            if name in s:
+                return s[name]
+        return None
+
+class Context:
+    """Facts about the statement being visited, shared by all analyses."""
+    def __init__(self):
+        self.symbols = SymbolTable()  # declarations, one scope per statement list
+        self.depth = 0         # statement lists enclosing the current one
+        # locks held while the statement runs, innermost last: those the
+        # current task took (from `task_base` on) and before them those of
+        # the tasks waiting for it to finish
+        self.held = []
+        self.task_base = 0
+        self.atomic = 0        # atomic blocks around the statement in its task
+        # task path: a ('branch', statement) marker per enclosing parallel
+        # branch, outermost first; None for a task (parallel for iteration,
+        # spawn) or region (select case) whose accesses cannot be pinned to
+        # one branch
+        self.path = ()
+        # names each task of the innermost parallel construct has its own
+        # copy of (its loop index and reduction variables), and all such
+        # names bound by any enclosing construct
+        self.private = frozenset()
+        self.bound = frozenset()
+        self.results = {}  # analysis -> result, filled in after the walk
+
+    @property
+    def protected(self):
+        """Whether the current task holds a lock or is inside an atomic block."""
+        return self.atomic > 0 or len(self.held) > self.task_base
+
+class Analysis:
+    """Base for analyses a Walker runs: define `visit_<NodeType>(node, ctx)`
+    for the node types of interest and `result(ctx)` for the outcome."""
+    def result(self, ctx):
+        return None
+
+# every AST node type, for the dispatch tables
+NODE_TYPES = tuple(nodes.Node.__subclasses__())
+
+class _Enter:
+    """Pending entry into a nested statement list, with `facts` to set on
+    the context while it is walked."""
+    __slots__ = ('stmts', 'facts')
+
+    def __init__(self, stmts, facts):
+        self.stmts = stmts
+        self.facts = facts
+
+class _Exit:
+    """Pending exit from a nested statement list: the context to restore."""
+    __slots__ = ('saved', 'held')
+
+    def __init__(self, saved, held):
+        self.saved = saved
+        self.held = held
+
+class Walker:
+    def __init__(self, analyses):
+        self.analyses = list(analyses)
+        # node type -> visit methods of the analyses interested in it
+        self._visitors = {
+            cls: [getattr(a, 'visit_' + cls.__name__) for a in self.analyses
+                  if hasattr(a, 'visit_' + cls.__name__)]
+            for cls in NODE_TYPES
+        }
+        self._visitors[_Enter] = self._visitors[_Exit] = []
+        # expressions are only walked when some analysis looks inside them
+        self._exprs = any(self._visitors[cls] for cls in (nodes.Identifier, nodes.BinaryOp, nodes.Literal))
+        self._dispatch = {
+            nodes.VarDecl: self.var_decl,
+            nodes.ChannelDecl: self.channel_decl,
+            nodes.Assign: self.assign,
+            nodes.Send: self.send,
+            nodes.Lock: self.lock,
+            nodes.Unlock: self.unlock,
+            nodes.Spawn: self.spawn,
+            nodes.Atomic: self.atomic,
+            nodes.Select: self.select,
+            nodes.SelectCase: self.select_case,
+            nodes.ParallelBlock: self.parallel_block,
+            nodes.ParallelFor: self.parallel_for,
+            _Enter: self.enter,
+            _Exit: self.exit,
+        }
+        self.ctx = None
+        self._todo = None  # statements and records still to walk, next last
+
+    def run(self, program):
+        """Walk ``program`` (a Program, or any statement) once; returns each
+        analysis's result, in order."""
+        self.walk(program)
+        for a in self.analyses:
+            self.ctx.results[a] = a.result(self.ctx)
+        return [self.ctx.results[a] for a in self.analyses]
+
+    def walk(self, program, held=()):
+        """Walk ``program`` without finishing the analyses, starting with
+        the locks ``held`` taken; returns the context at the end."""
+        self.ctx = Context()
+        self.ctx.held = list(held)
+        self.stmts(program.statements if isinstance(program, nodes.Program) else [program])
+        return self.ctx
+
+    def visit(self, node):
+        for hook in self._visitors[type(node)]:
+            hook(node, self.ctx)
+
+    def expr(self, e):
+        if not self._exprs or e is None:
+            return
+        stack = [e]
+        while stack:
+            e = stack.pop()
+            self.visit(e)
+            if isinstance(e, nodes.BinaryOp):
+                stack.append(e.right)
+                stack.append(e.left)
+
+    def stmts(self, stmts):
+        # a handler does not walk what is nested in its statement: it pushes
+        # the statements (see nested() and queue()) onto the stack of what
+        # remains, last first, and they are taken next
+        visitors = self._visitors
+        dispatch = self._dispatch
+        ctx = self.ctx
+        self._todo = todo = stmts[::-1]
+        while todo:
+            s = todo.pop()
+            cls = type(s)
+            for hook in visitors[cls]:
+                hook(s, ctx)
+            handler = dispatch.get(cls)
+            if handler is not None:
+                handler(s)
+            elif hasattr(s, 'statements'):
+                self.nested(s.statements)
+
+    def nested(self, stmts, **facts):
+        """Walk a nested statement list right after the current statement,
+        with `facts` set on the context and the locks held around it; the
+        context is restored after it."""
+        self._nest(stmts, facts)
+
+    def _nest(self, stmts, facts):
+        ctx = self.ctx
+        todo = self._todo
+        todo.append(_Exit({k: getattr(ctx, k) for k in facts}, ctx.held))
+        todo += stmts[::-1]
+        for k, v in facts.items():
+            setattr(ctx, k, v)
+        ctx.held = list(ctx.held)
+        ctx.depth += 1
+        ctx.symbols.push()
+
+    def queue(self, stmts, facts):
+        """Like nested(), but the list is entered once everything pushed
+        after it is walked: a statement with several nested lists queues
+        them last first."""
+        self._todo.append(_Enter(stmts, facts))
+
+    def enter(self, entry):
+        self._nest(entry.stmts, entry.facts)
+
+    def exit(self, record):
+        ctx = self.ctx
+        ctx.symbols.pop()
+        ctx.depth -= 1
+        ctx.held = record.held
+        for k, v in record.saved.items():
+            setattr(ctx, k, v)
+
+    def task_facts(self, path, private):
+        """Context facts for the body of a new task at task path `path`."""
+        ctx = self.ctx
+        return {'path': path, 'private': private, 'bound': ctx.bound | private,
+                'task_base': len(ctx.held), 'atomic': 0}
+
+    def var_decl(self, s):
+        self.expr(s.init)
+        self.ctx.symbols.declare(s.name, {'kind': 'var', 'type': s.typ, 'shared': s.shared})
+
+    def channel_decl(self, s):
+        self.ctx.symbols.declare(s.name, {'kind': 'chan', 'type': s.typ, 'capacity': s.capacity})
+
+    def assign(self, s):
+        self.expr(s.expr)
+
+    def send(self, s):
+        self.expr(s.value)
+
+    def lock(self, s):
+        self.ctx.held.append(s.var.name)
+
+    def unlock(self, s):
+        # releases the innermost hold of the lock; a lock never unlocked
+        # stays held to the end of its statement list
+        held = self.ctx.held
+        name = s.var.name
+        for i in range(len(held) - 1, self.ctx.task_base - 1, -1):
+            if held[i] == name:
+                del held[i]
+                break
+
+    def spawn(self, s):
+        ctx = self.ctx
+        path, ctx.path = ctx.path, ctx.path + (None,)
+        try:
+            self.expr(s.expr)
+        finally:
+            ctx.path = path
+
+    def atomic(self, s):
+        self.nested(s.statements, atomic=self.ctx.atomic + 1)
+
+    def select(self, s):
+        # exactly one case body runs, in the current task
+        path = self.ctx.path + (None,)
+        for case in reversed(s.cases):
+            self.queue([case], {'path': path})
+
+    def select_case(self, case):
+        # already in the case's own statement list (see select)
+        self._todo += case.statements[::-1]
+
+    def parallel_block(self, s):
+        private = frozenset(r.var.name for r in s.reductions)
+        for sub in reversed(s.statements):
+            self.queue([sub], self.task_facts(self.ctx.path + (('branch', sub),), private))
+
+    def parallel_for(self, s):
+        for e in (s.start, s.stop, s.chunk):
+            self.expr(e)
+        private = frozenset(r.var.name for r in s.reductions) | {s.var.name}
+        self._nest(s.statements, self.task_facts(self.ctx.path + (None,), private))
+
+def run(program, analyses):
+    """Run ``analyses`` over ``program`` in one traversal; returns their
+    results in order."""
+    return Walker(analyses).run(program)
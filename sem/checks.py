@@ -0,0 +1,32 @@
+# concurrentlang/sem/checks.py
+#
+# Runs the semantic, escape, race and deadlock analyses together in one
+# walk of the program (sem/analysis.py) instead of one walk per checker.
+from concurrentlang.ast import nodes
+from concurrentlang.sem import analysis, deadlock_detector, escape, race_detector, semantic
+
+class Report:
+    """Everything check() found about one program."""
+    def __init__(self, symbols, escapes, shared, races, lock_graph):
+        self.symbols = symbols        # analysis.SymbolTable of the declarations
+        self.escapes = escapes        # escape.Escape: branch-private variables
+        self.shared = shared          # names tasks may share
+        self.races = races            # race warnings
+        self.lock_graph = lock_graph  # lock-order graph
+        self.deadlocks = deadlock_detector.cycle_warnings(lock_graph)
+
+    @property
+    def warnings(self):
+        return self.races + self.deadlocks
+
+def check(program: nodes.Program) -> Report:
+    """Run every static check over ``program`` in a single traversal."""
+    accesses = escape.Accesses()
+    shared = race_detector.SharedVars(accesses)
+    return Report(*analysis.run(program, [
+        semantic.Declarations(),
+        accesses,
+        shared,
+        race_detector.UnprotectedWrites(shared),
+        deadlock_detector.LockOrder(),
+    ]))
@@ -1,52 +1,131 @@
-from collections import defaultdict
+# concurrentlang/sem/deadlock_detector.py
+#
+# Deadlock detection over the lock-order graph: an edge h -> n says some
+# task acquires n while holding h, and a cycle means two tasks may each
+# wait for a lock the other holds. build_lock_graph() makes one pass over
+# the statements (sem/analysis.py), which keeps the locks each statement
+# list holds on a stack: an unlock releases the innermost hold of its lock,
+# a lock never unlocked is held to the end of its list, and nested lists --
+# atomic bodies, loop bodies, select cases, each branch of a parallel block
+# -- start from the locks held around them. Only the edge from the most
+# recently acquired lock still held is recorded: every other held lock
+# reaches it through earlier edges, so the graph has the same cycles as
+# the full "held -> acquired" relation at linear size. find_cycles() runs
+# an iterative Tarjan SCC and reports every component as a concrete cycle.
+from collections import defaultdict, deque
+
+from concurrentlang.ast import nodes
+from concurrentlang.sem import analysis
+
+class LockOrder(analysis.Analysis):
+    """Lock-order graph edges: the innermost lock held -> the lock acquired."""
+    def __init__(self):
+        self.edges = defaultdict(set)
+
+    def visit_Lock(self, s, ctx):
+        if ctx.held:
+            self.edges[ctx.held[-1]].add(s.var.name)
+
+    def result(self, ctx):
+        return self.edges
 
 def build_lock_graph(program):
-    edges = defaultdict(set)
-
-    def scan_block(stmts, held=None):
-        if held is None: held = []
-        i = 0
-        while i < len(stmts):
-            s = stmts[i]
-            if s.__class__.__name__ == 'Lock':
-                # subsequent locks in the same block form ordering
-                held2 = held + [s.var.name]
-                # add edges held -> new
-                for h in held:
-                    edges[h].add(s.var.name)
-                # scan inner statements if any - assume lock scope may include following statements until unlock
-                # naive: scan following statements until Unlock(s.var)
-                j = i+1
-                inner = []
-                while j < len(stmts):
-                    if stmts[j].__class__.__name__ == 'Unlock' and getattr(stmts[j].var,'name','')==s.var.name:
-                        break
-                    inner.append(stmts[j])
-                    j += 1
-                scan_block(inner, held2)
-                i = j+1
-                continue
-            elif hasattr(s, 'statements'):
-                scan_block(s.statements, held)
-            i += 1
-
-    scan_block(program.statements)
+    """Lock-order graph of ``program`` (a Program or any statement with a
+    statement list): lock name -> locks acquired right after it."""
+    (edges,) = analysis.run(program, [LockOrder()])
     return edges
 
+def strongly_connected(edges):
+    """Strongly connected components of ``edges`` (Tarjan, iterative), each
+    a list of nodes; components come out in reverse topological order."""
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    components = []
+    succ = lambda v: iter(sorted(edges.get(v, ())))
+    for root in sorted(set(edges).union(*edges.values())):
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        path = [(root, succ(root))]
+        while path:
+            v, it = path[-1]
+            for w in it:
+                if w not in index:
+                    index[w] = low[w] = len(index)
+                    stack.append(w)
+                    on_stack.add(w)
+                    path.append((w, succ(w)))
+                    break
+                if w in on_stack:
+                    low[v] = min(low[v], index[w])
+            else:
+                path.pop()
+                if path:
+                    u = path[-1][0]
+                    low[u] = min(low[u], low[v])
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+    return components
+
+class LockCycle:
+    """One strongly connected component of the lock-order graph."""
+    def __init__(self, locks, path):
+        self.locks = locks  # sorted lock names in the component
+        self.path = path    # a cycle through it: path[0] -> ... -> path[-1] -> path[0]
+
+    def __str__(self):
+        return " -> ".join(self.path + [self.path[0]])
+
+def _cycle_through(start, edges, members):
+    # shortest cycle from `start` back to itself inside the component (BFS)
+    parent = {}
+    queue = deque([start])
+    while queue:
+        v = queue.popleft()
+        for w in sorted(edges.get(v, ())):
+            if w == start:
+                path = [v]
+                while v != start:
+                    v = parent[v]
+                    path.append(v)
+                return path[::-1]
+            if w in members and w not in parent:
+                parent[w] = v
+                queue.append(w)
+    raise AssertionError("component without a cycle")
+
+def find_cycles(edges):
+    """Every cycle of the lock-order graph, one LockCycle per strongly
+    connected component (a lock re-acquired while held is a cycle of one)."""
+    cycles = []
+    for component in strongly_connected(edges):
+        start = min(component)
+        if len(component) == 1 and start not in edges.get(start, ()):
+            continue
+        members = set(component)
+        cycles.append(LockCycle(sorted(component), _cycle_through(start, edges, members)))
+    cycles.sort(key=lambda c: c.locks)
+    return cycles
+
 def has_cycle(edges):
-    visited = {}
-    def dfs(n):
-        if n in visited:
-            return visited[n] == 1
-        visited[n] = 1
-        for m in edges.get(n, []):
-            if dfs(m):
-                return True
-        visited[n] = 2
-        return False
-
-    for node in edges:
-        if node not in visited:
-            if dfs(node):
-                return True
-    return False
\ No newline at end of file
+    return bool(find_cycles(edges))
+
+def cycle_warnings(edges):
+    """One warning per cycle of the lock-order graph ``edges``."""
+    return [f"Possible deadlock: locks {', '.join(c.locks)} are acquired in a cycle: {c}"
+            for c in find_cycles(edges)]
+
+def find_deadlocks(program: nodes.Program):
+    """One warning per lock-order cycle in ``program``."""
+    return cycle_warnings(build_lock_graph(program))
@@ -0,0 +1,94 @@
+# concurrentlang/sem/escape.py
+#
+# Escape analysis: finds variables that never escape one parallel branch.
+# A variable is private to a branch of a `parallel { }` block when the
+# branch writes it and every access to it is made by that branch's own
+# task, by the tasks it runs inside (the enclosing branches and the
+# program), which only touch it before the block starts or after it joins,
+# or by reads in branches nested inside it. Accesses from a sibling
+# branch, a parallel for body (its iterations run concurrently), a spawned
+# expression or a select case (which may not run) disqualify it, as does
+# any use as a channel. Uses of a loop index or reduction variable inside
+# its construct are frame locals already and do not count.
+#
+# The resolver gives each private variable a slot in its branch's frame:
+# the branch loads the shared value into it when it starts and stores it
+# back when it finishes, so the rest of the
+# program sees the same values while the branch itself never touches
+# shared storage. The race detector does not report private variables.
+from concurrentlang.ast import nodes
+from concurrentlang.sem import analysis
+
+class Escape:
+    """Result of analyze(): which branch owns each private variable."""
+    def __init__(self):
+        self.private = {}  # branch statement -> sorted tuple of names
+        self.names = set()  # every private variable
+
+class Accesses(analysis.Analysis):
+    """Records the task paths (analysis.Context.path) each variable is
+    accessed and written from, and which names are channels."""
+    def __init__(self):
+        self.paths = {}     # name -> task paths it is accessed from
+        self.written = {}   # name -> task paths it is written from
+        self.channels = set()
+
+    def access(self, name, ctx, write=False):
+        if name in ctx.bound:
+            return
+        self.paths.setdefault(name, set()).add(ctx.path)
+        if write:
+            self.written.setdefault(name, set()).add(ctx.path)
+
+    def visit_Identifier(self, e, ctx):
+        self.access(e.name, ctx)
+
+    def visit_VarDecl(self, s, ctx):
+        self.access(s.name, ctx, write=True)
+
+    def visit_ChannelDecl(self, s, ctx):
+        self.channels.add(s.name)
+
+    def visit_Assign(self, s, ctx):
+        self.access(s.target.name, ctx, write=True)
+
+    def visit_Send(self, s, ctx):
+        self.channels.add(s.chan.name)
+
+    def visit_Recv(self, s, ctx):
+        self.channels.add(s.chan.name)
+        self.access(s.target.name, ctx, write=True)
+
+    def visit_SelectCase(self, case, ctx):
+        self.channels.add(case.chan.name)
+        self.access(case.target.name, ctx, write=True)
+
+    def visit_ParallelBlock(self, s, ctx):
+        for r in s.reductions:
+            self.access(r.var.name, ctx, write=True)
+
+    visit_ParallelFor = visit_ParallelBlock
+
+    def result(self, ctx):
+        escape = Escape()
+        owned = {}
+        for name, paths in self.paths.items():
+            if name in self.channels:
+                continue
+            deepest = max(paths, key=len)
+            if None in deepest or any(p != deepest[:len(p)] for p in paths):
+                continue
+            # the innermost branch writing it owns it; branches nested in
+            # that one only read it, from the owner's frame
+            owner = max(self.written.get(name, ()), key=len, default=())
+            if not owner:
+                continue
+            owned.setdefault(owner[-1][1], []).append(name)
+            escape.names.add(name)
+        escape.private = {branch: tuple(sorted(v)) for branch, v in owned.items()}
+        return escape
+
+def analyze(program: nodes.Program) -> Escape:
+    """Find the variables of ``program`` private to one parallel branch."""
+    (result,) = analysis.run(program, [Accesses()])
+    return result
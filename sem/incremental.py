@@ -0,0 +1,196 @@
+# concurrentlang/sem/incremental.py
+#
+# Incremental re-analysis, for editors and hooks that check a program again
+# after a small edit. Each top-level statement is walked on its own
+# (sem/analysis.py) into a Summary of what the checks of sem/checks.py need
+# from it: its global declarations, channel uses, the variables it writes
+# and shares, its unprotected writes, its lock-order edges, the variables
+# its own tasks touch and which of them stay private to one of its parallel
+# branches, and the locks still held after it. The locks held where a
+# top-level statement starts are the only part of the rest of the program
+# its walk depends on, so summaries are memoized by the statement's content
+# hash (ast/serialize.py) and those locks. Summaries merge in program order
+# into one for a run of statements; the merged summary of the whole program
+# gives the global lock graph, shared-variable set and warnings.
+#
+# The top-level list is also cut into chunks of CHUNK statements whose
+# merged summaries are kept: a chunk holding the same statement objects as
+# last time, entered with the same locks held, is not looked at again. An
+# editor that re-parses only the statement being edited and splices it into
+# the previous tree pays for that statement, its chunk and a merge of the
+# chunks. A fresh parse of the whole file hashes every statement but walks
+# only those whose content changed.
+from collections import defaultdict
+
+from concurrentlang.ast import nodes, serialize
+from concurrentlang.sem import analysis, checks, deadlock_detector, escape, race_detector
+
+CHUNK = 256
+
+class Summary:
+    """What a top-level statement, or a run of them, contributes to a
+    check() Report."""
+    __slots__ = ('root', 'held', 'declared', 'channels', 'touched', 'owners',
+                 'shared', 'writes', 'edges')
+
+def summarize(stmt, held=()):
+    """Summary of the top-level statement ``stmt`` run with ``held`` locked."""
+    accesses = escape.Accesses()
+    shared = race_detector.SharedVars(accesses)
+    writes = race_detector.UnprotectedWrites(shared)
+    order = deadlock_detector.LockOrder()
+    ctx = analysis.Walker([accesses, shared, writes, order]).walk(stmt, held)
+    s = Summary()
+    s.root = stmt
+    s.held = tuple(ctx.held)
+    s.declared = ctx.symbols.scopes[0]
+    s.channels = accesses.channels
+    # variables accessed from inside tasks of the statement, counted once
+    # per statement; one private to a branch here stays private only if no
+    # other statement's tasks touch it. owners: name -> (statement, path to
+    # the branch in it), a path so that a copy of the statement can use it
+    s.touched = {name: 1 for name, paths in accesses.paths.items() if any(paths)}
+    s.owners = {}
+    for branch, names in accesses.result(ctx).private.items():
+        path = _path(stmt, branch)
+        for name in names:
+            s.owners[name] = (stmt, path)
+    s.shared = shared.shared
+    s.writes = writes.writes
+    s.edges = order.edges
+    return s
+
+def _path(root, target):
+    # field names and list indices leading from `root` to the node `target`
+    stack = [(root, ())]
+    while stack:
+        node, path = stack.pop()
+        if node is target:
+            return path
+        for f in node._fields:
+            x = getattr(node, f)
+            if type(x) is list:
+                stack.extend((y, path + ((f, i),)) for i, y in enumerate(x))
+            elif isinstance(x, nodes.Node):
+                stack.append((x, path + ((f, None),)))
+    raise ValueError("node not found under the statement")
+
+def _follow(root, path):
+    for f, i in path:
+        root = getattr(root, f) if i is None else getattr(root, f)[i]
+    return root
+
+def rebase(summary, stmt):
+    """``summary`` for ``stmt``, a statement with the same content as the
+    one it was made for: its branches are those of ``stmt``."""
+    if stmt is summary.root or not summary.owners:
+        return summary
+    s = Summary()
+    for f in Summary.__slots__:
+        setattr(s, f, getattr(summary, f))
+    s.root = stmt
+    s.owners = {name: (stmt, path) for name, (_, path) in summary.owners.items()}
+    return s
+
+def merge(summaries, held=()):
+    """One Summary for consecutive ``summaries``, in program order; ``held``
+    is what is locked before the first."""
+    m = Summary()
+    m.root = None
+    m.held = held
+    m.declared = {}
+    m.channels = set()
+    m.touched = touched = {}
+    m.owners = {}
+    m.shared = set()
+    m.writes = []
+    m.edges = defaultdict(set)
+    for s in summaries:
+        m.held = s.held
+        m.declared.update(s.declared)
+        m.channels |= s.channels
+        for name, n in s.touched.items():
+            touched[name] = touched.get(name, 0) + n
+        m.owners.update(s.owners)
+        m.shared |= s.shared
+        m.writes += s.writes
+        for lock, locks in s.edges.items():
+            m.edges[lock] |= locks
+    return m
+
+def report(summary):
+    """The check() Report of a program from its merged ``summary``."""
+    symbols = analysis.SymbolTable()
+    symbols.scopes[0].update(summary.declared)
+    escapes = escape.Escape()
+    owned = {}
+    for name, (stmt, path) in summary.owners.items():
+        if summary.touched[name] == 1 and name not in summary.channels:
+            owned.setdefault(_follow(stmt, path), []).append(name)
+            escapes.names.add(name)
+    escapes.private = {branch: tuple(sorted(v)) for branch, v in owned.items()}
+    shared = summary.shared - escapes.names
+    return checks.Report(symbols, escapes, shared,
+                         race_detector.race_warnings(summary.writes, shared), summary.edges)
+
+class _Chunk:
+    __slots__ = ('stmts', 'held', 'keys', 'summaries', 'merged')
+
+class IncrementalChecker:
+    """Gives what checks.check() gives, re-walking only the top-level
+    statements that changed since the previous call."""
+    def __init__(self):
+        self.summaries = {}  # (content hash, locks held before) -> Summary
+        self.hashes = {}     # id(statement) -> (statement, content hash)
+        self.chunks = []     # _Chunk per CHUNK top-level statements
+        self.analyzed = 0    # statements the last check() had to walk
+
+    def check(self, program: nodes.Program) -> checks.Report:
+        stmts = program.statements
+        chunks = []
+        held = ()
+        self.analyzed = 0
+        for i, start in enumerate(range(0, len(stmts), CHUNK)):
+            part = stmts[start:start + CHUNK]
+            old = self.chunks[i] if i < len(self.chunks) else None
+            # list equality compares the statements by identity first
+            if old is None or old.held != held or old.stmts != part:
+                old = self._chunk(part, held)
+            chunks.append(old)
+            held = old.merged.held
+        self.chunks = chunks
+        if len(self.summaries) > 2 * len(stmts) + CHUNK:
+            self._prune()
+        return report(merge([c.merged for c in chunks]))
+
+    def _chunk(self, stmts, held):
+        c = _Chunk()
+        c.stmts = stmts
+        c.held = held
+        c.keys = []
+        c.summaries = []
+        hashes = self.hashes
+        for stmt in stmts:
+            seen = hashes.get(id(stmt))
+            if seen is None or seen[0] is not stmt:
+                seen = hashes[id(stmt)] = (stmt, serialize.content_hash(stmt))
+            key = (seen[1], held)
+            summary = self.summaries.get(key)
+            if summary is None:
+                summary = self.summaries[key] = summarize(stmt, held)
+                self.analyzed += 1
+            summary = rebase(summary, stmt)
+            c.keys.append(key)
+            c.summaries.append(summary)
+            held = summary.held
+        c.merged = merge(c.summaries, c.held)
+        return c
+
+    def _prune(self):
+        # forget statements and summaries the current program does not use
+        self.hashes = {}
+        self.summaries = {}
+        for c in self.chunks:
+            for stmt, key, summary in zip(c.stmts, c.keys, c.summaries):
+                self.hashes[id(stmt)] = (stmt, key[0])
+                self.summaries[key] = summary
@@ -0,0 +1,90 @@
+# concurrentlang/sem/lock_elision.py
+#
+# Lock elision: classifies every lock name by how the program uses it.
+#  - ELIDE: only one task ever locks or unlocks it -- the program itself, or
+#    one branch of a parallel block, outside any parallel for body (whose
+#    iterations run concurrently) -- so it can never be contended and the
+#    runtimes skip its lock/unlock statements.
+#  - PLAIN: no lock() of it can run while the same task may already hold
+#    it, so it never needs to be reentrant and the runtimes back it with a
+#    plain mutex instead of an RLock.
+#  - REENTRANT: everything else, including any lock an unlock() may
+#    release without its own task holding it: only the reentrant locks
+#    check their owner and report that as an error.
+# Branches of a parallel block may run inline on the task that reached it
+# (sem/sequentialize.py, a pool worker helping with a join), so reentrancy
+# is tracked as if they ran one after another on that task; a parallel for
+# body is followed round twice, for a lock one iteration leaves held.
+from concurrentlang.ast import nodes
+
+ELIDE = 'elide'
+PLAIN = 'plain'
+REENTRANT = 'reentrant'
+
+class _Analyzer:
+    def __init__(self):
+        self.paths = {}         # lock name -> task paths it is used from
+        self.reentrant = set()  # names locked while possibly held
+        self.unowned = set()    # names unlocked where no lock() of the task took them
+
+    # A task path lists the ('branch', statement) markers of the parallel
+    # branches enclosing a statement; None marks a parallel for body.
+    # `held` is a set of (name, path) pairs: the locks possibly held and
+    # the task that took each.
+    def use(self, name, path):
+        self.paths.setdefault(name, set()).add(path)
+
+    def block(self, stmts, path, held):
+        """Walk `stmts`; returns the locks possibly held afterwards."""
+        for s in stmts:
+            held = self.stmt(s, path, held)
+        return held
+
+    def stmt(self, s, path, held):
+        if isinstance(s, nodes.Lock):
+            name = s.var.name
+            self.use(name, path)
+            if any(n == name for n, _ in held):
+                self.reentrant.add(name)
+            return held | {(name, path)}
+        if isinstance(s, nodes.Unlock):
+            name = s.var.name
+            self.use(name, path)
+            if (name, path) not in held:
+                self.unowned.add(name)
+            return held - {(name, path)}
+        if isinstance(s, nodes.Atomic):
+            return self.block(s.statements, path, held)
+        if isinstance(s, nodes.Select):
+            after = frozenset()
+            for case in s.cases:
+                after |= self.block(case.statements, path, held)
+            return after
+        if isinstance(s, nodes.ParallelBlock):
+            for sub in s.statements:
+                held = self.block([sub], path + (('branch', sub),), held)
+            return held
+        if isinstance(s, nodes.ParallelFor):
+            inner = path + (None,)
+            return self.block(s.statements, inner, self.block(s.statements, inner, held))
+        return held
+
+    def result(self):
+        modes = {}
+        for name, paths in self.paths.items():
+            (path, *others) = paths
+            if name in self.unowned:
+                modes[name] = REENTRANT
+            elif not others and None not in path:
+                modes[name] = ELIDE
+            elif name in self.reentrant:
+                modes[name] = REENTRANT
+            else:
+                modes[name] = PLAIN
+        return modes
+
+def analyze(program: nodes.Program):
+    """Map each lock name ``program`` uses to ELIDE, PLAIN or REENTRANT."""
+    a = _Analyzer()
+    a.block(program.statements, (), frozenset())
+    return a.result()
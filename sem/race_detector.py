@@ -1,49 +1,59 @@
 # concurrentlang/sem/race_detector.py
 from concurrentlang.ast import nodes
+from concurrentlang.sem import analysis, escape
+
+class SharedVars(analysis.Analysis):
+    """Names that may be shared between tasks; `escapes` is the escape
+    analysis (sem/escape.py), run earlier in the same walk."""
+    def __init__(self, escapes):
+        self.escapes = escapes
+        self.shared = set()
+
+    def visit_VarDecl(self, s, ctx):
+        # any top-level var is considered shared for now
+        if ctx.depth == 0:
+            self.shared.add(s.name)
+
+    # any variable written anywhere is shared too
+    def visit_Assign(self, s, ctx):
+        if isinstance(s.target, nodes.Identifier):
+            self.shared.add(s.target.name)
+
+    def visit_Recv(self, s, ctx):
+        self.shared.add(s.target.name)
+
+    visit_SelectCase = visit_Recv
+
+    def result(self, ctx):
+        # variables only one parallel branch ever touches cannot race
+        return self.shared - ctx.results[self.escapes].names
+
+class UnprotectedWrites(analysis.Analysis):
+    """Writes outside any lock or atomic block of their task to a name
+    `shared_vars` (a SharedVars run earlier in the same walk) finds shared."""
+    def __init__(self, shared_vars):
+        self.shared_vars = shared_vars
+        self.writes = []  # names written unprotected, in program order
+
+    def visit_Assign(self, s, ctx):
+        # a task's loop index and reduction variables are its own copies
+        if isinstance(s.target, nodes.Identifier) and not ctx.protected \
+                and s.target.name not in ctx.private:
+            self.writes.append(s.target.name)
+
+    def result(self, ctx):
+        return race_warnings(self.writes, ctx.results[self.shared_vars])
+
+def race_warnings(writes, shared):
+    """One warning per unprotected write in ``writes`` to a ``shared`` name."""
+    return [f"Possible race: write to shared '{name}' outside lock/atomic"
+            for name in writes if name in shared]
 
 def collect_shared_vars(program: nodes.Program):
-    shared = set()
-    # any top-level var is considered shared for now
-    for s in program.statements:
-        if isinstance(s, nodes.VarDecl):
-            shared.add(s.name)
-    # any variable referenced inside a ParallelBlock is shared too
-    def walk(stmts):
-        for st in stmts:
-            if isinstance(st, nodes.Assign):
-                if isinstance(st.target, nodes.Identifier):
-                    shared.add(st.target.name)
-            elif isinstance(st, nodes.Recv):
-                shared.add(st.target.name)
-            elif isinstance(st, nodes.ParallelBlock):
-                walk(st.statements)
-            elif hasattr(st, "statements"):
-                walk(getattr(st, "statements"))
-    walk(program.statements)
-    return shared
+    shared = SharedVars(escape.Accesses())
+    return analysis.run(program, [shared.escapes, shared])[1]
 
 def find_unprotected_writes(program: nodes.Program):
-    shared = collect_shared_vars(program)
-    warnings = []
-
-    def walk(stmts, locked=False, in_atomic=False):
-        for st in stmts:
-            if isinstance(st, nodes.Lock):
-                locked = True
-            elif isinstance(st, nodes.Unlock):
-                locked = False
-            elif isinstance(st, nodes.Atomic):
-                # atomic protects inner statements
-                walk(st.statements, locked=True, in_atomic=True)
-            elif isinstance(st, nodes.Assign):
-                if isinstance(st.target, nodes.Identifier):
-                    name = st.target.name
-                    if name in shared and not (locked or in_atomic):
-                        warnings.append(f"Possible race: write to shared '{name}' outside lock/atomic")
-            elif isinstance(st, nodes.ParallelBlock):
-                # body runs concurrently => check its statements too
-                walk(st.statements, locked=False, in_atomic=False)
-            elif hasattr(st, "statements"):
-                walk(getattr(st, "statements"), locked=locked, in_atomic=in_atomic)
-    walk(program.statements)
-    return warnings
\ No newline at end of file
+    shared = SharedVars(escape.Accesses())
+    writes = UnprotectedWrites(shared)
+    return analysis.run(program, [shared.escapes, shared, writes])[2]
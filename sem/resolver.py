@@ -0,0 +1,205 @@
+# concurrentlang/sem/resolver.py
+#
+# Resolution pass: gives every variable/channel name a fixed index into the
+# runtime's slot array and every lock name an index into its lock table, and
+# records them on the AST (`slot` on Identifier, VarDecl, ChannelDecl, Lock,
+# Unlock) so execution never hashes names on the hot path. The index variable
+# of a `parallel for` is private to each iteration, and a `reduce` variable is
+# private to each worker of its parallel construct: both get a local slot in
+# the worker's frame, stored as ``~k`` (always negative) so runtimes tell it
+# apart from a variable slot with ``slot < 0``. A Reduction records the slot
+# its partials are combined into (`slot`, as seen outside the construct) and
+# the frame index of the partial (`local`). A variable private to one
+# parallel branch (sem/escape.py) gets a local slot for that branch too;
+# the block's `privates` maps the branch to (slot, local) pairs
+# the runtimes load it from and store it back to. Each Atomic also gets its
+# `footprint`, the sorted variable slots its body touches, which the
+# runtimes map onto striped locks (runtime/atomic.py); private variables
+# are not part of it. `lock_modes` records how each lock may be
+# implemented (sem/lock_elision.py).
+from concurrentlang.ast import nodes
+from concurrentlang.sem import escape, lock_elision
+
+class Layout:
+    """Result of resolve(): slot -> name tables for variables and locks."""
+    def __init__(self):
+        self.names = []         # variable slot -> name
+        self.index = {}         # name -> variable slot
+        self.lock_names = []    # lock slot -> name
+        self.lock_index = {}    # name -> lock slot
+        self.lock_modes = []    # lock slot -> lock_elision.ELIDE/PLAIN/REENTRANT
+        self.nlocals = 0        # frame size needed by the deepest parallel for
+
+    def var_slot(self, name):
+        slot = self.index.get(name)
+        if slot is None:
+            slot = self.index[name] = len(self.names)
+            self.names.append(name)
+        return slot
+
+    def lock_slot(self, name):
+        slot = self.lock_index.get(name)
+        if slot is None:
+            slot = self.lock_index[name] = len(self.lock_names)
+            self.lock_names.append(name)
+        return slot
+
+class Resolver:
+    def __init__(self, private=None):
+        self.layout = Layout()
+        self._private = private or {}  # branch -> names private to it
+        self._touched = None  # slots seen inside the innermost atomic block
+        self._locals = {}     # loop index name -> local slot, innermost wins
+        self._depth = 0       # enclosing parallel for loops
+        self._dispatch = {
+            nodes.VarDecl: self.var_decl,
+            nodes.ChannelDecl: self.channel_decl,
+            nodes.Assign: self.assign,
+            nodes.Send: self.send,
+            nodes.Recv: self.recv,
+            nodes.Lock: self.lock,
+            nodes.Unlock: self.lock,
+            nodes.Spawn: self.spawn,
+            nodes.Atomic: self.atomic,
+            nodes.Select: self.select,
+            nodes.ParallelBlock: self.parallel_block,
+            nodes.ParallelFor: self.parallel_for,
+        }
+
+    def touch(self, slot):
+        if self._touched is not None:
+            self._touched.add(slot)
+        return slot
+
+    def ident(self, node):
+        slot = self._locals.get(node.name)
+        if slot is None:
+            slot = self.layout.index.get(node.name)
+            if slot is None:
+                slot = self.layout.var_slot(node.name)
+            if self._touched is not None:
+                self._touched.add(slot)
+        if node.slot == slot:
+            return node
+        if node.slot is None:
+            node.slot = slot
+            return node
+        # A shared leaf already resolved differently (e.g. by another
+        # program): annotate a private copy instead of mutating it.
+        fresh = nodes.Identifier(node.name)
+        fresh.slot = slot
+        return fresh
+
+    def expr(self, e):
+        if isinstance(e, nodes.Identifier):
+            return self.ident(e)
+        if isinstance(e, nodes.BinaryOp):
+            e.left = self.expr(e.left)
+            e.right = self.expr(e.right)
+        return e
+
+    def block(self, stmts):
+        dispatch = self._dispatch
+        for s in stmts:
+            handler = dispatch.get(type(s))
+            if handler is not None:
+                handler(s)
+            elif hasattr(s, 'statements'):
+                self.block(s.statements)
+
+    def var_decl(self, s):
+        s.init = self.expr(s.init)
+        slot = self._locals.get(s.name)
+        s.slot = self.touch(self.layout.var_slot(s.name)) if slot is None else slot
+
+    def channel_decl(self, s):
+        s.slot = self.touch(self.layout.var_slot(s.name))
+
+    def assign(self, s):
+        s.expr = self.expr(s.expr)
+        s.target = self.ident(s.target)
+
+    def send(self, s):
+        s.chan = self.ident(s.chan)
+        s.value = self.expr(s.value)
+
+    def recv(self, s):
+        s.chan = self.ident(s.chan)
+        s.target = self.ident(s.target)
+
+    def lock(self, s):
+        s.slot = self.layout.lock_slot(s.var.name)
+
+    def spawn(self, s):
+        s.expr = self.expr(s.expr)
+
+    def select(self, s):
+        for case in s.cases:
+            case.chan = self.ident(case.chan)
+            case.target = self.ident(case.target)
+            self.block(case.statements)
+
+    def bind_local(self, name):
+        # one frame entry per enclosing binding; nested constructs extend
+        # the frame
+        k = self._depth
+        self._locals[name] = ~k
+        self._depth += 1
+        self.layout.nlocals = max(self.layout.nlocals, self._depth)
+        return k
+
+    def reductions(self, reductions):
+        # combine targets resolve outside the construct, partials inside
+        for r in reductions:
+            r.var = self.ident(r.var)
+            r.slot = r.var.slot
+        for r in reductions:
+            r.local = self.bind_local(r.var.name)
+
+    def parallel_block(self, s):
+        s.privates = {}
+        outer, depth = self._locals, self._depth
+        self._locals = dict(outer)
+        self.reductions(s.reductions)
+        for sub in s.statements:
+            owned = self._private.get(sub)
+            if not owned:
+                self.block([sub])
+                continue
+            # branches run one at a time in a frame, so their private
+            # variables may reuse the same local slots
+            branch, branch_depth = self._locals, self._depth
+            self._locals = dict(branch)
+            s.privates[sub] = tuple((self.layout.var_slot(name), self.bind_local(name))
+                                    for name in owned)
+            self.block([sub])
+            self._locals, self._depth = branch, branch_depth
+        self._locals, self._depth = outer, depth
+
+    def parallel_for(self, s):
+        s.start = self.expr(s.start)
+        s.stop = self.expr(s.stop)
+        s.chunk = self.expr(s.chunk)
+        outer, depth = self._locals, self._depth
+        self._locals = dict(outer)
+        self.reductions(s.reductions)
+        self.bind_local(s.var.name)
+        s.var = self.ident(s.var)
+        self.block(s.statements)
+        self._locals, self._depth = outer, depth
+
+    def atomic(self, s):
+        outer, self._touched = self._touched, set()
+        self.block(s.statements)
+        touched, self._touched = self._touched, outer
+        s.footprint = tuple(sorted(touched))
+        if outer is not None:
+            outer |= touched
+
+def resolve(program: nodes.Program) -> Layout:
+    """Annotate ``program`` with storage slots and return its Layout."""
+    r = Resolver(escape.analyze(program).private)
+    r.block(program.statements)
+    modes = lock_elision.analyze(program)
+    r.layout.lock_modes = [modes[name] for name in r.layout.lock_names]
+    return r.layout
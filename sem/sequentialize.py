@@ -0,0 +1,219 @@
+# concurrentlang/sem/sequentialize.py
+#
+# Static sequentialization: finds `parallel { }` blocks whose branches can
+# neither block on each other nor interfere, so a runtime may run them in
+# any order on fewer tasks -- inline in the current task, or batched onto a
+# few workers -- with the same result as one task per branch. A block
+# qualifies when its branches
+#  - never wait: no recv/select, no send on a bounded (or undeclared)
+#    channel, no lock left held or released outside the statement list that
+#    took it, and no cycle in the block's lock order;
+#  - do not both acquire (lock/atomic) and send, since an outside task
+#    holding the lock could be waiting for that send;
+#  - share no variable that any of them writes (the block's own reduction
+#    variables are private to each branch and do not count).
+# analyze() records each qualifying block's estimated `cost` (about one
+# unit per AST node executed); plan() is the cost model turning it into a
+# task count.
+from concurrentlang.ast import nodes
+from concurrentlang.sem import deadlock_detector
+
+# A task start costs about as much as this many cost units (a thread start
+# is ~100us against ~1us per simple AST node in the tree interpreter).
+THREAD_COST = 100
+
+# Cost assumed for a parallel for whose bounds are not constants.
+UNKNOWN_LOOP_COST = 100 * THREAD_COST
+
+class Stats:
+    """How plan() runs the parallel blocks of one program with `workers`
+    workers, given each block's cost (None: not independent)."""
+    def __init__(self, costs=(), workers=1):
+        self.costs = list(costs)
+        self.blocks = len(self.costs)  # parallel blocks seen
+        self.inline = 0    # independent, run inline in the enclosing task
+        self.batched = 0   # independent, batched onto a few tasks
+        self.threaded = 0  # one task per branch, as written
+        for cost in self.costs:
+            n = plan(cost, workers)
+            if n is None:
+                self.threaded += 1
+            elif n == 1:
+                self.inline += 1
+            else:
+                self.batched += 1
+
+    @property
+    def sequentialized(self):
+        return self.inline + self.batched
+
+    def as_dict(self):
+        return {'blocks': self.blocks, 'inline': self.inline,
+                'batched': self.batched, 'threaded': self.threaded}
+
+    def __str__(self):
+        return (f"{self.sequentialized}/{self.blocks} parallel blocks sequentialized "
+                f"({self.inline} inline, {self.batched} batched)")
+
+def plan(cost, workers):
+    """Number of tasks to run an independent block of `cost` on: 1 means
+    inline; None (for a block that is not independent) means one task per
+    branch. Extra tasks are only worth it once each carries at least a task
+    start's worth of work."""
+    if cost is None:
+        return None
+    return max(1, min(workers, cost // THREAD_COST))
+
+def batches(statements, n):
+    """Split `statements` into `n` contiguous, nearly equal batches (fewer
+    when there are fewer statements, so no batch is empty)."""
+    k = len(statements)
+    n = min(n, k)
+    return [statements[w * k // n:(w + 1) * k // n] for w in range(n)]
+
+class _Branch:
+    """Names a branch reads/writes, its cost and how it may wait."""
+    __slots__ = ('reads', 'writes', 'cost', 'blocks', 'acquires', 'sends')
+
+    def __init__(self):
+        self.reads = set()
+        self.writes = set()
+        self.cost = 0
+        self.blocks = False    # may wait on another task
+        self.acquires = False  # takes a lock or atomic stripes
+        self.sends = False     # sends on an unbounded channel
+
+class _Analyzer:
+    def __init__(self, unbounded):
+        self.unbounded = unbounded  # channel names only ever declared unbounded
+        self.costs = []
+
+    def block(self, stmts):
+        # analyze every parallel block in a statement list, outermost first
+        for s in stmts:
+            if isinstance(s, nodes.ParallelBlock):
+                self.parallel_block(s)
+            if isinstance(s, nodes.Select):
+                for case in s.cases:
+                    self.block(case.statements)
+            body = getattr(s, 'statements', None)
+            if body:
+                self.block(body)
+
+    def parallel_block(self, s):
+        branches = []
+        for sub in s.statements:
+            b = _Branch()
+            self.stmts([sub], b)
+            branches.append(b)
+        s.cost = self.independent_cost(s, branches)
+        self.costs.append(s.cost)
+
+    def independent_cost(self, s, branches):
+        if any(b.blocks for b in branches):
+            return None
+        if any(b.acquires for b in branches) and any(b.sends for b in branches):
+            return None
+        if deadlock_detector.has_cycle(deadlock_detector.build_lock_graph(s)):
+            return None
+        private = {r.var.name for r in s.reductions}
+        # a name written by one branch may not be touched by any other
+        owner = {}
+        for i, b in enumerate(branches):
+            for name in b.reads | b.writes:
+                if name in private:
+                    continue
+                if owner.setdefault(name, i) != i:
+                    owner[name] = -1
+        for b in branches:
+            for name in b.writes:
+                if owner.get(name) == -1:
+                    return None
+        return sum(b.cost for b in branches)
+
+    def stmts(self, stmts, b):
+        held = []
+        for s in stmts:
+            self.stmt(s, b, held)
+        if held:
+            b.blocks = True  # lock left held past its statement list
+
+    def stmt(self, s, b, held):
+        b.cost += 1
+        if isinstance(s, (nodes.VarDecl, nodes.ChannelDecl)):
+            b.writes.add(s.name)
+            self.expr(getattr(s, 'init', None), b)
+        elif isinstance(s, nodes.Assign):
+            b.writes.add(s.target.name)
+            self.expr(s.expr, b)
+        elif isinstance(s, nodes.Send):
+            b.reads.add(s.chan.name)
+            self.expr(s.value, b)
+            if s.chan.name in self.unbounded:
+                b.sends = True
+            else:
+                b.blocks = True
+        elif isinstance(s, (nodes.Recv, nodes.Select)):
+            b.blocks = True
+        elif isinstance(s, nodes.Lock):
+            b.acquires = True
+            held.append(s.var.name)
+        elif isinstance(s, nodes.Unlock):
+            if s.var.name in held:
+                held.remove(s.var.name)
+            else:
+                b.blocks = True  # releases a lock some other task took
+        elif isinstance(s, nodes.Atomic):
+            b.acquires = True
+            self.stmts(s.statements, b)
+        elif isinstance(s, nodes.Spawn):
+            b.cost += THREAD_COST
+            self.expr(s.expr, b)
+        elif isinstance(s, nodes.ParallelBlock):
+            b.cost += THREAD_COST * len(s.statements)
+            self.stmts(s.statements, b)
+        elif isinstance(s, nodes.ParallelFor):
+            for e in (s.start, s.stop, s.chunk):
+                self.expr(e, b)
+            before = b.cost
+            self.stmts(s.statements, b)
+            body = b.cost - before
+            if isinstance(s.start, nodes.Literal) and isinstance(s.stop, nodes.Literal):
+                b.cost = before + body * max(0, s.stop.value - s.start.value)
+            else:
+                b.cost = before + max(body, 1) * UNKNOWN_LOOP_COST
+        else:
+            b.blocks = True  # unknown statement: assume the worst
+
+    def expr(self, e, b):
+        if isinstance(e, nodes.Identifier):
+            b.reads.add(e.name)
+            b.cost += 1
+        elif isinstance(e, nodes.BinaryOp):
+            b.cost += 1
+            self.expr(e.left, b)
+            self.expr(e.right, b)
+        elif e is not None:
+            b.cost += 1
+
+def _unbounded_channels(program):
+    unbounded, bounded = set(), set()
+    todo = list(program.statements)
+    while todo:
+        s = todo.pop()
+        if isinstance(s, nodes.ChannelDecl):
+            (bounded if s.capacity else unbounded).add(s.name)
+        elif isinstance(s, nodes.Select):
+            todo.extend(s.cases)
+        body = getattr(s, 'statements', None)
+        if body:
+            todo.extend(body)
+    return unbounded - bounded
+
+def analyze(program: nodes.Program, workers=1) -> Stats:
+    """Annotate every ParallelBlock in ``program`` with its `cost` (None if
+    its branches may block on or interfere with each other) and return how
+    plan() runs them with ``workers`` workers."""
+    a = _Analyzer(_unbounded_channels(program))
+    a.block(program.statements)
+    return Stats(a.costs, workers)
@@ -32,7 +32,7 @@ setup(
     install_requires=requirements,
     entry_points={
         "console_scripts": [
-            "concurrentlang=run_example:main",
+            "concurrentlang=concurrentlang.__main__:main",
         ],
     },
 )
@@ -0,0 +1,158 @@
+"""
+Test suite for the single-pass analysis framework (sem/analysis.py).
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from concurrentlang.ast import nodes
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.sem import (
+    analysis, checks, deadlock_detector, escape, race_detector, semantic,
+)
+
+PROGRAM = """
+int x = 1;
+chan<int> c;
+lock(a);
+parallel {
+    atomic { y = x + 1; }
+    lock(b);
+}
+parallel for i in 0..4 reduce(+: x) { x = x + i; z = i; }
+select {
+case v = recv(c): lock(b); w = v; unlock(b);
+}
+unlock(a);
+lock(b); lock(a); unlock(a); unlock(b);
+spawn(x);
+"""
+
+
+def parse(code):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(code, lexer=lexer)
+
+
+class Recorder(analysis.Analysis):
+    """Notes the context facts each visited node sees."""
+    def __init__(self):
+        self.seen = []
+
+    def visit_Assign(self, s, ctx):
+        self.seen.append((s.target.name, tuple(ctx.held), ctx.protected,
+                          len(ctx.path), tuple(sorted(ctx.private)), ctx.depth))
+
+    def visit_Identifier(self, e, ctx):
+        self.seen.append(("read " + e.name, None in ctx.path))
+
+    def result(self, ctx):
+        return self.seen
+
+
+def test_context_facts():
+    """Visits see the locks held, the task and the private names they run with."""
+    seen = analysis.run(parse(PROGRAM), [Recorder()])[0]
+    # a statement is visited before the expressions in it
+    assert seen == [
+        ("y", ("a",), True, 1, (), 2),
+        ("read x", False),
+        ("x", ("a",), False, 1, ("i", "x"), 1),
+        ("read x", True),
+        ("read i", True),
+        ("z", ("a",), False, 1, ("i", "x"), 1),
+        ("read i", True),
+        ("w", ("a", "b"), True, 1, (), 1),
+        ("read v", True),
+        ("read x", True),
+    ]
+
+
+def test_single_traversal():
+    """Every analysis of a run sees each statement once, in one walk."""
+    counts = {}
+
+    class Counter(analysis.Analysis):
+        def __getattr__(self, name):
+            if not name.startswith("visit_"):
+                raise AttributeError(name)
+            return self.count
+
+        def count(self, node, ctx):
+            # leaves may be shared between uses; count statements only
+            if not isinstance(node, (nodes.Identifier, nodes.Literal, nodes.BinaryOp)):
+                counts[id(node)] = counts.get(id(node), 0) + 1
+
+    program = parse(PROGRAM)
+    accesses = escape.Accesses()
+    shared = race_detector.SharedVars(accesses)
+    analysis.run(program, [Counter(), accesses, shared,
+                           race_detector.UnprotectedWrites(shared), deadlock_detector.LockOrder()])
+    assert counts and set(counts.values()) == {1}
+
+
+def test_race_lockset():
+    """A write is protected while its task holds any lock, not just the last one."""
+    program = parse("lock(a); lock(b); unlock(b); x = 1; unlock(a); x = 2;")
+    assert race_detector.find_unprotected_writes(program) == [
+        "Possible race: write to shared 'x' outside lock/atomic"]
+    # a lock held around a parallel block does not protect its branches
+    program = parse("lock(m);\nparallel {\nx = 1;\nx = 2;\n}\nunlock(m);")
+    assert len(race_detector.find_unprotected_writes(program)) == 2
+
+
+def test_check_matches_separate_checkers():
+    """check() gives what each checker gives on its own."""
+    program = parse(PROGRAM)
+    report = checks.check(program)
+    assert report.symbols.scopes == semantic.analyze(program).scopes
+    assert report.shared == race_detector.collect_shared_vars(program)
+    assert report.races == race_detector.find_unprotected_writes(program)
+    assert report.lock_graph == deadlock_detector.build_lock_graph(program)
+    assert report.escapes.names == escape.analyze(program).names
+    assert report.deadlocks == deadlock_detector.find_deadlocks(program) == [
+        "Possible deadlock: locks a, b are acquired in a cycle: a -> b -> a"]
+    assert report.warnings == report.races + report.deadlocks
+
+
+def test_statement_roots():
+    """A single statement can be analyzed on its own."""
+    block = nodes.ParallelBlock([nodes.Atomic(
+        [nodes.Lock(nodes.Identifier("p")), nodes.Lock(nodes.Identifier("q"))])])
+    assert dict(deadlock_detector.build_lock_graph(block)) == {"p": {"q"}}
+
+
+def test_deep_nesting():
+    """Nesting far past the recursion limit is walked without recursing."""
+    inner = [nodes.Lock(nodes.Identifier("b")), nodes.Lock(nodes.Identifier("a"))]
+    for _ in range(3 * sys.getrecursionlimit()):
+        inner = [nodes.Atomic(inner)]
+    program = nodes.Program([nodes.Lock(nodes.Identifier("a")), nodes.Lock(nodes.Identifier("b"))] + inner)
+    assert deadlock_detector.find_deadlocks(program) == [
+        "Possible deadlock: locks a, b are acquired in a cycle: a -> b -> a"]
+    assert len(checks.check(program).warnings) == 1
+
+
+if __name__ == "__main__":
+    # Run tests
+    test_context_facts()
+    print("✓ Context facts test passed")
+
+    test_single_traversal()
+    print("✓ Single traversal test passed")
+
+    test_race_lockset()
+    print("✓ Race lockset test passed")
+
+    test_check_matches_separate_checkers()
+    print("✓ check() matches separate checkers test passed")
+
+    test_statement_roots()
+    print("✓ Statement roots test passed")
+
+    test_deep_nesting()
+    print("✓ Deep nesting test passed")
+
+    print("\nAll analysis framework tests passed!")
@@ -0,0 +1,134 @@
+"""
+Test suite for AST serialization and the on-disk AST cache.
+"""
+import marshal
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.grammar import astcache
+from concurrentlang.ast import nodes as ast
+from concurrentlang.ast import serialize
+
+CODE = """
+int x = 0;
+chan<int> c;
+parallel {
+    send(c, 42);
+    x = recv(c);
+}
+lock(m);
+atomic {
+    x = 7;
+}
+unlock(m);
+"""
+
+
+def parse(code):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(code, lexer=lexer)
+
+
+def test_serialize_roundtrip():
+    """dumps/loads reproduces the same tree."""
+    tree = parse(CODE)
+    data = serialize.dumps(tree)
+    copy = serialize.loads(data)
+    
+    assert isinstance(copy, ast.Program)
+    assert isinstance(copy.statements[2], ast.ParallelBlock)
+    assert copy.statements[2].statements[1].target.name == "x"
+    assert serialize.dumps(copy) == data
+
+
+def test_serialize_rejects_foreign_data():
+    """Garbage input raises ValueError instead of producing a bogus tree."""
+    for data in (b"", b"junk", serialize.MAGIC + b"\x00\x01"):
+        try:
+            serialize.loads(data)
+        except ValueError:
+            continue
+        raise AssertionError(f"loads accepted {data!r}")
+
+
+def test_cache_hit_skips_parse():
+    """A second lookup of unchanged source is served from the cache."""
+    with tempfile.TemporaryDirectory() as root:
+        cache = astcache.ASTCache(root)
+        first = astcache.parse_cached(CODE, cache)
+        second = astcache.parse_cached(CODE, cache)
+        
+        assert cache.misses == 1 and cache.hits == 1
+        assert second is not first
+        assert serialize.dumps(second) == serialize.dumps(first)
+        assert astcache.parse_cached(CODE + "int y = 1;", cache).statements[-1].name == "y"
+        assert cache.misses == 2
+
+
+def test_syntax_error_not_cached():
+    """A program with a syntax error gives None, now and on the next call."""
+    bad = "int x = 1;\nint = 5;\nint y = 2;\n"
+    with tempfile.TemporaryDirectory() as root:
+        cache = astcache.ASTCache(root)
+        assert astcache.parse_cached(bad, cache) is None
+        assert astcache.parse_cached(bad, cache) is None
+        assert cache.hits == 0
+        assert astcache.parse_cached("int x = 1;\nint @y = 2;\n", cache) is None
+
+
+def test_rejected_construct_not_cached():
+    """A construct the parser rejects and replaces is reported like a syntax error."""
+    programs = [
+        "parallel reduce(foo: t) {\nt = 1;\n}\n",
+        "parallel for i in 0..4 schedule(bogus) {\nx = i;\n}\n",
+        "x = bar(1, 2);\n",
+        "chan<int, 0> c;\n",
+    ]
+    with tempfile.TemporaryDirectory() as root:
+        cache = astcache.ASTCache(root)
+        for code in programs:
+            assert astcache.parse_cached(code, cache) is None, code
+            assert astcache.parse_cached(code, cache) is None, code
+        assert cache.hits == 0
+
+
+def test_damaged_entry_is_a_miss():
+    """An entry that unmarshals but does not decode is re-parsed."""
+    with tempfile.TemporaryDirectory() as root:
+        cache = astcache.ASTCache(root)
+        astcache.parse_cached(CODE, cache)
+        path = cache.path(cache.key(CODE))
+        schema = serialize.schema_hash()
+        for tree in ((999,), (0, (999,)), ()):
+            with open(path, "wb") as f:
+                f.write(serialize.MAGIC + marshal.dumps((schema, tree)))
+            assert cache.get(CODE) is None
+        assert serialize.dumps(astcache.parse_cached(CODE, cache)) == serialize.dumps(parse(CODE))
+
+
+if __name__ == "__main__":
+    # Run tests
+    test_serialize_roundtrip()
+    print("✓ Serialize roundtrip test passed")
+    
+    test_serialize_rejects_foreign_data()
+    print("✓ Foreign data rejection test passed")
+    
+    test_cache_hit_skips_parse()
+    print("✓ Cache hit test passed")
+    
+    test_syntax_error_not_cached()
+    print("✓ Syntax error not cached test passed")
+    
+    test_rejected_construct_not_cached()
+    print("✓ Rejected construct not cached test passed")
+    
+    test_damaged_entry_is_a_miss()
+    print("✓ Damaged entry test passed")
+    
+    print("\nAll AST cache tests passed!")
@@ -0,0 +1,126 @@
+"""
+Test suite for the asyncio execution backend.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime.interpreter import Interpreter, Channel
+from concurrentlang.runtime.async_interpreter import AsyncInterpreter, AsyncChannel
+
+
+def parse(code):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(code, lexer=lexer)
+
+
+def final_state(engine):
+    state = {}
+    for name, value in engine.globals.items():
+        if isinstance(value, (Channel, AsyncChannel)):
+            value = ("chan", value.qsize())
+        state[name] = value
+    return state
+
+
+def test_async_matches_interpreter():
+    """The asyncio backend ends in the same state as the threaded interpreter."""
+    examples = Path(__file__).parent.parent / "examples"
+    programs = [
+        """
+        chan<int> c;
+        int v = 0;
+        send(c, 1);
+        send(c, 2);
+        v = recv(c);
+        """,
+        """
+        int x = 0;
+        chan<int> c;
+        parallel {
+            x = recv(c);
+            send(c, 42);
+        }
+        lock(m);
+        atomic {
+            y = 5;
+            z = y;
+        }
+        unlock(m);
+        """,
+        (examples / "producer_consumer.cl").read_text(),
+        (examples / "hello_parallel.cl").read_text(),
+    ]
+    for code in programs:
+        program = parse(code)
+        threaded = Interpreter()
+        threaded.exec_program(program)
+        coro = AsyncInterpreter()
+        coro.exec_program(program)
+        assert final_state(coro) == final_state(threaded), code
+
+
+def test_async_many_tasks():
+    """Thousands of blocked receivers are woken by senders as tasks."""
+    n = 5000
+    recvs = "\n".join(f"r{i} = recv(c);" for i in range(n))
+    sends = "\n".join(f"send(c, {i});" for i in range(n))
+    program = parse(f"chan<int> c;\nparallel {{\n{recvs}\n{sends}\n}}")
+    
+    interp = AsyncInterpreter()
+    interp.exec_program(program)
+    
+    received = sorted(interp.globals[f"r{i}"] for i in range(n))
+    assert received == list(range(n))
+    assert interp.globals["c"].qsize() == 0
+
+
+def test_async_lock_ownership():
+    """Locks are reentrant within a task and cannot be released by another."""
+    interp = AsyncInterpreter()
+    interp.exec_program(parse("lock(m);\nlock(m);\nunlock(m);\nunlock(m);\nx = 1;"))
+    assert interp.globals["x"] == 1
+    assert not interp.errors
+    
+    interp = AsyncInterpreter()
+    interp.exec_program(parse("parallel {\nlock(m);\n}\nparallel {\nunlock(m);\n}"))
+    assert len(interp.errors) == 1
+    assert "un-acquired" in str(interp.errors[0])
+
+
+def test_async_locks_made_in_loop():
+    """Program locks are created inside the loop that runs the program."""
+    loops = []
+    
+    class Probe(AsyncInterpreter):
+        def make_lock(self, reentrant):
+            loops.append(asyncio.get_running_loop())
+            return super().make_lock(reentrant)
+    
+    interp = Probe()
+    program = parse("parallel {\natomic {\nlock(m);\nx = 1;\nunlock(m);\n}\natomic {\nlock(m);\ny = 2;\nunlock(m);\n}\n}")
+    interp.exec_program(program)
+    interp.exec_program(program)
+    assert len(loops) == 2 and loops[0] is not loops[1]
+    assert not interp.errors
+
+
+if __name__ == "__main__":
+    # Run tests
+    test_async_matches_interpreter()
+    print("✓ Async/interpreter equivalence test passed")
+    
+    test_async_many_tasks()
+    print("✓ Async many tasks test passed")
+    
+    test_async_lock_ownership()
+    print("✓ Async lock ownership test passed")
+    
+    test_async_locks_made_in_loop()
+    print("✓ Async locks made in loop test passed")
+    
+    print("\nAll async interpreter tests passed!")
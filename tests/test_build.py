@@ -0,0 +1,168 @@
+"""
+Test suite for the batch build driver (concurrentlang/build.py).
+"""
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from concurrentlang import build
+from concurrentlang.codegen import codegen_llvm
+from concurrentlang.grammar import parser as parser_mod
+
+PROGRAMS = {
+    "a.cl": "int x = 0;\nparallel {\nx = 1;\nx = 2;\n}\n",
+    "lib/b.cl": "chan<int> c;\nparallel {\nsend(c, 1);\ny = recv(c);\n}\n",
+    "lib/deep/c.cl": "lock(m);\nz = 3;\nunlock(m);\n",
+}
+
+
+def make_tree(root, programs=PROGRAMS):
+    for name, code in programs.items():
+        path = Path(root, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(code)
+
+
+def run(root, **kw):
+    return build.build([os.path.join(root, "src")], os.path.join(root, "out"),
+                       jobs=kw.pop("jobs", 1), cache_root=os.path.join(root, "cache"), **kw)
+
+
+def test_generate_module_filename():
+    """generate_module writes the file name it is given."""
+    parser_obj, lexer = parser_mod.build_parser()
+    program = parser_obj.parse(PROGRAMS["a.cl"], lexer=lexer)
+    with tempfile.TemporaryDirectory() as d:
+        out = codegen_llvm.generate_module(program, d, filename="a.ll")
+        assert out == os.path.join(d, "a.ll")
+        assert os.listdir(d) == ["a.ll"]
+
+
+def test_collect():
+    """Directories are searched recursively; globs and files are expanded."""
+    with tempfile.TemporaryDirectory() as d:
+        make_tree(os.path.join(d, "src"))
+        Path(d, "src", "notes.txt").write_text("not a program")
+        src = os.path.join(d, "src")
+        assert [os.path.relpath(f, src) for f in build.collect([src])] == [
+            "a.cl", os.path.join("lib", "b.cl"), os.path.join("lib", "deep", "c.cl")]
+        assert build.collect([os.path.join(src, "lib", "*.cl"), os.path.join(src, "a.cl")]) == [
+            os.path.join(src, "a.cl"), os.path.join(src, "lib", "b.cl")]
+        try:
+            build.collect([os.path.join(src, "missing", "*.cl")])
+            assert False, "expected FileNotFoundError"
+        except FileNotFoundError:
+            pass
+
+
+def test_build_outputs_and_report():
+    """Every input gets its own .ll, diagnostics and timings."""
+    with tempfile.TemporaryDirectory() as d:
+        make_tree(os.path.join(d, "src"))
+        report = run(d)
+        assert report["ok"] == 3 and report["cached"] == report["error"] == 0
+        outputs = sorted(os.path.basename(r["output"]) for r in report["files"])
+        assert outputs == ["a.ll", "b.ll", "c.ll"]
+        for r in report["files"]:
+            assert os.path.isfile(r["output"])
+            assert set(r["seconds"]) == {"parse", "check", "codegen", "total"}
+        (a,) = [r for r in report["files"] if r["file"].endswith("a.cl")]
+        assert a["diagnostics"] == ["Possible race: write to shared 'x' outside lock/atomic"] * 2
+        assert "define" in Path(a["output"]).read_text()
+
+
+def test_cache_skips_unchanged_inputs():
+    """A second build only copies outputs; an edited input is rebuilt."""
+    with tempfile.TemporaryDirectory() as d:
+        make_tree(os.path.join(d, "src"))
+        first = run(d)
+        ir = {r["file"]: Path(r["output"]).read_text() for r in first["files"]}
+        for r in first["files"]:
+            os.remove(r["output"])
+        second = run(d)
+        assert second["cached"] == 3 and second["ok"] == 0
+        assert {r["file"]: Path(r["output"]).read_text() for r in second["files"]} == ir
+        assert [r["diagnostics"] for r in second["files"]] == [r["diagnostics"] for r in first["files"]]
+        Path(d, "src", "a.cl").write_text("int x = 0;\nx = 5;\n")
+        third = run(d)
+        assert [r["status"] for r in third["files"]] == ["ok", "cached", "cached"]
+        # different options are a different build
+        assert run(d, opt=False)["ok"] == 3
+        assert run(d, use_cache=False)["ok"] == 3
+
+
+def test_syntax_errors():
+    """Parse errors are diagnostics; the input fails and the CLI exits with 1."""
+    with tempfile.TemporaryDirectory() as d:
+        make_tree(os.path.join(d, "src"), {"bad.cl": "int x = ;\n", "good.cl": "y = 1;\n"})
+        report = run(d)
+        bad, good = report["files"]
+        assert bad["status"] == "error" and bad["output"] is None
+        assert bad["diagnostics"] and "Syntax error" in bad["diagnostics"][0]
+        assert good["status"] == "ok"
+        with open(os.path.join(d, "src", "latin1.cl"), "wb") as f:
+            f.write("x = 1; // caf\u00e9\n".encode("latin-1"))
+        latin1 = run(d, jobs=2)["files"][2]
+        assert latin1["status"] == "error" and "not valid UTF-8" in latin1["diagnostics"][0]
+        # failures are cached too
+        assert run(d)["files"][0]["status"] == "error"
+        report_path = os.path.join(d, "report.json")
+        status = build.main([os.path.join(d, "src"), "-o", os.path.join(d, "out"), "-j", "1",
+                             "--no-cache", "--report", report_path])
+        assert status == 1
+        with open(report_path) as f:
+            assert json.load(f)["error"] == 2
+
+
+def test_parse_source_leaves_stdout_alone():
+    """Errors are returned, not printed, and sys.stdout is not replaced."""
+    stdout = sys.stdout
+    program, errors = build.parse_source("int x = ;\nint @y = 1;\n")
+    assert program is None and len(errors) == 2
+    program, errors = build.parse_source("x = 1;\n")
+    assert program is not None and errors == []
+    program, errors = build.parse_source("x = bar(1, 2);\n")
+    assert program is None and errors == ["Unknown function: bar (line 1), expected min or max"]
+    assert sys.stdout is stdout
+
+
+def test_process_pool():
+    """Worker processes produce the same outputs as a single process."""
+    with tempfile.TemporaryDirectory() as d:
+        make_tree(os.path.join(d, "src"))
+        serial = run(d, use_cache=False)
+        ir = {r["file"]: Path(r["output"]).read_text() for r in serial["files"]}
+        pooled = run(d, jobs=2, use_cache=False)
+        assert pooled["workers"] == 2 and pooled["ok"] == 3
+        assert {r["file"]: Path(r["output"]).read_text() for r in pooled["files"]} == ir
+
+
+if __name__ == "__main__":
+    # Run tests
+    test_generate_module_filename()
+    print("✓ generate_module filename test passed")
+
+    test_collect()
+    print("✓ Input collection test passed")
+
+    test_build_outputs_and_report()
+    print("✓ Build outputs and report test passed")
+
+    test_cache_skips_unchanged_inputs()
+    print("✓ Artifact cache test passed")
+
+    test_syntax_errors()
+    print("✓ Syntax errors test passed")
+
+    test_parse_source_leaves_stdout_alone()
+    print("✓ parse_source output test passed")
+
+    test_process_pool()
+    print("✓ Process pool test passed")
+
+    print("\nAll build driver tests passed!")
@@ -0,0 +1,120 @@
+"""
+Test suite for channels: declared capacity, backpressure and batched operations.
+"""
+import sys
+import threading
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime.interpreter import Interpreter, Channel
+from concurrentlang.runtime.async_interpreter import AsyncInterpreter
+from concurrentlang.runtime.process_interpreter import ProcessInterpreter
+from concurrentlang.runtime import vm
+
+
+def parse(code):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(code, lexer=lexer)
+
+
+def test_bounded_channel_declaration():
+    """`chan<int, N>` records its capacity; `chan<int>` stays unbounded."""
+    program = parse("chan<int, 16> a;\nchan<int> b;")
+    assert program.statements[0].capacity == 16
+    assert program.statements[1].capacity is None
+    
+    interp = Interpreter()
+    interp.exec_program(program)
+    assert interp.globals["a"].capacity == 16
+    assert interp.globals["b"].capacity == 0
+
+
+def test_backpressure():
+    """A full channel refuses try_send and blocks send until a recv."""
+    ch = Channel(2)
+    assert ch.try_send(1) and ch.try_send(2)
+    assert not ch.try_send(3)
+    
+    sent = threading.Event()
+    def producer():
+        ch.send(3)
+        sent.set()
+    t = threading.Thread(target=producer)
+    t.start()
+    assert not sent.wait(0.05)
+    assert ch.recv() == 1
+    t.join()
+    assert sent.is_set()
+    assert [ch.recv(), ch.recv()] == [2, 3]
+    
+    try:
+        ch.recv(timeout=0.01)
+    except RuntimeError as e:
+        assert "timed out" in str(e)
+    else:
+        raise AssertionError("expected receive timeout")
+
+
+def test_batched_send_recv():
+    """send_many/recv_many keep order across a capacity smaller than the batch."""
+    ch = Channel(8)
+    values = list(range(1000))
+    t = threading.Thread(target=ch.send_many, args=(values,))
+    t.start()
+    received = []
+    while len(received) < len(values):
+        batch = ch.recv_many(64)
+        assert 1 <= len(batch) <= 8
+        received.extend(batch)
+    t.join()
+    assert received == values
+    assert ch.qsize() == 0
+
+
+def test_bounded_channel_engines():
+    """Senders wait for room on every engine and every value arrives."""
+    n = 6
+    recvs = "\n".join(f"r{i} = recv(c);" for i in range(n))
+    sends = "\n".join(f"send(c, {i});" for i in range(n))
+    program = parse(f"chan<int, 2> c;\nparallel {{\n{sends}\n{recvs}\n}}")
+    engines = [Interpreter, vm.VM, AsyncInterpreter, lambda: ProcessInterpreter(workers=2)]
+    for make in engines:
+        interp = make()
+        interp.exec_program(program)
+        assert sorted(interp.globals[f"r{i}"] for i in range(n)) == list(range(n))
+        assert interp.globals["c"].qsize() == 0
+
+
+def test_vm_batches_constant_sends():
+    """Consecutive constant sends to one channel compile to one SEND_MANY."""
+    code = vm.compile_program(parse("chan<int> c;\nsend(c, 1);\nsend(c, 2);\nsend(c, 3);\nx = recv(c);"))
+    assert code.ops == [vm.MAKE_CHAN, vm.SEND_MANY, vm.RECV]
+    assert code.b[1] == (1, 2, 3)
+    
+    machine = vm.VM()
+    machine.exec_program(code)
+    assert machine.globals["x"] == 1
+    assert machine.globals["c"].qsize() == 2
+
+
+if __name__ == "__main__":
+    # Run tests
+    test_bounded_channel_declaration()
+    print("✓ Bounded channel declaration test passed")
+    
+    test_backpressure()
+    print("✓ Backpressure test passed")
+    
+    test_batched_send_recv()
+    print("✓ Batched send/recv test passed")
+    
+    test_bounded_channel_engines()
+    print("✓ Bounded channel engines test passed")
+    
+    test_vm_batches_constant_sends()
+    print("✓ VM send batching test passed")
+    
+    print("\nAll channel tests passed!")
@@ -0,0 +1,162 @@
+"""
+Test suite for escape analysis and branch-private variables.
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime.interpreter import Interpreter
+from concurrentlang.runtime.async_interpreter import AsyncInterpreter
+from concurrentlang.runtime.process_interpreter import ProcessInterpreter
+from concurrentlang.runtime import vm
+from concurrentlang.codegen.codegen_llvm import emit_module
+from concurrentlang.sem import escape, race_detector, resolver
+
+PROGRAM = """
+chan<int> c;
+int a = 10;
+send(c, 4);
+send(c, 5);
+parallel {
+    atomic {
+        a = a + 1;
+        t = a * 2;
+        t = t + 1;
+    }
+    atomic {
+        u = 5;
+        parallel {
+            atomic { w = u; w = w + 1; }
+            z = 1;
+        }
+        u = w + u;
+    }
+    r = recv(c);
+    s = 1;
+    s2 = s;
+}
+parallel for i in 0..4 { q = i; }
+select {
+case m = recv(c): m = 1;
+}
+spawn(a);
+"""
+
+
+def parse(code):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(code, lexer=lexer)
+
+
+def test_private_variables():
+    """Only variables one branch (and its enclosing tasks) touch are private."""
+    program = parse(PROGRAM.replace("spawn(a);", ""))
+    result = escape.analyze(program)
+    block = program.statements[4]
+    first, second, recv, s, s2 = block.statements
+    inner = second.statements[1]
+    assert result.private == {
+        first: ("a", "t"),
+        second: ("u",),
+        inner.statements[0]: ("w",),
+        recv: ("r",),
+        inner.statements[1]: ("z",),
+        s2: ("s2",),
+    }
+    # s is read by a sibling, q is written by every iteration, m in a
+    # select case and c is a channel
+    assert result.names == {"a", "t", "u", "w", "r", "z", "s2"}
+
+
+def test_spawn_escapes():
+    """A variable a spawned task reads is shared."""
+    assert "a" not in escape.analyze(parse(PROGRAM)).names
+
+
+def test_resolver_gives_private_locals():
+    """Private variables live in their branch's frame and leave footprints."""
+    program = parse(PROGRAM)
+    layout = resolver.resolve(program)
+    block = program.statements[4]
+    first = block.statements[0]
+    ((slot, local),) = block.privates[first]
+    assert layout.names[slot] == "t" and local >= 0
+    assert first.footprint == (layout.index["a"],)  # a escapes to the spawn
+    assert first.statements[1].target.slot == ~local
+
+
+def test_race_detector_skips_private():
+    """Writes to private variables are not races; shared ones still are."""
+    program = parse("parallel {\natomic { x = 1; x = x + 1; }\ny = 1;\nz = y;\n}")
+    assert race_detector.find_unprotected_writes(program) == [
+        "Possible race: write to shared 'y' outside lock/atomic"]
+
+
+def test_engines_publish_private_values():
+    """Every engine ends with the values private variables were given."""
+    engines = [
+        lambda: Interpreter(workers=2),
+        lambda: Interpreter(scheduler="pool", workers=2, sequentialize=False),
+        lambda: vm.VM(workers=2),
+        lambda: vm.VM(workers=2, sequentialize=False),
+        lambda: AsyncInterpreter(workers=2),
+        lambda: ProcessInterpreter(workers=2),
+        lambda: ProcessInterpreter(workers=2, sequentialize=False),
+    ]
+    for make in engines:
+        interp = make()
+        interp.exec_program(parse(PROGRAM))
+        state = interp.globals
+        assert (state["a"], state["t"], state["u"], state["w"], state["z"]) == (11, 23, 11, 6, 1)
+        assert (state["r"], state["s"], state["m"]) == (4, 1, 1)
+
+
+def test_vm_branch_loads_and_stores_privates():
+    """A VM branch loads its private variables first and stores them last."""
+    code = vm.compile_program(parse("int x = 1;\nparallel {\natomic { x = x + 1; }\ny = 2;\n}"))
+    first = code.a[1][0]
+    x = code.layout.index["x"]
+    assert first.ops[0] == vm.PRIVATIZE and first.ops[-1] == vm.PUBLISH
+    assert first.a[0] == ((x, 0),)
+    assert vm.STORE_NAME not in first.ops and vm.LOAD_NAME not in first.ops
+
+
+
+def test_llvm_nested_block_uses_branch_allocas():
+    """A block nested in a branch reaches the branch's privates through pointers."""
+    ir = emit_module(parse(
+        "int x = 0;\nparallel {\natomic {\nx = 1;\nparallel {\natomic { y = x; }\nz = 2;\n}\nx = 3;\n}\nw = 0;\n}"
+    ))
+    assert "define void @parallel_block_2(i64* %x.ptr) {" in ir
+    assert "call void @parallel_block_2(i64* %x)" in ir
+    assert "store i64 1, i64* %x" in ir and "store i64 3, i64* %x" in ir
+    assert "store i64 1, i64* @x" not in ir
+
+
+if __name__ == "__main__":
+    # Run tests
+    test_private_variables()
+    print("✓ Private variables test passed")
+
+    test_spawn_escapes()
+    print("✓ Spawn escapes test passed")
+
+    test_resolver_gives_private_locals()
+    print("✓ Resolver private locals test passed")
+
+    test_race_detector_skips_private()
+    print("✓ Race detector skips private test passed")
+
+    test_engines_publish_private_values()
+    print("✓ Engines publish private values test passed")
+
+    test_vm_branch_loads_and_stores_privates()
+    print("✓ VM branch privates test passed")
+
+    test_llvm_nested_block_uses_branch_allocas()
+    print("✓ LLVM nested block privates test passed")
+
+    print("\nAll escape analysis tests passed!")
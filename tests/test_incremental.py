@@ -0,0 +1,143 @@
+"""
+Test suite for content hashes and incremental re-analysis (sem/incremental.py).
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from concurrentlang.ast import nodes, serialize
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.sem import checks, incremental
+
+PROGRAM = """
+int x = 1;
+chan<int> c;
+lock(a);
+parallel {
+    atomic { y = x + 1; }
+    atomic { p = 1; p = p + 1; }
+    lock(b);
+}
+unlock(a);
+parallel for i in 0..4 reduce(+: x) { x = x + i; z = i; }
+select {
+case v = recv(c): lock(b); w = v; unlock(b);
+}
+lock(b); lock(a); unlock(a); unlock(b);
+q = 2;
+"""
+
+
+def parse(code):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(code, lexer=lexer)
+
+
+def same_report(got, program):
+    """The incremental report equals a full check() of the program."""
+    want = checks.check(program)
+    assert got.symbols.scopes == want.symbols.scopes
+    assert got.shared == want.shared
+    assert got.races == want.races
+    assert dict(got.lock_graph) == dict(want.lock_graph)
+    assert got.escapes.names == want.escapes.names
+    assert got.escapes.private == want.escapes.private
+    assert got.deadlocks == want.deadlocks
+
+
+def test_content_hash():
+    """Equal subtrees hash equal across parses; any change shows."""
+    a, b = parse(PROGRAM), parse(PROGRAM)
+    assert [serialize.content_hash(s) for s in a.statements] == \
+        [serialize.content_hash(s) for s in b.statements]
+    assert serialize.content_hash(a) == serialize.content_hash(b)
+    # a block hashes on its own too
+    block = a.statements[3].statements[1]
+    assert serialize.content_hash(block) == serialize.content_hash(b.statements[3].statements[1])
+    hashes = {serialize.content_hash(parse(code).statements[0])
+              for code in ("x = 1;", "x = y;", "y = 1;", "x = 1 + 0;", "lock(x);")}
+    assert len(hashes) == 5
+
+
+def test_matches_check():
+    """The recombined report is the one check() gives."""
+    program = parse(PROGRAM)
+    report = incremental.IncrementalChecker().check(program)
+    same_report(report, program)
+    assert report.escapes.names == {"p", "y"}
+    assert report.deadlocks
+
+
+def test_only_changed_statements_walked():
+    """A re-check walks only statements it has not seen before."""
+    checker = incremental.IncrementalChecker()
+    program = parse(PROGRAM)
+    checker.check(program)
+    assert checker.analyzed == len(program.statements)
+    checker.check(program)
+    assert checker.analyzed == 0
+    # a fresh parse of the same text is recognized by content
+    again = parse(PROGRAM)
+    report = checker.check(again)
+    assert checker.analyzed == 0
+    same_report(report, again)
+    assert again.statements[3].statements[1] in report.escapes.private
+    # editing one parallel block walks just that block
+    code = PROGRAM.replace("p = p + 1;", "p = p + 2;")
+    edited = parse(code)
+    report = checker.check(edited)
+    assert checker.analyzed == 1
+    same_report(report, edited)
+    # a variable stops being private when another statement's task uses it
+    edited = parse(code.replace("q = 2;", "parallel {\nq = p;\n}"))
+    report = checker.check(edited)
+    assert checker.analyzed == 1
+    same_report(report, edited)
+    assert report.escapes.names == {"q", "y"} and "p" in report.shared
+
+
+def test_locks_held_across_statements():
+    """A statement is walked again when the locks held before it change."""
+    checker = incremental.IncrementalChecker()
+    program = parse("lock(m); x = 1; unlock(m); x = 2;")
+    same_report(checker.check(program), program)
+    # x = 1 and the unlock now start with nothing held; x = 2 did before too
+    program.statements[0] = parse("y = 0;").statements[0]
+    report = checker.check(program)
+    assert checker.analyzed == 3
+    same_report(report, program)
+    assert len(report.races) == 3
+
+
+def test_statement_order():
+    """Moving statements keeps their summaries but reorders the warnings."""
+    checker = incremental.IncrementalChecker()
+    program = parse("a = 1;\nparallel {\nb = 1;\nb = 2;\n}\nc = 1;")
+    checker.check(program)
+    program.statements.reverse()
+    report = checker.check(program)
+    assert checker.analyzed == 0
+    same_report(report, program)
+    assert isinstance(program.statements[1], nodes.ParallelBlock)
+
+
+if __name__ == "__main__":
+    # Run tests
+    test_content_hash()
+    print("✓ Content hash test passed")
+
+    test_matches_check()
+    print("✓ Matches check() test passed")
+
+    test_only_changed_statements_walked()
+    print("✓ Only changed statements walked test passed")
+
+    test_locks_held_across_statements()
+    print("✓ Locks held across statements test passed")
+
+    test_statement_order()
+    print("✓ Statement order test passed")
+
+    print("\nAll incremental analysis tests passed!")
@@ -58,6 +58,103 @@ def test_parallel_with_send():
     assert isinstance(interp.globals["c"], Channel)
 
 
+def test_slot_resolved_storage():
+    """Variables, channels and locks get fixed slots; globals is a name view."""
+    parser_obj, lexer = parser_mod.build_parser()
+    code = """
+    int x = 1;
+    chan<int> c;
+    lock(m);
+    send(c, 5);
+    y = recv(c);
+    unlock(m);
+    """
+    ast = parser_obj.parse(code, lexer=lexer)
+    
+    interp = Interpreter()
+    interp.exec_program(ast)
+    
+    layout = interp.layout
+    assert sorted(layout.names) == ["c", "x", "y"]
+    assert layout.lock_names == ["m"]
+    assert interp.slots[layout.index["y"]] == 5
+    assert ast.statements[4].target.slot == layout.index["y"]
+    # only the program itself takes m, so the lock is elided
+    assert ast.statements[2].slot == 0 and interp.lock_table[0] is None
+    assert layout.lock_modes == ["elide"]
+    assert interp.globals["x"] == 1 and interp.globals["y"] == 5
+    # unassigned names are resolved but stay out of the globals view
+    assert "z" not in interp.globals
+
+
+def test_resolve_shared_leaves():
+    """Hash-consed identifiers resolve consistently, and globals persist."""
+    parser_obj, lexer = parser_mod.build_parser(hashcons=True)
+    first = parser_obj.parse("int a = 1; int b = a;", lexer=lexer)
+    second = parser_obj.parse("int b = 2; a = b;", lexer=lexer)
+    
+    interp = Interpreter()
+    interp.exec_program(first)
+    interp.exec_program(second)
+    assert interp.globals == {"a": 2, "b": 2}
+
+
+def test_atomic_footprints():
+    """Atomic blocks record the sorted slots they touch, nested ones included."""
+    from concurrentlang.sem import resolver
+    parser_obj, lexer = parser_mod.build_parser()
+    code = """
+    int a = 0;
+    int b = 0;
+    chan<int> c;
+    atomic {
+        b = a;
+        atomic {
+            z = recv(c);
+        }
+    }
+    """
+    program = parser_obj.parse(code, lexer=lexer)
+    layout = resolver.resolve(program)
+    outer = program.statements[3]
+    inner = outer.statements[1]
+    
+    slot = layout.index
+    assert inner.footprint == (slot["c"], slot["z"])
+    assert outer.footprint == tuple(sorted(slot[n] for n in "abcz"))
+
+
+def test_disjoint_atomics_do_not_contend():
+    """An atomic block runs while another thread holds a disjoint stripe."""
+    import threading
+    parser_obj, lexer = parser_mod.build_parser()
+    program = parser_obj.parse("int x = 0;\nint y = 0;\natomic {\ny = 1;\n}", lexer=lexer)
+    
+    interp = Interpreter()
+    interp.exec_program(program)
+    held = interp.atomic_locks.stripes((0,))   # the stripe guarding x
+    release = threading.Event()
+    holding = threading.Event()
+    def hold_x():
+        interp.atomic_locks.acquire(held)
+        holding.set()
+        release.wait()
+        interp.atomic_locks.release(held)
+    holder = threading.Thread(target=hold_x)
+    holder.start()
+    holding.wait()
+    
+    runner = threading.Thread(target=interp.exec_program, args=(program,))
+    runner.start()
+    runner.join(timeout=5)
+    finished = not runner.is_alive()
+    release.set()
+    holder.join()
+    runner.join()
+    assert finished
+    assert interp.globals["y"] == 1
+
+
 if __name__ == "__main__":
     # Run tests
     test_simple_variable()
@@ -69,4 +166,16 @@ if __name__ == "__main__":
     test_parallel_with_send()
     print("✓ Parallel with send test passed")
     
+    test_slot_resolved_storage()
+    print("✓ Slot-resolved storage test passed")
+    
+    test_resolve_shared_leaves()
+    print("✓ Shared leaf resolution test passed")
+    
+    test_atomic_footprints()
+    print("✓ Atomic footprint test passed")
+    
+    test_disjoint_atomics_do_not_contend()
+    print("✓ Disjoint atomics test passed")
+    
     print("\nAll interpreter tests passed!")
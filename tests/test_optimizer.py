@@ -0,0 +1,196 @@
+"""
+Test suite for the AST optimization pipeline (opt/).
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from concurrentlang.ast import nodes
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.opt import pipeline
+from concurrentlang.opt.constprop import ConstantPropagation
+from concurrentlang.opt.dse import DeadStoreElimination
+from concurrentlang.opt.syncelim import RedundantSyncElimination
+from concurrentlang.runtime.interpreter import Interpreter
+from concurrentlang.runtime.async_interpreter import AsyncInterpreter
+from concurrentlang.runtime.process_interpreter import ProcessInterpreter
+from concurrentlang.runtime import vm
+
+
+def parse(code):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(code, lexer=lexer)
+
+
+def kinds(stmts):
+    return [type(s).__name__ for s in stmts]
+
+
+def test_constant_propagation():
+    """Known values replace reads and literal arithmetic folds."""
+    program = parse("int x = 3;\ny = x * 4 + 1;\nz = y / 0;\nparallel for i in 0..x { s = i + y; }")
+    counts = ConstantPropagation().run(program)
+    decl, y, z, loop = program.statements
+    assert y.expr.value == 13
+    assert isinstance(z.expr, nodes.BinaryOp)  # division by zero is left to the runtime
+    assert loop.stop.value == 3 and loop.statements[0].expr.right.value == 13
+    assert loop.statements[0].expr.left.name == "i"
+    assert counts == {"replaced": 4, "folded": 2}
+
+
+def test_constant_propagation_respects_concurrency():
+    """Names another task may write are never propagated."""
+    program = parse("""
+    x = 1;
+    parallel { a = x; x = 2; b = 5; }
+    c = x;
+    d = b;
+    parallel for i in 0..4 { t = 1; u = t; }
+    v = t;
+    """)
+    ConstantPropagation().run(program)
+    _, block, c, d, loop, v = program.statements
+    assert isinstance(block.statements[0].expr, nodes.Identifier)
+    assert isinstance(c.expr, nodes.Identifier) and isinstance(d.expr, nodes.Identifier)
+    assert isinstance(loop.statements[1].expr, nodes.Identifier)  # another iteration may write t
+    assert isinstance(v.expr, nodes.Identifier)
+
+
+def test_dead_store_elimination():
+    """Overwritten stores go; recv, spawned reads and failing stores stay."""
+    program = parse("""
+    chan<int> c;
+    x = 1;
+    x = 2;
+    y = 1;
+    y = y + 1;
+    v = 1;
+    v = recv(c);
+    v = 3;
+    d = 1 / q;
+    d = 4;
+    s = 1;
+    spawn(s);
+    s = 2;
+    atomic { w = 1; w = 2; }
+    x = 5;
+    """)
+    counts = DeadStoreElimination().run(program)
+    assert counts == {"removed": 4}
+    targets = [getattr(s, "target", None) for s in program.statements]
+    assert [t.name for t in targets if t is not None] == ["y", "y", "v", "v", "d", "d", "s", "s", "x"]
+    assert kinds(program.statements[-2].statements) == ["Assign"]
+
+
+def test_dead_store_elimination_respects_concurrency():
+    """A store another branch or iteration may observe is never dead."""
+    program = parse("""
+    parallel {
+        atomic { x = 1; x = 2; }
+        y = x;
+        atomic { z = 1; z = 2; }
+    }
+    parallel for i in 0..4 { t = 1; t = 2; }
+    """)
+    assert DeadStoreElimination().run(program) == {"removed": 1}
+    block, loop = program.statements
+    assert len(block.statements[0].statements) == 2
+    assert len(block.statements[2].statements) == 1
+    assert len(loop.statements) == 2
+
+
+def test_redundant_sync_elimination():
+    """Empty critical sections go, including ones nested in each other."""
+    program = parse("""
+    lock(a); lock(b); unlock(b); unlock(a);
+    lock(m); x = 1; unlock(m);
+    lock(a); unlock(b);
+    parallel { lock(m); unlock(m); }
+    """)
+    program.statements.append(nodes.Atomic([]))
+    counts = RedundantSyncElimination().run(program)
+    assert counts == {"pairs": 2, "atomics": 1}
+    assert kinds(program.statements) == ["Lock", "Assign", "Unlock", "Lock", "Unlock", "ParallelBlock"]
+    assert kinds(program.statements[-1].statements) == ["Lock", "Unlock"]
+
+
+def test_pass_manager():
+    """Passes run in order, can be disabled and report statistics."""
+    src = "x = 1;\natomic { y = x; y = 2; }\nz = x + 1;"
+    program = parse(src)
+    stats = pipeline.optimize(program)
+    assert [(s.name, s.counts) for s in stats] == [
+        ("constprop", {"replaced": 2, "folded": 1}),
+        ("dse", {"removed": 1}),
+        ("sync", {"pairs": 0, "atomics": 0}),
+    ]
+    assert str(stats[1]).startswith("dse: removed=1 (")
+    program = parse(src)
+    manager = pipeline.PassManager(disabled=("constprop", "dse"))
+    assert [s.name for s in manager.run(program)] == ["sync"]
+    assert isinstance(program.statements[2].expr, nodes.BinaryOp)
+    try:
+        pipeline.PassManager(disabled=("inline",))
+        assert False, "unknown pass name accepted"
+    except ValueError:
+        pass
+
+
+def test_engines_match_unoptimized():
+    """Optimized programs end in the same state on every engine."""
+    src = """
+    chan<int> c;
+    int n = 4;
+    int total = 0;
+    k = n * 2;
+    k = k + 1;
+    send(c, k);
+    lock(m); unlock(m);
+    parallel for i in 0..n reduce(+: total) { total = total + i * k; }
+    parallel {
+        atomic { a = k; a = a + n; }
+        atomic { b = 1; b = recv(c); }
+    }
+    """
+    engines = [Interpreter, vm.VM, AsyncInterpreter, ProcessInterpreter]
+    for engine in engines:
+        states = []
+        for optimize in (True, False):
+            program = parse(src)
+            if optimize:
+                pipeline.optimize(program)
+            interp = engine(workers=2)
+            interp.exec_program(program)
+            state = interp.globals
+            del state["c"]
+            states.append(state)
+        assert states[0] == states[1], engine
+        assert states[0] == {"n": 4, "total": 54, "k": 9, "a": 13, "b": 9}
+
+
+if __name__ == "__main__":
+    # Run tests
+    test_constant_propagation()
+    print("✓ Constant propagation test passed")
+
+    test_constant_propagation_respects_concurrency()
+    print("✓ Constant propagation concurrency test passed")
+
+    test_dead_store_elimination()
+    print("✓ Dead-store elimination test passed")
+
+    test_dead_store_elimination_respects_concurrency()
+    print("✓ Dead-store elimination concurrency test passed")
+
+    test_redundant_sync_elimination()
+    print("✓ Redundant sync elimination test passed")
+
+    test_pass_manager()
+    print("✓ Pass manager test passed")
+
+    test_engines_match_unoptimized()
+    print("✓ Engines match unoptimized test passed")
+
+    print("\nAll optimizer tests passed!")
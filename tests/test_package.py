@@ -0,0 +1,89 @@
+"""
+Test suite for the lazy package shim (concurrentlang/__init__.py).
+"""
+import importlib
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+# Add project root to path
+sys.path.insert(0, str(ROOT))
+
+import concurrentlang
+
+
+def loaded_after(statement):
+    """The concurrentlang submodules and whether PLY is loaded after running
+    ``statement`` in a fresh interpreter."""
+    code = (f"{statement}\nimport sys\n"
+            "print(sorted(m for m in sys.modules if m.startswith('concurrentlang.') and m.count('.') == 2))\n"
+            "print('ply' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], cwd=str(ROOT), capture_output=True,
+                         text=True, check=True).stdout.splitlines()
+    return eval(out[0]), out[1] == "True"
+
+
+def test_nothing_loaded_eagerly():
+    """Importing the package, or one module, loads only what is used."""
+    assert loaded_after("import concurrentlang") == ([], False)
+    assert loaded_after("from concurrentlang.ast import nodes") == (["concurrentlang.ast.nodes"], False)
+    modules, ply = loaded_after("from concurrentlang.grammar import parser")
+    assert "concurrentlang.grammar.parser" in modules and ply
+    assert not any(m.startswith("concurrentlang.runtime.") for m in modules)
+    # constant folding needs the operator table, not the runtimes
+    modules, ply = loaded_after("from concurrentlang.opt import pipeline")
+    assert "concurrentlang.ast.ops" in modules and not ply
+    assert not any(m.startswith("concurrentlang.runtime.") for m in modules)
+    # the compile server's client finds the socket without the compiler
+    assert loaded_after("from concurrentlang import client\nclient.default_socket()") == ([], False)
+
+
+def test_attribute_access():
+    """Listed submodules load on first attribute access; others do not exist."""
+    escape = concurrentlang.sem.escape
+    assert sys.modules["concurrentlang.sem.escape"] is escape
+    assert "escape" in dir(concurrentlang.sem)
+    try:
+        concurrentlang.sem.no_such_module
+        assert False, "expected AttributeError"
+    except AttributeError:
+        pass
+    from concurrentlang.sem import escape as again
+    assert again is escape
+
+
+def test_import_errors_propagate():
+    """An error inside a submodule reaches the importer."""
+    with tempfile.TemporaryDirectory() as d:
+        Path(d, "broken.py").write_text("raise RuntimeError('broken on purpose')\n")
+        Path(d, "fine.py").write_text("VALUE = 1\n")
+        path = concurrentlang.opt.__path__
+        path.append(d)
+        try:
+            try:
+                importlib.import_module("concurrentlang.opt.broken")
+                assert False, "expected RuntimeError"
+            except RuntimeError as e:
+                assert "broken on purpose" in str(e)
+            assert "concurrentlang.opt.broken" not in sys.modules
+            from concurrentlang.opt import fine
+            assert fine.VALUE == 1
+        finally:
+            path.remove(d)
+            sys.modules.pop("concurrentlang.opt.fine", None)
+
+
+if __name__ == "__main__":
+    # Run tests
+    test_nothing_loaded_eagerly()
+    print("✓ Nothing loaded eagerly test passed")
+
+    test_attribute_access()
+    print("✓ Attribute access test passed")
+
+    test_import_errors_propagate()
+    print("✓ Import errors propagate test passed")
+
+    print("\nAll package shim tests passed!")
@@ -0,0 +1,146 @@
+"""
+Test suite for parallel for loops and arithmetic expressions.
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from concurrentlang.ast import nodes
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime.interpreter import Interpreter
+from concurrentlang.runtime.async_interpreter import AsyncInterpreter
+from concurrentlang.runtime.process_interpreter import ProcessInterpreter
+from concurrentlang.runtime.scheduler import LoopSchedule
+from concurrentlang.runtime import vm
+from concurrentlang.sem import race_detector
+
+ENGINES = [
+    lambda: Interpreter(workers=4),
+    lambda: Interpreter(scheduler="pool", workers=4),
+    lambda: vm.VM(workers=4),
+    lambda: AsyncInterpreter(workers=4),
+    lambda: ProcessInterpreter(workers=4),
+]
+
+
+def parse(code):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(code, lexer=lexer)
+
+
+def drain(interp, name):
+    ch = interp.globals[name]
+    return sorted(ch.try_recv()[1] for _ in range(ch.qsize()))
+
+
+def test_parse_parallel_for():
+    """parallel for parses its range, body and optional schedule clause."""
+    program = parse("parallel for i in 1..n + 1 schedule(dynamic, 8) { x = i; }\n"
+                    "parallel for j in 0..4 { y = j; }")
+    loop, plain = program.statements
+    assert isinstance(loop, nodes.ParallelFor)
+    assert loop.var.name == "i" and loop.start.value == 1
+    assert isinstance(loop.stop, nodes.BinaryOp) and loop.stop.op == "+"
+    assert (loop.schedule, loop.chunk.value) == ("dynamic", 8)
+    assert isinstance(loop.statements[0], nodes.Assign)
+    assert (plain.schedule, plain.chunk) == ("static", None)
+
+
+def test_arithmetic():
+    """Arithmetic follows the usual precedence; / and % floor."""
+    interp = Interpreter()
+    interp.exec_program(parse("int x = 7;\ny = (x + 3) * 2 - x / 2 % 3;\nz = -x / 2;\nw = x - 2 - 1;"))
+    state = interp.globals
+    assert (state["y"], state["z"], state["w"]) == (20 - (7 // 2) % 3, -4, 4)
+    machine = vm.VM()
+    machine.exec_program(parse("int x = 7;\ny = (x + 3) * 2 - x / 2 % 3;\nz = -x / 2;\nw = x - 2 - 1;"))
+    assert machine.globals == state
+
+
+def test_schedules_cover_range():
+    """Every policy hands out each iteration exactly once."""
+    for kind in LoopSchedule.KINDS:
+        for start, stop, workers, chunk in [(0, 100, 4, None), (3, 50, 3, 7), (0, 5, 8, None), (5, 5, 4, None)]:
+            sched = LoopSchedule(kind, start, stop, workers, chunk)
+            seen = [i for w in range(sched.workers) for lo, hi in sched.chunks(w) for i in range(lo, hi)]
+            assert sorted(seen) == list(range(start, stop)), (kind, start, stop, workers, chunk)
+            assert sched.workers <= workers
+
+
+def test_guided_chunks_shrink():
+    """guided starts with large chunks and shrinks down to the minimum."""
+    sched = LoopSchedule("guided", 0, 1000, 4, 10)
+    sizes = [hi - lo for lo, hi in sched.chunks(0)]
+    assert sizes[0] == 250 and sizes[-1] <= 10
+    assert sizes == sorted(sizes, reverse=True)
+
+
+def test_parallel_for_engines():
+    """Each engine runs the body once per index, for every policy."""
+    for kind in ("static", "dynamic", "guided"):
+        program = parse(f"""
+        chan<int> c;
+        int n = 50;
+        parallel for i in 0..n schedule({kind}, 3) {{
+            send(c, i * 2);
+        }}
+        """)
+        for make in ENGINES:
+            interp = make()
+            interp.exec_program(program)
+            assert drain(interp, "c") == [i * 2 for i in range(50)], kind
+
+
+def test_nested_loops_and_private_index():
+    """Inner loops see the outer index; indices never become globals."""
+    program = parse("""
+    chan<int> c;
+    parallel for i in 0..4 {
+        parallel for j in 0..3 {
+            parallel {
+                send(c, i * 10 + j);
+            }
+        }
+        i = 99;
+    }
+    """)
+    for make in ENGINES:
+        interp = make()
+        interp.exec_program(program)
+        assert drain(interp, "c") == sorted(i * 10 + j for i in range(4) for j in range(3))
+        assert "i" not in interp.globals and "j" not in interp.globals
+
+
+def test_race_detector_index_is_private():
+    """Writes to the loop index are not races; writes to shared vars are."""
+    program = parse("int total = 0;\nparallel for i in 0..10 { i = i + 1; total = i; }")
+    warnings = race_detector.find_unprotected_writes(program)
+    assert warnings == ["Possible race: write to shared 'total' outside lock/atomic"]
+
+
+if __name__ == "__main__":
+    # Run tests
+    test_parse_parallel_for()
+    print("✓ Parse parallel for test passed")
+
+    test_arithmetic()
+    print("✓ Arithmetic test passed")
+
+    test_schedules_cover_range()
+    print("✓ Schedules cover range test passed")
+
+    test_guided_chunks_shrink()
+    print("✓ Guided chunks shrink test passed")
+
+    test_parallel_for_engines()
+    print("✓ Parallel for engines test passed")
+
+    test_nested_loops_and_private_index()
+    print("✓ Nested loops and private index test passed")
+
+    test_race_detector_index_is_private()
+    print("✓ Race detector private index test passed")
+
+    print("\nAll parallel for tests passed!")
@@ -1,7 +1,9 @@
 """
 Test suite for ConcurrentLang parser.
 """
+import os
 import sys
+import tempfile
 from pathlib import Path
 
 # Add project root to path
@@ -87,6 +89,80 @@ def test_atomic_block():
     assert isinstance(result.statements[0], ast.Atomic)
 
 
+def test_long_statement_list_keeps_order():
+    """Long statement lists (top level and inside blocks) keep source order."""
+    parser_obj, lexer = parser_mod.build_parser()
+    body = "\n".join(f"x = {i};" for i in range(5000))
+    code = f"int x = 0;\n{body}\nparallel {{\n{body}\n}}"
+    result = parser_obj.parse(code, lexer=lexer)
+    
+    assert len(result.statements) == 5002
+    assert [s.expr.value for s in result.statements[1:-1]] == list(range(5000))
+    block = result.statements[-1]
+    assert [s.expr.value for s in block.statements] == list(range(5000))
+
+
+def test_nodes_are_slotted_and_names_interned():
+    """Nodes carry no __dict__ and repeated names share one string."""
+    parser_obj, lexer = parser_mod.build_parser()
+    result = parser_obj.parse("int counter = 0; counter = 1; counter = counter;", lexer=lexer)
+    
+    assert not hasattr(result, "__dict__")
+    assert not hasattr(result.statements[0], "__dict__")
+    assert result.statements[0].name is result.statements[1].target.name
+    # Without hash-consing each use still gets its own Identifier
+    assert result.statements[2].target is not result.statements[2].expr
+
+
+def test_hashcons_shares_leaves():
+    """hashcons=True shares Identifier and Literal instances."""
+    parser_obj, lexer = parser_mod.build_parser(hashcons=True)
+    result = parser_obj.parse("int x = 5; x = 5; x = x; lock(x);", lexer=lexer)
+    
+    decl, assign, copy, lock = result.statements
+    assert decl.init is assign.expr
+    assert assign.target is copy.target is copy.expr is lock.var
+    assert copy.expr.name == "x"
+
+
+def test_build_parser_shares_tables():
+    """Repeated build_parser() calls hand out independent parsers over one table set."""
+    p1, l1 = parser_mod.build_parser()
+    p2, l2 = parser_mod.build_parser()
+    assert p1 is not p2 and l1 is not l2
+    assert p1.action is p2.action
+
+    r1 = p1.parse("int x = 1;", lexer=l1)
+    r2 = p2.parse("chan<int> c;", lexer=l2)
+    assert isinstance(r1.statements[0], ast.VarDecl)
+    assert isinstance(r2.statements[0], ast.ChannelDecl)
+
+
+def test_stale_table_is_regenerated():
+    """A corrupt cached table is rebuilt instead of breaking build_parser()."""
+    old = os.environ.get("CONCURRENTLANG_CACHE_DIR")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["CONCURRENTLANG_CACHE_DIR"] = cache_dir
+        try:
+            key = parser_mod.grammar_hash()
+            tables = Path(cache_dir) / "tables"
+            tables.mkdir()
+            (tables / f"parsetab_{key}.pickle").write_bytes(b"not a table")
+            (tables / f"lextab_{key}.py").write_text("raise ImportError\n")
+
+            parser_mod.reset_parser_cache()
+            parser_obj, lexer = parser_mod.build_parser()
+            result = parser_obj.parse("int x = 42;", lexer=lexer)
+            assert result.statements[0].name == "x"
+            assert (tables / f"parsetab_{key}.pickle").read_bytes() != b"not a table"
+        finally:
+            parser_mod.reset_parser_cache()
+            if old is None:
+                os.environ.pop("CONCURRENTLANG_CACHE_DIR", None)
+            else:
+                os.environ["CONCURRENTLANG_CACHE_DIR"] = old
+
+
 if __name__ == "__main__":
     # Run tests
     test_variable_declaration()
@@ -104,4 +180,19 @@ if __name__ == "__main__":
     test_atomic_block()
     print("✓ Atomic block test passed")
     
+    test_long_statement_list_keeps_order()
+    print("✓ Long statement list test passed")
+    
+    test_nodes_are_slotted_and_names_interned()
+    print("✓ Slotted nodes test passed")
+    
+    test_hashcons_shares_leaves()
+    print("✓ Hash-consing test passed")
+    
+    test_build_parser_shares_tables()
+    print("✓ Shared parser tables test passed")
+    
+    test_stale_table_is_regenerated()
+    print("✓ Stale table regeneration test passed")
+    
     print("\nAll tests passed!")
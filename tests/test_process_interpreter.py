@@ -0,0 +1,156 @@
+"""
+Test suite for the multi-process execution backend.
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime.interpreter import Interpreter, Channel
+from concurrentlang.runtime.process_interpreter import (
+    ProcessInterpreter, ProcessChannel, may_block, _context,
+)
+
+
+def parse(code):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(code, lexer=lexer)
+
+
+def final_state(engine):
+    state = {}
+    for name, value in engine.globals.items():
+        if isinstance(value, (Channel, ProcessChannel)):
+            value = ("chan", value.qsize())
+        state[name] = value
+    return state
+
+
+def test_process_matches_interpreter():
+    """The process backend ends in the same state as the threaded interpreter."""
+    examples = Path(__file__).parent.parent / "examples"
+    programs = [
+        """
+        chan<int> c;
+        int v = 0;
+        send(c, 1);
+        send(c, 2);
+        v = recv(c);
+        """,
+        """
+        int x = 0;
+        chan<int> c;
+        parallel {
+            x = recv(c);
+            send(c, 42);
+        }
+        lock(m);
+        atomic {
+            y = 5;
+            z = y;
+        }
+        unlock(m);
+        """,
+        (examples / "hello_parallel.cl").read_text(),
+    ]
+    for code in programs:
+        program = parse(code)
+        threaded = Interpreter()
+        threaded.exec_program(program)
+        procs = ProcessInterpreter(workers=2)
+        procs.exec_program(program)
+        assert final_state(procs) == final_state(threaded), code
+        assert not procs.errors
+
+
+def test_process_branches_share_globals():
+    """Int writes and channel traffic from child processes reach the parent."""
+    n = 200
+    assigns = "\n".join(f"v{i} = {i * 3};" for i in range(n))
+    consumers = "a = recv(c);\nb = recv(c);"
+    program = parse(f"chan<int> c;\nparallel {{\n{assigns}\n{consumers}\nsend(c, 7);\nsend(c, 8);\n}}")
+    
+    interp = ProcessInterpreter(workers=3)
+    interp.exec_program(program)
+    
+    assert all(interp.globals[f"v{i}"] == i * 3 for i in range(n))
+    # which consumer gets which value depends on scheduling
+    assert {interp.globals["a"], interp.globals["b"]} == {7, 8}
+    assert interp.globals["c"].qsize() == 0
+
+
+def test_process_channel_payloads():
+    """Ints use the raw fast path; other values round-trip through pickle."""
+    ch = ProcessChannel(_context())
+    ch.send(-5)
+    ch.send(("pair", 2))
+    ch.send(2 ** 63)
+    assert ch.qsize() == 3
+    assert ch.recv() == -5
+    assert ch.try_recv() == (True, ("pair", 2))
+    assert ch.recv() == 2 ** 63
+    assert ch.try_recv() == (False, None)
+
+
+def test_process_failures_reported():
+    """A failing branch process is reported, and so is every parent of it."""
+    interp = ProcessInterpreter(workers=2)
+    interp.exec_program(parse("parallel {\nx = 1;\nparallel {\nsend(missing, 1);\ny = 2;\n}\n}"))
+    assert len(interp.errors) == 1
+    assert "exited with status" in str(interp.errors[0])
+    assert interp.globals["x"] == 1
+
+
+def test_process_big_ints():
+    """Ints past 64 bits are kept, not rejected by the shared int64 slots."""
+    interp = ProcessInterpreter(workers=2)
+    interp.exec_program(parse("x = 9223372036854775807;\ny = x + 1;\nz = y - 1;"))
+    assert interp.globals == {"x": 2 ** 63 - 1, "y": 2 ** 63, "z": 2 ** 63 - 1}
+    assert not interp.errors
+
+
+def test_process_channel_big_ints():
+    """Ints past 64 bits are pickled over a channel rather than failing the sender."""
+    interp = ProcessInterpreter(workers=2)
+    interp.exec_program(parse(
+        "int x = 0;\nchan<int> c;\nparallel {\nsend(c, 99999999999999999999);\nx = recv(c);\n}\n"
+        "parallel {\nsend(c, 99999999999999999999);\n}\ny = recv(c);"
+    ))
+    assert not interp.errors
+    assert interp.globals["y"] == 99999999999999999999
+    assert interp.globals["c"].qsize() == 0
+
+
+def test_may_block():
+    """Only branches containing recv or lock get a dedicated process."""
+    program = parse("x = 1;\nsend(c, 1);\nunlock(m);\nlock(m);\natomic {\ny = recv(c);\n}")
+    flags = [may_block(s) for s in program.statements]
+    assert flags == [False, False, False, True, True]
+
+
+if __name__ == "__main__":
+    # Run tests
+    test_process_matches_interpreter()
+    print("✓ Process/interpreter equivalence test passed")
+    
+    test_process_branches_share_globals()
+    print("✓ Process shared globals test passed")
+    
+    test_process_channel_payloads()
+    print("✓ Process channel payload test passed")
+    
+    test_process_failures_reported()
+    print("✓ Process failures reported test passed")
+    
+    test_process_big_ints()
+    print("✓ Process big ints test passed")
+    
+    test_process_channel_big_ints()
+    print("✓ Process channel big ints test passed")
+    
+    test_may_block()
+    print("✓ May-block classification test passed")
+    
+    print("\nAll process interpreter tests passed!")
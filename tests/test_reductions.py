@@ -0,0 +1,143 @@
+"""
+Test suite for reduce clauses on parallel blocks and parallel for loops.
+"""
+import math
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from concurrentlang.ast import nodes
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime.interpreter import Interpreter, combine_partials
+from concurrentlang.runtime.async_interpreter import AsyncInterpreter
+from concurrentlang.runtime.process_interpreter import ProcessInterpreter
+from concurrentlang.runtime import vm
+from concurrentlang.sem import race_detector
+
+ENGINES = [
+    lambda: Interpreter(workers=4),
+    lambda: Interpreter(scheduler="pool", workers=4),
+    lambda: vm.VM(workers=4),
+    lambda: AsyncInterpreter(workers=4),
+    lambda: ProcessInterpreter(workers=4),
+]
+
+LOOP = """
+int total = 5;
+int prod = 3;
+int lo = 1000;
+int hi = 0;
+parallel for i in 0..100 schedule(dynamic, 7) reduce(+: total) reduce(min: lo) reduce(max: hi) {
+    total = total + i;
+    lo = min(lo, 50 - i);
+    hi = max(hi, i * 2);
+}
+parallel for i in 1..9 reduce(*: prod) {
+    prod = prod * i;
+}
+"""
+
+
+def parse(code):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(code, lexer=lexer)
+
+
+def test_parse_reduce():
+    """reduce clauses attach Reduction nodes to parallel blocks and loops."""
+    program = parse("parallel reduce(+: a, b) { a = 1; }\n"
+                    "parallel for i in 0..4 reduce(max: m) schedule(guided) { m = i; }")
+    block, loop = program.statements
+    assert [(r.op, r.var.name) for r in block.reductions] == [("+", "a"), ("+", "b")]
+    assert [(r.op, r.var.name) for r in loop.reductions] == [("max", "m")]
+    assert loop.schedule == "guided"
+    assert all(isinstance(r, nodes.Reduction) for r in block.reductions + loop.reductions)
+
+
+def test_loop_reductions_engines():
+    """Every engine combines per-worker partials into the shared value."""
+    program = parse(LOOP)
+    for make in ENGINES:
+        interp = make()
+        interp.exec_program(program)
+        state = interp.globals
+        assert state["total"] == 5 + sum(range(100))
+        assert state["prod"] == 3 * math.factorial(8)
+        assert (state["lo"], state["hi"]) == (50 - 99, 198)
+        assert "i" not in state
+
+
+def test_block_reductions_engines():
+    """Each branch of a parallel block updates its own partial."""
+    program = parse("""
+    int t = 10;
+    parallel reduce(+: t) {
+        t = t + 1;
+        t = t + 2;
+        atomic {
+            t = t + 3;
+        }
+    }
+    """)
+    for make in ENGINES:
+        interp = make()
+        interp.exec_program(program)
+        assert interp.globals["t"] == 16
+
+
+def test_nested_reduction_feeds_outer_partial():
+    """An inner reduction combines into the enclosing worker's partial."""
+    program = parse("""
+    parallel for i in 0..4 reduce(+: s) {
+        parallel for j in 0..5 reduce(+: s) {
+            s = s + i * j;
+        }
+    }
+    """)
+    for make in ENGINES:
+        interp = make()
+        interp.exec_program(program)
+        assert interp.globals["s"] == sum(i * j for i in range(4) for j in range(5))
+
+
+def test_combine_skips_missing_rows():
+    """Rows of workers that never finished are skipped; others count once."""
+    r = nodes.Reduction("+", nodes.Identifier("x"))
+    r.slot = 0
+    slots = [1]
+    combine_partials([r], [[2], None, [3]], slots, None)
+    assert slots == [6]
+
+
+def test_race_detector_reductions_are_safe():
+    """Writes to reduction variables are not races; other shared writes are."""
+    program = parse("int total = 0;\nint other = 0;\n"
+                    "parallel for i in 0..10 reduce(+: total) { total = total + i; other = i; }\n"
+                    "parallel reduce(+: total) { total = total + 1; other = 2; }")
+    warnings = race_detector.find_unprotected_writes(program)
+    assert warnings == ["Possible race: write to shared 'other' outside lock/atomic"] * 2
+
+
+if __name__ == "__main__":
+    # Run tests
+    test_parse_reduce()
+    print("✓ Parse reduce test passed")
+
+    test_loop_reductions_engines()
+    print("✓ Loop reductions engines test passed")
+
+    test_block_reductions_engines()
+    print("✓ Block reductions engines test passed")
+
+    test_nested_reduction_feeds_outer_partial()
+    print("✓ Nested reduction test passed")
+
+    test_combine_skips_missing_rows()
+    print("✓ Combine skips missing rows test passed")
+
+    test_race_detector_reductions_are_safe()
+    print("✓ Race detector reductions test passed")
+
+    print("\nAll reduction tests passed!")
@@ -0,0 +1,147 @@
+"""
+Test suite for the parallel-branch schedulers.
+"""
+import sys
+import threading
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime.interpreter import Interpreter
+from concurrentlang.runtime.scheduler import ThreadManager, WorkStealingPool, make_scheduler
+from concurrentlang.runtime.process_interpreter import ProcessInterpreter
+from concurrentlang.runtime.vm import VM
+
+
+def parse(code):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(code, lexer=lexer)
+
+
+def test_pool_bounds_threads():
+    """A large parallel block runs on a bounded number of workers."""
+    body = "\n".join(f"v{i} = {i};" for i in range(2000))
+    program = parse(f"parallel {{\n{body}\n}}")
+    
+    # one task per branch, as written: keep sequentialization out of the way
+    interp = Interpreter(scheduler="pool", workers=4, sequentialize=False)
+    interp.exec_program(program)
+    
+    assert interp.globals["v1999"] == 1999
+    assert len(interp.globals) == 2000
+    assert interp.thread_manager.peak_workers <= 4
+    assert interp.thread_manager.spawned == 2000
+
+
+def test_pool_compensates_blocked_workers():
+    """Receivers queued before their senders still complete with one worker."""
+    recvs = "\n".join(f"r{i} = recv(c);" for i in range(8))
+    sends = "\n".join(f"send(c, {i});" for i in range(8))
+    program = parse(f"chan<int> c;\nparallel {{\n{recvs}\n{sends}\n}}")
+    
+    for engine in (Interpreter, VM):
+        interp = engine(scheduler="pool", workers=1)
+        interp.exec_program(program)
+        received = sorted(interp.globals[f"r{i}"] for i in range(8))
+        assert received == list(range(8))
+        assert interp.thread_manager.compensations >= 1
+
+
+def test_pool_joins_nested_tasks():
+    """join_all waits for tasks spawned by tasks, then releases its workers."""
+    pool = WorkStealingPool(workers=2)
+    seen = []
+    seen_lock = threading.Lock()
+    
+    def leaf(i):
+        with seen_lock:
+            seen.append(i)
+    
+    def parent(i):
+        for j in range(10):
+            pool.spawn(leaf, i * 10 + j)
+    
+    for i in range(10):
+        pool.spawn(parent, i)
+    pool.join_all()
+    
+    assert sorted(seen) == list(range(100))
+    assert pool._workers == 0
+
+
+def test_blocks_join_in_place():
+    """A parallel block has finished before the next statement runs, without
+    waiting for exec_program's final join_all, on every engine."""
+    body = "\n".join(f"v{i} = {i};" for i in range(50))
+    program = parse(f"parallel {{\n{body}\n}}\natomic {{\nspawn(1);\nw = 1;\n}}")
+    engines = [
+        lambda: Interpreter(),
+        lambda: Interpreter(scheduler="pool", workers=2),
+        lambda: VM(),
+        lambda: VM(scheduler="pool", workers=2),
+        lambda: ProcessInterpreter(workers=2),
+    ]
+    for make in engines:
+        interp = make()
+        seen = []
+        # replace the final safety-net join with a snapshot of the state
+        interp.thread_manager.join_all = lambda interp=interp: seen.append(interp.globals)
+        interp.exec_program(program)
+        assert len(seen) == 1
+        assert len(seen[0]) == 51
+        assert seen[0]["v49"] == 49
+
+
+def test_thread_manager_prunes_finished_threads():
+    """ThreadManager.threads stays bounded across many joined blocks."""
+    body = "\n".join(f"v{i % 10} = {i};" for i in range(20))
+    program = parse("\n".join(f"parallel {{\n{body}\n}}" for _ in range(50)))
+    
+    interp = Interpreter()
+    tm = interp.thread_manager
+    sizes = []
+    original = tm.spawn
+    def spawn(fn, *args, **kwargs):
+        sizes.append(len(tm.threads))
+        return original(fn, *args, **kwargs)
+    tm.spawn = spawn
+    interp.exec_program(program)
+    
+    assert len(sizes) == 1000
+    assert max(sizes) < 2 * ThreadManager.PRUNE_MIN
+    assert tm.threads == []
+
+
+def test_make_scheduler_rejects_unknown():
+    """Unknown scheduler names are reported."""
+    try:
+        make_scheduler("fibers")
+    except ValueError as e:
+        assert "fibers" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
+
+
+if __name__ == "__main__":
+    # Run tests
+    test_pool_bounds_threads()
+    print("✓ Pool bounds threads test passed")
+    
+    test_pool_compensates_blocked_workers()
+    print("✓ Pool compensation test passed")
+    
+    test_pool_joins_nested_tasks()
+    print("✓ Pool nested join test passed")
+    
+    test_blocks_join_in_place()
+    print("✓ Blocks join in place test passed")
+    
+    test_thread_manager_prunes_finished_threads()
+    print("✓ ThreadManager pruning test passed")
+    
+    test_make_scheduler_rejects_unknown()
+    print("✓ Unknown scheduler test passed")
+    
+    print("\nAll scheduler tests passed!")
@@ -0,0 +1,117 @@
+"""
+Test suite for the select statement.
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from concurrentlang.ast import nodes
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime.interpreter import Interpreter, Channel, select_recv
+from concurrentlang.runtime.async_interpreter import AsyncInterpreter
+from concurrentlang.runtime.process_interpreter import ProcessInterpreter
+from concurrentlang.runtime import vm
+from concurrentlang.sem import deadlock_detector, race_detector
+
+FAN_IN = """
+chan<int> a;
+chan<int> b;
+parallel {
+    select {
+        case x = recv(a):
+            got = 1;
+        case y = recv(b):
+            got = 2;
+            done = y;
+    }
+    send(b, 7);
+}
+"""
+
+
+def parse(code):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(code, lexer=lexer)
+
+
+def test_parse_select():
+    """select parses into Select/SelectCase nodes, empty bodies included."""
+    program = parse("chan<int> a;\nselect {\ncase x = recv(a): y = x;\ncase z = recv(a):\n}")
+    sel = program.statements[1]
+    assert isinstance(sel, nodes.Select)
+    assert [c.target.name for c in sel.cases] == ["x", "z"]
+    assert all(c.chan.name == "a" for c in sel.cases)
+    assert isinstance(sel.cases[0].statements[0], nodes.Assign)
+    assert sel.cases[1].statements == []
+
+
+def test_select_engines():
+    """Every engine waits for the one channel that gets a value."""
+    program = parse(FAN_IN)
+    engines = [Interpreter, vm.VM, AsyncInterpreter, lambda: ProcessInterpreter(workers=2)]
+    for make in engines:
+        interp = make()
+        interp.exec_program(program)
+        state = interp.globals
+        assert (state["got"], state["y"], state["done"]) == (2, 7, 7)
+        assert "x" not in state
+
+
+def test_select_prefers_first_ready_case():
+    """With several channels ready, cases are tried in order."""
+    program = parse("chan<int> a;\nchan<int> b;\nsend(b, 2);\nsend(a, 1);\n"
+                    "select {\ncase x = recv(a): got = 1;\ncase y = recv(b): got = 2;\n}")
+    for engine in (Interpreter, vm.VM, AsyncInterpreter):
+        interp = engine()
+        interp.exec_program(program)
+        assert interp.globals["got"] == 1
+        assert interp.globals["b"].qsize() == 1
+
+
+def test_select_recv_wakes_on_send():
+    """A blocked select_recv is woken by a send and unregisters itself."""
+    a, b = Channel(), Channel()
+    result = []
+    t = threading.Thread(target=lambda: result.append(select_recv([a, b])))
+    t.start()
+    time.sleep(0.02)
+    assert not result
+    b.send(5)
+    t.join(timeout=5)
+    assert result == [(1, 5)]
+    assert a._selectors == [] and b._selectors == []
+
+
+def test_detectors_see_select():
+    """The race and deadlock detectors look inside select cases."""
+    program = parse("chan<int> a;\nlock(m);\nselect {\ncase x = recv(a):\nlock(n);\nunlock(n);\nv = x;\n}\nunlock(m);\n"
+                    "lock(n);\nlock(m);\nunlock(m);\nunlock(n);\nselect {\ncase w = recv(a): v = w;\n}")
+    assert {"x", "w", "v"} <= race_detector.collect_shared_vars(program)
+    assert any("'v'" in w for w in race_detector.find_unprotected_writes(program))
+    edges = deadlock_detector.build_lock_graph(program)
+    assert "n" in edges["m"]
+    assert deadlock_detector.has_cycle(edges)
+
+
+if __name__ == "__main__":
+    # Run tests
+    test_parse_select()
+    print("✓ Select parsing test passed")
+    
+    test_select_engines()
+    print("✓ Select engines test passed")
+    
+    test_select_prefers_first_ready_case()
+    print("✓ Select case order test passed")
+    
+    test_select_recv_wakes_on_send()
+    print("✓ Select wakeup test passed")
+    
+    test_detectors_see_select()
+    print("✓ Select detectors test passed")
+    
+    print("\nAll select tests passed!")
@@ -0,0 +1,140 @@
+"""
+Test suite for static sequentialization of independent parallel blocks.
+"""
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.runtime.interpreter import Interpreter
+from concurrentlang.runtime.async_interpreter import AsyncInterpreter
+from concurrentlang.runtime.process_interpreter import ProcessInterpreter
+from concurrentlang.runtime import vm
+from concurrentlang.sem import sequentialize
+
+MIXED = """
+chan<int> c;
+chan<int, 1> b;
+int x = 0;
+parallel {
+    a = 1;
+    y = x + 2;
+}
+parallel {
+    send(c, 1);
+    z = 3;
+}
+parallel {
+    r = recv(c);
+    s = 1;
+}
+parallel {
+    send(b, 1);
+}
+parallel {
+    x = 1;
+    w = x;
+}
+parallel {
+    atomic { p = 1; }
+    send(c, 2);
+}
+parallel reduce(+: t) {
+    t = t + 1;
+    t = t + 2;
+}
+"""
+
+
+def parse(code):
+    parser_obj, lexer = parser_mod.build_parser()
+    return parser_obj.parse(code, lexer=lexer)
+
+
+def test_independence():
+    """Only blocks whose branches cannot block on or interfere with each
+    other get a cost."""
+    # the branches race to unlock m, so this block is only analyzed, not run
+    program = parse(MIXED + "parallel {\nlock(m);\nunlock(m);\n}\n")
+    stats = sequentialize.analyze(program)
+    blocks = [s for s in program.statements if hasattr(s, "cost")]
+    independent = [s.cost is not None for s in blocks]
+    # plain writes; unbounded send; recv; bounded send; shared write;
+    # atomic + send; reduction; lock released by another branch
+    assert independent == [True, True, False, False, False, False, True, False]
+    assert (stats.blocks, stats.inline, stats.batched, stats.threaded) == (8, 3, 0, 5)
+    assert str(stats) == "3/8 parallel blocks sequentialized (3 inline, 0 batched)"
+
+
+def test_balanced_locks_and_cycles():
+    """Locks taken and released in one branch are fine unless they form a cycle."""
+    balanced = parse("parallel {\natomic { lock(a); x = 1; unlock(a); }\natomic { lock(b); y = 1; unlock(b); }\n}")
+    cyclic = parse("parallel {\natomic { lock(a); lock(b); x = 1; unlock(b); unlock(a); }\n"
+                   "atomic { lock(b); lock(a); y = 1; unlock(a); unlock(b); }\n}")
+    assert sequentialize.analyze(balanced).inline == 1
+    assert sequentialize.analyze(cyclic).threaded == 1
+
+
+def test_cost_model():
+    """Cheap blocks run inline; expensive ones are split across workers."""
+    cost = sequentialize.THREAD_COST
+    assert sequentialize.plan(None, 4) is None
+    assert sequentialize.plan(10, 4) == 1
+    assert sequentialize.plan(3 * cost, 4) == 3
+    assert sequentialize.plan(100 * cost, 4) == 4
+    assert sequentialize.batches(list(range(7)), 3) == [[0, 1], [2, 3], [4, 5, 6]]
+    assert sequentialize.batches(list(range(2)), 4) == [[0], [1]]
+    body = "\n".join(f"v{i} = {i} + {i};" for i in range(2 * cost))
+    stats = sequentialize.analyze(parse(f"parallel {{\n{body}\n}}"), workers=4)
+    assert (stats.inline, stats.batched) == (0, 1)
+
+
+def test_inline_blocks_start_no_tasks():
+    """An inlined block never reaches the scheduler."""
+    program = parse("parallel {\na = 1;\nb = 2;\nc = 3;\n}")
+    interp = Interpreter(scheduler="pool", workers=4)
+    interp.exec_program(program)
+    assert interp.globals == {"a": 1, "b": 2, "c": 3}
+    assert interp.thread_manager.spawned == 0
+    assert interp.seq_stats.inline == 1
+
+
+def test_engines_match_unsequentialized():
+    """Every engine ends in the same state with and without the pass."""
+    body = "\n".join(f"v{i} = {i} * 2;" for i in range(400))
+    program = parse(f"{MIXED}\nparallel {{\n{body}\n}}\n")
+    engines = [Interpreter, vm.VM, AsyncInterpreter, ProcessInterpreter]
+    for engine in engines:
+        states = []
+        for enabled in (True, False):
+            interp = engine(workers=4, sequentialize=enabled)
+            interp.exec_program(program)
+            state = interp.globals
+            state["c"] = state["c"].qsize()
+            state["b"] = state["b"].qsize()
+            del state["w"]  # `w = x` races with `x = 1` when threaded
+            states.append(state)
+        assert states[0] == states[1], engine
+        assert states[0]["v399"] == 798 and states[0]["t"] == 3
+
+
+if __name__ == "__main__":
+    # Run tests
+    test_independence()
+    print("✓ Independence test passed")
+
+    test_balanced_locks_and_cycles()
+    print("✓ Balanced locks and cycles test passed")
+
+    test_cost_model()
+    print("✓ Cost model test passed")
+
+    test_inline_blocks_start_no_tasks()
+    print("✓ Inline blocks start no tasks test passed")
+
+    test_engines_match_unsequentialized()
+    print("✓ Engines match unsequentialized test passed")
+
+    print("\nAll sequentialization tests passed!")
@@ -0,0 +1,152 @@
+"""
+Test suite for the compile server and its client (concurrentlang/server.py, client.py).
+"""
+import json
+import os
+import socket
+import stat
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from concurrentlang import client, server
+from concurrentlang.grammar import parser as parser_mod
+from concurrentlang.sem import checks
+
+RACY = "int x = 0;\nparallel {\nx = 1;\nx = 2;\n}\n"
+LOCKED = "lock(a);\nlock(b);\nunlock(b);\nunlock(a);\nlock(b);\nlock(a);\nunlock(a);\nunlock(b);\n"
+BAD = "int x = ;\n"
+
+
+def warnings(code):
+    parser_obj, lexer = parser_mod.build_parser()
+    return checks.check(parser_obj.parse(code, lexer=lexer)).warnings
+
+
+class Running:
+    """A compile server on a temporary socket, served from a thread."""
+    def __enter__(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "s.sock")
+        self.server = server.CompileServer(self.path)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.dir.cleanup()
+
+    def request(self, **req):
+        return client.request(req, self.path, timeout=30)
+
+
+def test_ops():
+    """check, ast and llvm replies carry the diagnostics and the output asked for."""
+    with Running() as s:
+        reply = s.request(op="check", source=RACY)
+        assert reply == {"status": "ok", "diagnostics": warnings(RACY)}
+        reply = s.request(op="ast", source=RACY)
+        assert reply["ast"]["_type"] == "Program" and len(reply["ast"]["statements"]) == 2
+        reply = s.request(op="llvm", source=LOCKED)
+        assert reply["diagnostics"] == warnings(LOCKED) and "Possible deadlock" in reply["diagnostics"][0]
+        assert "define" in reply["llvm"]
+        assert "llvm" in s.request(op="llvm", source=RACY, opt=False, disabled=[])
+
+
+def test_paths_and_errors():
+    """Files are read by path; syntax errors and bad requests are reported."""
+    with Running() as s:
+        prog = os.path.join(s.dir.name, "p.cl")
+        Path(prog).write_text(RACY)
+        assert s.request(op="check", path=prog)["diagnostics"] == warnings(RACY)
+        reply = s.request(op="llvm", source=BAD)
+        assert reply["status"] == "error" and "Syntax error" in reply["diagnostics"][0]
+        assert "llvm" not in reply
+        assert "error" in s.request(op="check", path=os.path.join(s.dir.name, "missing.cl"))
+        assert "error" in s.request(op="run", source=RACY)
+        assert "error" in s.request(op="check")
+        assert "error" in s.request(op="llvm", source=RACY, disabled=["nope"])
+        # a malformed line does not end the connection
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as c:
+            c.connect(s.path)
+            c.sendall(b"not json\n" + json.dumps({"op": "check", "source": RACY}).encode() + b"\n")
+            with c.makefile("rb") as f:
+                assert "error" in json.loads(f.readline())
+                assert json.loads(f.readline())["diagnostics"] == warnings(RACY)
+
+
+def test_concurrent_requests():
+    """Requests from many clients at once each get their own program's reply."""
+    programs = [RACY, LOCKED, BAD, "y = 1;\n"] * 4
+    expected = [{"status": "error"} if code == BAD else {"status": "ok", "diagnostics": warnings(code)}
+                for code in programs]
+    replies = [None] * len(programs)
+    with Running() as s:
+        def client(i):
+            replies[i] = s.request(op="check", source=programs[i])
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(len(programs))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    for reply, want in zip(replies, expected):
+        if want["status"] == "error":
+            assert reply["status"] == "error"
+            assert reply["diagnostics"] == ["Syntax error at token SEMI, value ; (line 1)"]
+        else:
+            assert reply == want
+
+
+def test_socket_lifecycle():
+    """A stale socket is replaced, a live one is not; the socket is
+    owner-only and closing removes it."""
+    with Running() as s:
+        try:
+            server.CompileServer(s.path)
+            assert False, "expected OSError"
+        except OSError:
+            pass
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "s.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        umask = os.umask(0o022)
+        try:
+            srv = server.CompileServer(path)
+            # the process umask is left as it was
+            assert os.umask(0o022) == 0o022
+        finally:
+            os.umask(umask)
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        srv.server_close()
+        assert not os.path.exists(path)
+        try:
+            client.request({"op": "check", "source": RACY}, path)
+            assert False, "expected OSError"
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    # Run tests
+    test_ops()
+    print("✓ Server ops test passed")
+
+    test_paths_and_errors()
+    print("✓ Paths and errors test passed")
+
+    test_concurrent_requests()
+    print("✓ Concurrent requests test passed")
+
+    test_socket_lifecycle()
+    print("✓ Socket lifecycle test passed")
+
+    print("\nAll compile server tests passed!")